@@ -1,8 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 import time
-from checkSolvability import is_solvable
+from relabel import get_relabeling
+from puzzlestate import pack
+from solutioncache import get_cache
+from backgroundsolve import BackgroundSolve
+from tileimages import tile_images, load_image, changed_cells
+import solvers
 
 class PuzzleGUI:
     def __init__(self, master):
@@ -42,22 +46,25 @@ class PuzzleGUI:
         self.puzzle_state = [None] * 9  # Empty state initially
         self.next_tile_index = 0  # Track which tile (0-8) to place next
 
-        # Button to start solving the puzzle
+        # Buttons to start solving the puzzle and to cancel a running search
         self.solve_button = tk.Button(master, text="Start", command=self.solve_puzzle)
-        self.solve_button.grid(row=1, column=0, columnspan=2)
+        self.solve_button.grid(row=1, column=0)
+        self.cancel_button = tk.Button(master, text="Cancel", command=self.cancel_solve, state=tk.DISABLED)
+        self.cancel_button.grid(row=1, column=1)
+
+        # Label showing search progress
+        self.progress_label = tk.Label(master, text="")
+        self.progress_label.grid(row=2, column=0, columnspan=2)
+        self.search = None  # The running BackgroundSolve, if any
 
     def load_images(self):
-        """Load images for the tiles."""
-        self.images = []
-        self.images.append(ImageTk.PhotoImage(Image.open("girl/blank.png").resize((100, 100))))  # 0: blank
-        for i in range(1, 9):
-            img = Image.open(f"girl/{i}girl.png").resize((100, 100))
-            self.images.append(ImageTk.PhotoImage(img))
+        """Load images for the tiles (decoded once per process, see tileimages)."""
+        self.images = tile_images("girl/{}girl.png", "girl/blank.png", (100, 100))  # 0: blank
+        self.displayed_state = None  # Board currently drawn on the buttons
 
     def update_left_image(self, img_path):
         """Update the image displayed on the left."""
-        img = Image.open(img_path).resize((100, 100))
-        self.left_image = ImageTk.PhotoImage(img)
+        self.left_image = load_image(img_path, (100, 100))
         self.left_image_label.config(image=self.left_image)
         self.left_image_label.image = self.left_image
 
@@ -78,112 +85,71 @@ class PuzzleGUI:
             return
 
         goal_state = [0, 1, 2, 3, 4, 5, 6, 7, 8]  # Goal state
-        if not is_solvable(self.puzzle_state):
+        if not get_relabeling(goal_state).solvable(self.puzzle_state):
             messagebox.showinfo("Info", "No solution exists for this initial state.")
             return
 
-        result = ids(self.puzzle_state, goal_state)
-        if result:
+        def solver(board, cancel, progress):
+            return get_cache().solve(board, "ida*",
+                                     lambda b: solvers.run(b, "ida*", goal_state, cancel, progress)[0],
+                                     goal=pack(goal_state))
+
+        # Search on a worker thread; the window stays responsive and can cancel it
+        self.solve_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_label.config(text="Solving...")
+        self.search = BackgroundSolve(self.master, solver, list(self.puzzle_state), self.solve_done,
+                                      self.show_progress, self.solve_failed)
+
+    def cancel_solve(self):
+        """Stop the running search."""
+        if self.search is not None:
+            self.search.cancel()
+
+    def show_progress(self, depth, nodes):
+        """Show how far the running search has got."""
+        self.progress_label.config(text=f"Depth {depth}, {nodes} nodes expanded")
+
+    def solve_done(self, result, cancelled):
+        """Called on the Tk thread when the search finishes or is cancelled."""
+        self.search = None
+        self.solve_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if cancelled:
+            self.progress_label.config(text="Cancelled.")
+        elif result:
+            self.progress_label.config(text=f"Solved in {len(result) - 1} moves.")
             self.animate_solution(result)
         else:
+            self.progress_label.config(text="")
             messagebox.showinfo("Info", "No solution found.")
 
+    def solve_failed(self, error):
+        """Called on the Tk thread if the search raised."""
+        self.search = None
+        self.solve_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text="")
+        messagebox.showerror("Error", f"Search failed: {error}")
+
     def animate_solution(self, solution):
         """Animate the solution with a delay between steps."""
-        def step_animation(step=0):
-            if step < len(solution):
-                self.update_puzzle(solution[step])
-                self.master.after(500, step_animation, step + 1)  # Delay of 500ms
+        boards = iter(solution)  # Boards are rebuilt one at a time as needed
+
+        def step_animation():
+            board = next(boards, None)
+            if board is not None:
+                self.update_puzzle(board)
+                self.master.after(500, step_animation)  # Delay of 500ms
 
         step_animation()
 
     def update_puzzle(self, state):
-        """Update the puzzle buttons based on a given state."""
-        for i in range(3):
-            for j in range(3):
-                index = i * 3 + j
-                img_index = state[index]
-                self.buttons[i][j].config(image=self.images[img_index])
-
-# Depth-Limited Search and IDS Functions
-def dls(startState, goalState, depth=20):
-    """Depth-Limited Search."""
-    nodes = [Node(startState, None, None, 0, 0)]  # Initialize with the root node
-    explored = set()
-    while nodes:
-        node = nodes.pop(0)
-        if node.state == goalState:
-            return node.pathFromStart()
-        if node.depth < depth:
-            expanded = expandedNodes(node)
-            for child in expanded:
-                if tuple(child.state) not in explored:
-                    explored.add(tuple(child.state))
-                    nodes.insert(0, child)
-
-def ids(startState, goalState, max_depth=50):
-    """Iterative Deepening Search."""
-    for depth in range(max_depth):
-        result = dls(startState, goalState, depth)
-        if result is not None:
-            return result
-    return None
-
-class Node:
-    """Structure for nodes in the search tree."""
-    def __init__(self, state, parent, action, depth, cost):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.depth = depth
-        self.cost = cost
-
-    def pathFromStart(self):
-        """Get the path from the initial state to the current state."""
-        path = []
-        node = self
-        while node:
-            path.append(node.state)
-            node = node.parent
-        return path[::-1]
-
-def expandedNodes(node):
-    """Generate all valid moves from the current node."""
-    moves = [moveUp, moveDown, moveLeft, moveRight]
-    children = []
-    for move in moves:
-        new_state = move(node.state)
-        if new_state:
-            children.append(Node(new_state, node, move.__name__, node.depth + 1, 0))
-    return children
-
-def moveUp(state):
-    index = state.index(0)
-    if index > 2:
-        state[index], state[index - 3] = state[index - 3], state[index]
-        return state[:]
-    return None
-
-def moveDown(state):
-    index = state.index(0)
-    if index < 6:
-        state[index], state[index + 3] = state[index + 3], state[index]
-        return state[:]
-    return None
-
-def moveLeft(state):
-    index = state.index(0)
-    if index % 3 != 0:
-        state[index], state[index - 1] = state[index - 1], state[index]
-        return state[:]
-    return None
-
-def moveRight(state):
-    index = state.index(0)
-    if index % 3 != 2:
-        state[index], state[index + 1] = state[index + 1], state[index]
-        return state[:]
-    return None
+        """Update the puzzle buttons whose tile differs from what is drawn."""
+        for index in changed_cells(self.displayed_state, state):
+            i, j = divmod(index, 3)
+            self.buttons[i][j].config(image=self.images[state[index]])
+        self.displayed_state = list(state)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,105 +1,11 @@
 import tkinter as tk
-from PIL import Image, ImageTk
 import time
-from checkSolvability import is_solvable  # Import your solvability checker
-
-class Node:
-    """Structure of a puzzle node."""
-    def __init__(self, state, parent, action, depth, cost):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.depth = depth
-        self.cost = cost
-
-    def getState(self):
-        return self.state
-
-    def getParent(self):
-        return self.parent
-
-    def getMoves(self):
-        return self.action
-
-    def pathFromStart(self):
-        """Retrieve the path from the initial state to the goal."""
-        stateList, movesList = [], []
-        currNode = self
-        while currNode.getMoves() is not None:
-            stateList.append(currNode.getState())
-            movesList.append(currNode.getMoves())
-            currNode = currNode.getParent()
-        stateList.reverse()
-        movesList.reverse()
-        return stateList
-
-def createNode(state, parent, action, depth, cost):
-    return Node(state, parent, action, depth, cost)
-
-def moveUp(state):
-    newState = state[:]
-    index = newState.index(0)
-    if index not in [0, 1, 2]:
-        newState[index], newState[index - 3] = newState[index - 3], newState[index]
-        return newState
-    return None
-
-def moveDown(state):
-    newState = state[:]
-    index = newState.index(0)
-    if index not in [6, 7, 8]:
-        newState[index], newState[index + 3] = newState[index + 3], newState[index]
-        return newState
-    return None
-
-def moveLeft(state):
-    newState = state[:]
-    index = newState.index(0)
-    if index not in [0, 3, 6]:
-        newState[index], newState[index - 1] = newState[index - 1], newState[index]
-        return newState
-    return None
-
-def moveRight(state):
-    newState = state[:]
-    index = newState.index(0)
-    if index not in [2, 5, 8]:
-        newState[index], newState[index + 1] = newState[index + 1], newState[index]
-        return newState
-    return None
-
-def expandedNodes(node):
-    nodes = [
-        createNode(moveUp(node.state), node, "up", node.depth + 1, 0),
-        createNode(moveDown(node.state), node, "down", node.depth + 1, 0),
-        createNode(moveLeft(node.state), node, "left", node.depth + 1, 0),
-        createNode(moveRight(node.state), node, "right", node.depth + 1, 0)
-    ]
-    return [n for n in nodes if n.state is not None]
-
-def dls(startState, goalState, depth=20):
-    stack = [createNode(startState, None, None, 0, 0)]
-    explored = set()
-
-    while stack:
-        node = stack.pop()
-        explored.add(tuple(node.getState()))
-
-        if node.getState() == goalState:
-            return node.pathFromStart()
-
-        if node.depth < depth:
-            for neighbor in expandedNodes(node):
-                if tuple(neighbor.getState()) not in explored:
-                    stack.append(neighbor)
-    return None
-
-def ids(startState, goalState, max_depth=50):
-    for depth in range(max_depth):
-        result = dls(startState, goalState, depth)
-        if result is not None:
-            return result
-    return None
+from relabel import get_relabeling
+from puzzlestate import pack
+from solutioncache import get_cache
+from backgroundsolve import BackgroundSolve
+from tileimages import tile_images, load_image, changed_cells
+import solvers
 
 class PuzzleGame:
     def __init__(self, root):
@@ -115,9 +21,9 @@ class PuzzleGame:
 
     def load_images(self):
         """Load images for the tiles."""
-        self.images = [ImageTk.PhotoImage(Image.open(f"girl/{i}girl.png").resize((100, 100))) 
-                      for i in range(1, 9)]  # Load images for tiles 1 to 8
-        self.images.insert(0, ImageTk.PhotoImage(Image.open("girl/blank.png").resize((100, 100))))  # Load blank.png for the empty tile
+        # Tiles 1 to 8 plus blank.png for the empty tile, decoded once per process
+        self.images = tile_images("girl/{}girl.png", "girl/blank.png", (100, 100))
+        self.displayed_state = None  # Board currently drawn on the buttons
 
     def create_gui(self):
         self.left_frame = tk.Frame(self.root)
@@ -126,8 +32,7 @@ class PuzzleGame:
         self.right_frame = tk.Frame(self.root)
         self.right_frame.grid(row=0, column=1, padx=10, pady=10)
 
-        full_image = Image.open("girl/girl.png").resize((300, 300))
-        self.full_image = ImageTk.PhotoImage(full_image)
+        self.full_image = load_image("girl/girl.png", (300, 300))
 
         self.left_image_label = tk.Label(self.left_frame, image=self.full_image)
         self.left_image_label.pack()
@@ -146,7 +51,11 @@ class PuzzleGame:
             self.right_frame.grid_columnconfigure(i, weight=1)
 
         self.start_button = tk.Button(self.root, text="Start", command=self.solve_puzzle)
-        self.start_button.grid(row=1, column=0, columnspan=2, pady=10)
+        self.start_button.grid(row=1, column=0, pady=10)
+
+        self.cancel_button = tk.Button(self.root, text="Cancel", command=self.cancel_solve, state=tk.DISABLED)
+        self.cancel_button.grid(row=1, column=1, pady=10)
+        self.search = None  # The running BackgroundSolve, if any
 
         # Label to show the step number
         self.step_label = tk.Label(self.root, text="", font=("Arial", 16))
@@ -168,31 +77,75 @@ class PuzzleGame:
             print("Please complete the puzzle first.")
             return
 
-        if is_solvable(self.puzzle_state):
+        if get_relabeling(self.goal_state).solvable(self.puzzle_state):
             start_time = time.time()  # Start the timer
-            solution = ids(self.puzzle_state, self.goal_state)
-            self.animate_solution(solution, start_time)  # Pass the start_time to animate_solution
+            goal_state = self.goal_state
+
+            def solver(board, cancel, progress):
+                return get_cache().solve(board, "ida*",
+                                         lambda b: solvers.run(b, "ida*", goal_state, cancel, progress)[0],
+                                         goal=pack(goal_state))
+
+            # Search on a worker thread so the window keeps responding
+            self.start_button.config(state=tk.DISABLED)
+            self.cancel_button.config(state=tk.NORMAL)
+            self.step_label.config(text="Solving...")
+            self.search = BackgroundSolve(
+                self.root, solver, list(self.puzzle_state),
+                lambda solution, cancelled: self.solve_done(solution, cancelled, start_time),
+                self.show_progress, self.solve_failed)
         else:
             print("No solution exists for this state.")
 
+    def cancel_solve(self):
+        if self.search is not None:
+            self.search.cancel()
+
+    def show_progress(self, depth, nodes):
+        self.step_label.config(text=f"Depth {depth}, {nodes} nodes expanded")
+
+    def solve_done(self, solution, cancelled, start_time):
+        self.search = None
+        self.start_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if cancelled:
+            self.step_label.config(text="Cancelled.")
+        elif solution:
+            self.animate_solution(solution, start_time)  # Pass the start_time to animate_solution
+        else:
+            self.step_label.config(text="No solution found.")
+
+    def solve_failed(self, error):
+        self.search = None
+        self.start_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.step_label.config(text=f"Search failed: {error}")
+
     def animate_solution(self, solution, start_time):
         total_steps = len(solution)
-        for step_number, state in enumerate(solution, start=1):
+        boards = enumerate(solution, start=1)  # Boards are rebuilt one at a time as needed
+
+        # One step per second, scheduled through after() so the window stays live
+        def step_animation():
+            step = next(boards, None)
+            if step is None:
+                elapsed_time = time.time() - start_time  # Calculate elapsed time
+                self.time_label.config(text=f"Total Time: {elapsed_time:.2f} seconds")  # Update time label
+                self.step_label.config(text="Solved!")  # Indicate completion
+                return
+            step_number, state = step
             self.update_grid(state)
             self.step_label.config(text=f"Step: {step_number}/{total_steps}")  # Update step label
-            self.root.update()
-            time.sleep(1)
+            self.root.after(1000, step_animation)
 
-        elapsed_time = time.time() - start_time  # Calculate elapsed time
-        self.time_label.config(text=f"Total Time: {elapsed_time:.2f} seconds")  # Update time label
-        self.step_label.config(text="Solved!")  # Indicate completion
+        step_animation()
 
     def update_grid(self, state):
-        for i in range(3):
-            for j in range(3):
-                index = i * 3 + j
-                tile = state[index]
-                self.buttons[i][j].config(image=self.images[tile])
+        # Only the tiles that moved are reconfigured
+        for index in changed_cells(self.displayed_state, state):
+            i, j = divmod(index, 3)
+            self.buttons[i][j].config(image=self.images[state[index]])
+        self.displayed_state = list(state)
 
 if __name__ == "__main__":
     root = tk.Tk()
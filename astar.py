@@ -0,0 +1,253 @@
+from heapq import heappush, heappop
+from puzzlestate import GOAL_TILES, is_nested, slide, geometry_of
+from solution import Solution
+from solutioncache import get_cache
+from heuristics import HEURISTICS, make_heuristic
+from bfspuzz import is_solvable, input_initial_state, print_solution
+
+# Goal state for the 8-puzzle
+GOAL_STATE = [GOAL_TILES[i:i + 3] for i in range(0, 9, 3)]
+
+# How often (in expanded nodes) astar reports progress and checks for cancellation
+PROGRESS_INTERVAL = 4096
+
+# Weights of the successive anytime_astar passes; the last must be 1 for an optimal result
+ANYTIME_WEIGHTS = (5.0, 3.0, 2.0, 1.5, 1.25, 1.0)
+
+
+# Walk the parent map back from `state` to the start
+def reconstruct_path(parent, state):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parent[state]
+    path.reverse()
+    return path
+
+
+# A* search: returns the Solution from start to goal, yielding boards in the
+# same shape (flat or nested rows) as `initial_state`, or None if unreachable
+# If a `stats` dict is given it receives the nodes expanded and generated and
+# the peak size of the open list (peak_frontier). Every PROGRESS_INTERVAL
+# expansions progress(f, nodes) is called if given, and the search gives up
+# if the `cancel` event has been set. Given an instrument.Probe, the search
+# runs through probed_astar instead.
+def astar(initial_state, goal_state=None, heuristic="manhattan", stats=None,
+          cancel=None, progress=None, probe=None):
+    if probe is not None:
+        return probed_astar(initial_state, goal_state, heuristic, stats, cancel, progress, probe)
+    geometry = geometry_of(initial_state)
+    goal_state = geometry.goal_tiles if goal_state is None else goal_state
+    start = geometry.pack(initial_state)
+    goal = geometry.pack(goal_state)
+    h = make_heuristic(heuristic, goal, geometry)
+    slides, blank_shift = geometry.slides, geometry.blank_shift
+
+    # Heap entries are (f, h, state); ties on f prefer the node closer to the goal
+    start_h = h(start)
+    open_list = [(start_h, start_h, start)]
+    # best_g doubles as the closed set: a state is only pushed again if it is
+    # reached more cheaply than before, which never happens with a consistent
+    # heuristic once it has been expanded
+    best_g = {start: 0}
+    parent = {start: None}
+    expanded = generated = 0
+    peak_frontier = 1
+    solution = None
+
+    while open_list:
+        f, state_h, state = heappop(open_list)
+        g = f - state_h
+        if g > best_g[state]:
+            continue  # Stale entry for a state since reached more cheaply
+        if state == goal:
+            solution = Solution.from_states(reconstruct_path(parent, state), is_nested(initial_state),
+                                            geometry)
+            break
+
+        expanded += 1
+        if expanded % PROGRESS_INTERVAL == 0:
+            if progress is not None:
+                progress(f, expanded)
+            if cancel is not None and cancel.is_set():
+                break
+        g += 1
+        for entry in slides[state >> blank_shift]:
+            child = slide(state, entry)
+            if g >= best_g.get(child, g + 1):
+                continue
+            best_g[child] = g
+            parent[child] = state
+            child_h = h(child)
+            heappush(open_list, (g + child_h, child_h, child))
+            generated += 1
+        if len(open_list) > peak_frontier:
+            peak_frontier = len(open_list)
+
+    if stats is not None:
+        stats.update(expanded=expanded, generated=generated, peak_frontier=peak_frontier)
+    return solution  # None if the goal is not reachable from the initial state
+
+
+# astar reporting every expansion and duplicate to an instrument.Probe, and
+# each new best f as an iteration; a separate copy so the plain loop pays
+# nothing for instrumentation
+def probed_astar(initial_state, goal_state, heuristic, stats, cancel, progress, probe):
+    geometry = geometry_of(initial_state)
+    goal_state = geometry.goal_tiles if goal_state is None else goal_state
+    start = geometry.pack(initial_state)
+    goal = geometry.pack(goal_state)
+    h = make_heuristic(heuristic, goal, geometry)
+    slides, blank_shift = geometry.slides, geometry.blank_shift
+
+    start_h = h(start)
+    open_list = [(start_h, start_h, start)]
+    best_g = {start: 0}
+    parent = {start: None}
+    expanded = generated = 0
+    peak_frontier = 1
+    bound = start_h
+    solution = None
+
+    while open_list:
+        f, state_h, state = heappop(open_list)
+        g = f - state_h
+        if g > best_g[state]:
+            probe.duplicate()
+            continue
+        if f > bound:
+            probe.iteration(bound)
+            bound = f
+        if state == goal:
+            solution = Solution.from_states(reconstruct_path(parent, state), is_nested(initial_state),
+                                            geometry)
+            break
+
+        expanded += 1
+        probe.expand(state, g)
+        if expanded % PROGRESS_INTERVAL == 0:
+            if progress is not None:
+                progress(f, expanded)
+            if cancel is not None and cancel.is_set():
+                break
+        g += 1
+        for entry in slides[state >> blank_shift]:
+            child = slide(state, entry)
+            if g >= best_g.get(child, g + 1):
+                probe.duplicate()
+                continue
+            best_g[child] = g
+            parent[child] = state
+            child_h = h(child)
+            heappush(open_list, (g + child_h, child_h, child))
+            generated += 1
+        if len(open_list) > peak_frontier:
+            peak_frontier = len(open_list)
+
+    probe.iteration(bound)
+    if stats is not None:
+        stats.update(expanded=expanded, generated=generated, peak_frontier=peak_frontier)
+    return solution
+
+
+# Anytime weighted A*: a first pass ranks nodes by g + weight * h, which
+# reaches some solution quickly, and every later pass restarts with the next
+# smaller weight, pruning any node that cannot beat the best solution so far
+# (g + h >= its length). A pass that empties its open list proves the best
+# solution optimal, as does the final pass at weight 1. If the `cancel`
+# event is seen between progress reports the best solution so far is
+# returned, or None if no pass has finished yet. `stats` receives the
+# counters summed over every pass, the weight of the last finished pass
+# (weight) and whether the result is proven optimal (optimal).
+# on_improve(solution), if given, is called with every better solution.
+def anytime_astar(initial_state, goal_state=None, heuristic="linear_conflict", stats=None,
+                  cancel=None, progress=None, weights=ANYTIME_WEIGHTS, on_improve=None):
+    geometry = geometry_of(initial_state)
+    goal_state = geometry.goal_tiles if goal_state is None else goal_state
+    start = geometry.pack(initial_state)
+    goal = geometry.pack(goal_state)
+    h = make_heuristic(heuristic, goal, geometry)
+    slides, blank_shift = geometry.slides, geometry.blank_shift
+    start_h = h(start)
+    expanded = generated = 0
+    peak_frontier = 1
+    best = None  # Best solution so far
+    bound = None  # Its length: only paths shorter than this are worth finding
+    last_weight = None
+    optimal = False
+
+    for weight in weights:
+        open_list = [(weight * start_h, start_h, 0, start)]
+        best_g = {start: 0}
+        parent = {start: None}
+        stopped = found = False
+        while open_list:
+            _, state_h, g, state = heappop(open_list)
+            if g > best_g[state]:
+                continue
+            if state == goal:
+                best = Solution.from_states(reconstruct_path(parent, state), is_nested(initial_state),
+                                            geometry)
+                bound = g
+                found = True
+                if on_improve is not None:
+                    on_improve(best)
+                break
+
+            expanded += 1
+            if expanded % PROGRESS_INTERVAL == 0:
+                if progress is not None:
+                    progress(g + state_h, expanded)
+                if cancel is not None and cancel.is_set():
+                    stopped = True
+                    break
+            g += 1
+            for entry in slides[state >> blank_shift]:
+                child = slide(state, entry)
+                if g >= best_g.get(child, g + 1):
+                    continue
+                child_h = h(child)
+                if bound is not None and g + child_h >= bound:
+                    continue  # Cannot lead to a shorter solution
+                best_g[child] = g
+                parent[child] = state
+                heappush(open_list, (g + weight * child_h, child_h, g, child))
+                generated += 1
+            if len(open_list) > peak_frontier:
+                peak_frontier = len(open_list)
+        if stopped:
+            break
+        last_weight = weight
+        if not found or weight == 1:
+            optimal = best is not None  # No shorter path exists, or A* proper found the shortest
+            break
+
+    if stats is not None:
+        stats.update(expanded=expanded, generated=generated, peak_frontier=peak_frontier,
+                     weight=last_weight, optimal=optimal)
+    return best
+
+
+# Main function
+def main():
+    initial_state = input_initial_state()
+
+    if not is_solvable(initial_state):
+        print("This puzzle configuration is unsolvable.")
+        return
+
+    print("Heuristics:", ", ".join(HEURISTICS))
+    heuristic = input("Heuristic [manhattan]: ").strip() or "manhattan"
+
+    print(f"Solving the puzzle using A* ({heuristic})...")
+    solution = get_cache().solve(initial_state, "astar",
+                                 lambda board: astar(board, heuristic=heuristic))
+
+    if solution:
+        print_solution(solution)
+    else:
+        print("No solution found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Run a solver on a worker thread so the Tk main loop never blocks.
+#
+# The worker posts progress and the final result to a queue, which the Tk
+# thread drains from an after() callback; Tk widgets are only ever touched
+# from the main thread. Cancelling sets an Event that the solvers check
+# periodically, so the search actually stops instead of running on unseen.
+
+import queue
+import threading
+
+POLL_MS = 50
+
+
+class BackgroundSolve:
+    """Run solver(board, cancel, progress) off the Tk thread.
+
+    `cancel` is a threading.Event for the solver to poll and `progress` a
+    callback taking (depth, nodes expanded). on_done(result, cancelled) and
+    on_progress(depth, nodes) are called on the Tk thread; on_error(exc) is
+    called if the solver raises.
+    """
+
+    def __init__(self, master, solver, board, on_done, on_progress=None, on_error=None):
+        self.master = master
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self.cancel_event = threading.Event()
+        self.messages = queue.Queue()
+        self.thread = threading.Thread(target=self._run, args=(solver, board), daemon=True)
+        self.thread.start()
+        self.master.after(POLL_MS, self._poll)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _run(self, solver, board):
+        try:
+            result = solver(board, self.cancel_event, self._report)
+        except Exception as exc:  # Handed to the Tk thread rather than lost with the thread
+            self.messages.put(("error", exc))
+        else:
+            self.messages.put(("done", result))
+
+    def _report(self, depth, nodes):
+        self.messages.put(("progress", (depth, nodes)))
+
+    def _poll(self):
+        progress = None
+        while True:
+            try:
+                kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                progress = payload  # Only the latest report is worth drawing
+                continue
+            if kind == "error":
+                if self.on_error is not None:
+                    self.on_error(payload)
+                return
+            if progress is not None and self.on_progress is not None:
+                self.on_progress(*progress)
+            self.on_done(None if self.cancelled else payload, self.cancelled)
+            return
+        if progress is not None and self.on_progress is not None:
+            self.on_progress(*progress)
+        self.master.after(POLL_MS, self._poll)
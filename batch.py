@@ -0,0 +1,147 @@
+# Batch solving: stream puzzles from a file, solve them across a pool of
+# worker processes, and write the results in input order.
+#
+# Input and output use the line format from puzzleio: one puzzle per input
+# line, and one "<board> <moves> <UDLR...>" line per solution. Solvers come
+# from the registry in solvers.py, whose command line drives this module:
+#
+#     python solvers.py --algo ida* --input puzzles.txt --workers 8
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from puzzlestate import geometry_of, to_rows
+from relabel import get_relabeling
+from puzzleio import parse_board, format_board, format_solution
+from solutioncache import SolutionCache
+import solvers
+import distancetable
+
+# Per-process state, filled in by _init_worker
+_worker = {"algorithm": None, "goal": None, "width": None, "cache": None, "budget": {}}
+
+
+def _init_worker(algorithm, cache_path=None, goal=None, width=None, budget=None):
+    _worker["algorithm"] = algorithm
+    _worker["goal"] = goal
+    _worker["width"] = width
+    _worker["budget"] = budget or {}
+    if cache_path:
+        _worker["cache"] = SolutionCache(path=cache_path)
+
+
+# Prefix of the comment line written in place of a board that cannot be solved
+ERROR = "# error"
+
+
+# Boards from `lines`, with an error message in place of every line that is
+# not a board, so one bad line does not end the stream
+def _read_boards(lines):
+    for number, line in enumerate(lines, 1):
+        try:
+            board = parse_board(line)
+        except ValueError as e:
+            yield f"line {number}: {e}"
+            continue
+        if board is not None:
+            yield board
+
+
+# Solve one board; returns its output line and the run metrics (None when
+# the board is unsolvable or the solution came from the cache). Without a
+# configured goal each board is solved to the default goal for its size.
+# A board that runs out of its budget is written as unsolved, or with the
+# best solution so far from an anytime algorithm, and is never cached. An
+# input line that is not a board, or a board the solver rejects (such as
+# one of the wrong size), is written as an ERROR comment line.
+def solve_board(board):
+    if isinstance(board, str):
+        return f"{ERROR} {board}", None
+    try:
+        return _solve_board(board)
+    except ValueError as e:
+        return f"{ERROR} {format_board(board)}: {e}", None
+
+
+def _solve_board(board):
+    algorithm, width, cache = _worker["algorithm"], _worker["width"], _worker["cache"]
+    geometry = geometry_of(board, width)
+    goal = _worker["goal"] or geometry.goal_tiles
+    if not get_relabeling(goal, geometry).solvable(board):
+        return format_solution(board, None), None
+
+    if cache is not None:
+        solution = cache.get(to_rows(board, geometry.width), algorithm, geometry.pack(goal))
+        if solution is not None:
+            return format_solution(board, solution.move_string()), None
+
+    result = solvers.solve(board, algorithm, goal, width=width, **_worker["budget"])
+    if result.status == solvers.UNSUPPORTED:
+        return f"{ERROR} {format_board(board)}: {result.reason}", None
+    if result.solution is None:
+        return format_solution(board, None, solved=False), result.metrics
+    if cache is not None and result.status == solvers.SOLVED:
+        cache.put(result.solution, algorithm, geometry.pack(goal))
+    return format_solution(board, result.solution.move_string()), result.metrics
+
+
+def _solve_chunk(boards):
+    return [solve_board(board) for board in boards]
+
+
+# Fold one board's metrics into the running totals
+def _add_metrics(totals, line, metrics):
+    if line.startswith(ERROR):
+        totals["errors"] = totals.get("errors", 0) + 1
+        return
+    totals["boards"] = totals.get("boards", 0) + 1
+    if line.endswith(" unsolvable"):
+        totals["unsolvable"] = totals.get("unsolvable", 0) + 1
+    if metrics is None:
+        return
+    totals["searched"] = totals.get("searched", 0) + 1
+    for key in ("expanded", "generated", "wall_time"):
+        totals[key] = totals.get(key, 0) + metrics[key]
+    for key in ("peak_frontier", "peak_rss"):
+        totals[key] = max(totals.get(key, 0), metrics[key])
+
+
+# Solve every board from `lines` and yield output lines in input order.
+# At most `workers * 4` chunks are in flight, so input is streamed rather
+# than read whole. If a `totals` dict is given it accumulates the metrics
+# of every search (counts and wall time summed, peaks maximised). `width`
+# is needed when the boards are not square, and `budget` holds keyword
+# limits for solvers.solve (timeout, max_nodes, max_memory) applied to each
+# board. Bad lines are answered with ERROR lines, in order, and counted in
+# totals["errors"].
+def solve_stream(lines, algorithm="ida*", workers=None, chunksize=64, cache_path=None,
+                 goal=None, totals=None, width=None, budget=None):
+    solvers.get_algorithm(algorithm)  # Fail early on an unknown name
+    totals = totals if totals is not None else {}
+    workers = workers or os.cpu_count() or 1
+    boards = _read_boards(lines)
+    if workers == 1:
+        _init_worker(algorithm, cache_path, goal, width, budget)
+        for board in boards:
+            line, metrics = solve_board(board)
+            _add_metrics(totals, line, metrics)
+            yield line
+        return
+
+    if algorithm == "table":
+        distancetable.DistanceTable().close()  # Build the table once, before the workers map it
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(algorithm, cache_path, goal, width, budget)) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < workers * 4:
+                chunk = list(islice(boards, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_solve_chunk, chunk))
+            if not pending:
+                break
+            for line, metrics in pending.popleft().result():
+                _add_metrics(totals, line, metrics)
+                yield line
@@ -0,0 +1,192 @@
+# Reproducible benchmark of every registered solver across difficulty bands.
+#
+# Instances are drawn with a fixed seed from the exact BFS layers around the
+# goal, so a band of depth 20 holds boards whose optimal solution is exactly
+# 20 moves and every run of the same seed solves the same boards. Each
+# algorithm runs in its own worker process so peak RSS is per algorithm,
+# and a solve that exceeds the timeout is cancelled and counted as such.
+#
+# Results are written as JSON and summarised as a table. Given a baseline
+# JSON from an earlier run, any (algorithm, band) whose mean wall time grew
+# by more than the threshold is reported and the exit status is 1.
+#
+# Examples:
+#     python benchmark.py --output bench.json
+#     python benchmark.py --algos ida* astar --baseline bench.json --threshold 0.15
+
+import argparse
+import json
+import random
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from puzzlestate import GOAL_TILES, unpack
+from generator import depth_layers
+import solvers
+
+DEFAULT_BANDS = (5, 10, 15, 20, 25, 31)
+DEFAULT_PER_BAND = 10
+DEFAULT_SEED = 1
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEAT = 3
+DEFAULT_MIN_DELTA = 0.001  # Seconds; smaller slowdowns are timer noise
+
+
+# Seeded instance sets: {depth: [flat boards]}, `per_band` boards per depth
+# (fewer if the layer is smaller, as at depth 31)
+def make_instances(bands=DEFAULT_BANDS, per_band=DEFAULT_PER_BAND, seed=DEFAULT_SEED):
+    layers = depth_layers()
+    rng = random.Random(seed)
+    instances = {}
+    for band in bands:
+        if band >= len(layers):
+            raise ValueError(f"No 8-puzzle needs {band} moves (the maximum is {len(layers) - 1})")
+        layer = sorted(layers[band])  # Sorted so the draw depends only on the seed
+        instances[band] = [unpack(state) for state in rng.sample(layer, min(per_band, len(layer)))]
+    return instances
+
+
+# Solve one board, cancelling the search after `timeout` seconds
+def timed_run(board, algorithm, timeout):
+    cancel = threading.Event()
+    timer = threading.Timer(timeout, cancel.set)
+    timer.start()
+    try:
+        return solvers.run(board, algorithm, cancel=cancel)
+    finally:
+        timer.cancel()
+
+
+# Run one algorithm over every band; executed in a fresh worker process.
+# Each board is solved `repeat` times and the fastest run is kept, which
+# filters out scheduler noise on the short solves.
+def bench_algorithm(algorithm, instances, timeout, repeat=DEFAULT_REPEAT):
+    solvers.run(GOAL_TILES, algorithm)  # Warm-up: loads tables such as the distance table untimed
+    results = {}
+    for band, boards in instances.items():
+        solved = timeouts = expanded = 0
+        wall_time = 0.0
+        for board in boards:
+            solution, metrics = timed_run(board, algorithm, timeout)
+            for _ in range(repeat - 1):
+                if solution is None:
+                    break  # Timed out once, no point waiting again
+                solution, again = timed_run(board, algorithm, timeout)
+                if again["wall_time"] < metrics["wall_time"]:
+                    metrics = again
+            wall_time += metrics["wall_time"]
+            expanded += metrics["expanded"]
+            if solution is None:
+                timeouts += 1
+                continue
+            if len(solution) - 1 != band and solvers.ALGORITHMS[algorithm].optimal:
+                raise AssertionError(f"{algorithm} solved {board} in {len(solution) - 1} moves, expected {band}")
+            solved += 1
+        results[str(band)] = {
+            "instances": len(boards),
+            "solved": solved,
+            "timeouts": timeouts,
+            "wall_time": wall_time,
+            "mean_time": wall_time / len(boards),
+            "expanded": expanded,
+            "nodes_per_sec": expanded / wall_time if wall_time else 0.0,
+            "peak_rss": solvers.peak_rss(),
+        }
+    return results
+
+
+def run_benchmark(algorithms=None, bands=DEFAULT_BANDS, per_band=DEFAULT_PER_BAND,
+                  seed=DEFAULT_SEED, timeout=DEFAULT_TIMEOUT, repeat=DEFAULT_REPEAT):
+    algorithms = list(algorithms or solvers.ALGORITHMS)
+    for algorithm in algorithms:
+        solvers.get_algorithm(algorithm)
+    instances = make_instances(bands, per_band, seed)
+    report = {
+        "seed": seed,
+        "per_band": per_band,
+        "timeout": timeout,
+        "repeat": repeat,
+        "bands": list(bands),
+        "instances": {str(band): ["".join(map(str, board)) for board in boards]
+                      for band, boards in instances.items()},
+        "results": {},
+    }
+    for algorithm in algorithms:
+        # A fresh process per algorithm keeps RSS and warm caches from leaking between them
+        with ProcessPoolExecutor(1) as pool:
+            report["results"][algorithm] = pool.submit(bench_algorithm, algorithm, instances, timeout,
+                                                         repeat).result()
+    return report
+
+
+# Summary table: mean time, throughput and timeouts per (algorithm, band)
+def format_summary(report):
+    lines = [f"{'algorithm':14} {'band':>4} {'solved':>7} {'mean ms':>10} {'nodes/s':>12} {'peak MB':>8}"]
+    for algorithm, bands in report["results"].items():
+        for band, row in bands.items():
+            lines.append(f"{algorithm:14} {band:>4} {row['solved']:>3}/{row['instances']:<3} "
+                         f"{row['mean_time'] * 1000:>10.2f} {row['nodes_per_sec']:>12.0f} "
+                         f"{row['peak_rss'] / 2 ** 20:>8.1f}")
+    return "\n".join(lines)
+
+
+# List of (algorithm, band, baseline mean, current mean) that slowed down by
+# more than `threshold` (0.10 = 10%) and by at least `min_delta` seconds.
+# Entries missing from either side, or that timed out in either run, are not
+# compared.
+def find_regressions(report, baseline, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    regressions = []
+    for algorithm, bands in report["results"].items():
+        for band, row in bands.items():
+            old = baseline.get("results", {}).get(algorithm, {}).get(band)
+            if old is None or row["timeouts"] or old["timeouts"]:
+                continue
+            slower = row["mean_time"] - old["mean_time"]
+            if slower > old["mean_time"] * threshold and slower >= min_delta:
+                regressions.append((algorithm, band, old["mean_time"], row["mean_time"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the solvers across difficulty bands.")
+    parser.add_argument("--algos", nargs="+", choices=list(solvers.ALGORITHMS),
+                        help="algorithms to run (default: all)")
+    parser.add_argument("--bands", nargs="+", type=int, default=list(DEFAULT_BANDS),
+                        help="optimal solution lengths to test (default: %(default)s)")
+    parser.add_argument("--per-band", type=int, default=DEFAULT_PER_BAND,
+                        help="instances per band (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="instance seed (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds before a single solve is cancelled (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="runs per board, fastest kept (default: %(default)s)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a regression is reported (default: %(default)s)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="ignore slowdowns under this many seconds (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.algos, args.bands, args.per_band, args.seed, args.timeout, args.repeat)
+    print(format_summary(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("seed") != report["seed"] or baseline.get("instances") != report["instances"]:
+            print("Warning: the baseline was run on different instances", file=sys.stderr)
+        regressions = find_regressions(report, baseline, args.threshold, args.min_delta)
+        for algorithm, band, old, new in regressions:
+            print(f"Regression: {algorithm} at depth {band}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,28 @@
 from collections import deque
+from puzzlestate import SLIDES, BLANK_SHIFT, WIDTH, pack, is_nested, slide
+from solution import Solution
+from solutioncache import get_cache
 
 # Goal state for the 8-puzzle
 GOAL_STATE = [[1, 2, 3], 
               [4, 5, 6], 
               [7, 8, 0]]  # 0 represents the empty space
+GOAL = pack(GOAL_STATE)  # Packed form used by the search
 
-# Helper function to find the position of the empty tile (0)
+# How often (in expanded nodes) bfs reports progress and checks for cancellation
+PROGRESS_INTERVAL = 4096
+
+# Helper function to find the position of the empty tile (0) in a packed state
 def find_empty_tile(state):
-    for i in range(3):
-        for j in range(3):
-            if state[i][j] == 0:
-                return i, j
+    return divmod(state >> BLANK_SHIFT, WIDTH)
 
-# Check if the current state is the goal state
+# Check if the current (packed) state is the goal state
 def is_goal_state(state):
-    return state == GOAL_STATE
+    return state == GOAL
 
-# Generate all possible next states by moving the empty tile
+# Generate all possible next (packed) states by moving the empty tile
 def generate_next_states(state):
-    next_states = []
-    x, y = find_empty_tile(state)
-    
-    # Define the possible moves: (up, down, left, right)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    for dx, dy in moves:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < 3 and 0 <= ny < 3:
-            # Swap the empty tile with the neighboring tile
-            new_state = [row[:] for row in state]
-            new_state[x][y], new_state[nx][ny] = new_state[nx][ny], new_state[x][y]
-            next_states.append(new_state)
-    
-    return next_states
+    return [slide(state, entry) for entry in SLIDES[state >> BLANK_SHIFT]]
 
 # Check if the puzzle is solvable by counting inversions
 def is_solvable(state):
@@ -42,27 +32,166 @@ def is_solvable(state):
                      if flat_state[i] > flat_state[j])
     return inversions % 2 == 0  # Solvable if inversions are even
 
-# BFS to find the solution
-def bfs(initial_state):
-    visited = set()  # To avoid revisiting states
-    queue = deque([(initial_state, [])])  # Queue of (state, path to state)
+# BFS to find the solution. Each reached state records only its parent, and
+# states are marked visited when enqueued, so every state is queued at most
+# once and the path is rebuilt a single time at the goal. If a `stats` dict
+# is given it receives the nodes expanded and generated, the peak queue size
+# (peak_frontier) and the number of states reached (visited).
+# Every PROGRESS_INTERVAL expansions the search calls progress(depth, nodes)
+# if given, and returns None if the `cancel` event has been set. Given an
+# instrument.Probe, the search runs through probed_bfs instead.
+def bfs(initial_state, stats=None, cancel=None, progress=None, goal_state=GOAL_STATE, probe=None):
+    if probe is not None:
+        return probed_bfs(initial_state, stats, cancel, progress, goal_state, probe)
+    start = pack(initial_state)
+    goal = pack(goal_state)
+    parents = {start: None}  # Parent of every state reached so far
+    queue = deque([start])
+    peak_queue = 1
+    depth, layer_left, next_layer = 0, 1, 0  # Track BFS layers for progress reports
+    expanded = 0
+    solution = None
     
     while queue:
-        current_state, path = queue.popleft()
+        current_state = queue.popleft()
+        if layer_left == 0:
+            depth, layer_left, next_layer = depth + 1, next_layer, 0
+        layer_left -= 1
         
-        # If the goal state is reached, return the path
-        if is_goal_state(current_state):
-            return path + [current_state]
+        # If the goal state is reached, rebuild the path from the parent map
+        if current_state == goal:
+            solution = Solution.from_states(reversed(trace_parents(parents, current_state)),
+                                            is_nested(initial_state))
+            break
         
-        # Mark the current state as visited
-        visited.add(tuple(map(tuple, current_state)))
+        expanded += 1
+        if expanded % PROGRESS_INTERVAL == 0:
+            if progress is not None:
+                progress(depth, expanded)
+            if cancel is not None and cancel.is_set():
+                break
         
-        # Generate and explore the next states
+        # Generate and enqueue the unseen next states
         for next_state in generate_next_states(current_state):
-            if tuple(map(tuple, next_state)) not in visited:
-                queue.append((next_state, path + [current_state]))
+            if next_state not in parents:
+                parents[next_state] = current_state
+                queue.append(next_state)
+                next_layer += 1
+        peak_queue = max(peak_queue, len(queue))
     
-    return None  # No solution found
+    if stats is not None:
+        stats.update(expanded=expanded, generated=len(parents) - 1, peak_frontier=peak_queue,
+                     visited=len(parents))
+    return solution  # None if no solution was found
+
+# bfs reporting every expansion, duplicate and layer to an instrument.Probe;
+# a separate copy so the plain loop pays nothing for instrumentation
+def probed_bfs(initial_state, stats, cancel, progress, goal_state, probe):
+    start = pack(initial_state)
+    goal = pack(goal_state)
+    parents = {start: None}
+    queue = deque([start])
+    peak_queue = 1
+    depth, layer_left, next_layer = 0, 1, 0
+    expanded = 0
+    solution = None
+
+    while queue:
+        current_state = queue.popleft()
+        if layer_left == 0:
+            probe.iteration(depth)
+            depth, layer_left, next_layer = depth + 1, next_layer, 0
+        layer_left -= 1
+
+        if current_state == goal:
+            solution = Solution.from_states(reversed(trace_parents(parents, current_state)),
+                                            is_nested(initial_state))
+            break
+
+        expanded += 1
+        probe.expand(current_state, depth)
+        if expanded % PROGRESS_INTERVAL == 0:
+            if progress is not None:
+                progress(depth, expanded)
+            if cancel is not None and cancel.is_set():
+                break
+
+        for next_state in generate_next_states(current_state):
+            if next_state not in parents:
+                parents[next_state] = current_state
+                queue.append(next_state)
+                next_layer += 1
+            else:
+                probe.duplicate()
+        peak_queue = max(peak_queue, len(queue))
+
+    if stats is not None:
+        stats.update(expanded=expanded, generated=len(parents) - 1, peak_frontier=peak_queue,
+                     visited=len(parents))
+    return solution
+
+# Walk a parent map back from `state` to the root of its search
+def trace_parents(parents, state):
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    return path
+
+# Bidirectional BFS: grow a frontier from the start and one from the goal,
+# always expanding the smaller one a full layer at a time, and stop at the
+# first layer where they meet. `stats`, `cancel` and `progress` work as for
+# bfs; progress reports the depth of the side being expanded.
+def bidirectional_bfs(initial_state, stats=None, goal_state=GOAL_STATE, cancel=None, progress=None):
+    start = pack(initial_state)
+    goal = pack(goal_state)
+
+    # Per side: parent of every reached state, depth of every reached state, frontier
+    forward = ({start: None}, {start: 0}, [start])
+    backward = ({goal: None}, {goal: 0}, [goal])
+    expanded = 0
+    peak_frontier = 1
+    solution = Solution(start, nested=is_nested(initial_state)) if start == goal else None
+
+    stopped = False
+    while solution is None and forward[2] and backward[2]:
+        side, other = (forward, backward) if len(forward[2]) <= len(backward[2]) else (backward, forward)
+        parents, depths, frontier = side
+        next_frontier = []
+        best, meeting = None, None
+        for state in frontier:
+            depth = depths[state] + 1
+            expanded += 1
+            if expanded % PROGRESS_INTERVAL == 0:
+                if progress is not None:
+                    progress(depth, expanded)
+                if cancel is not None and cancel.is_set():
+                    stopped = True
+                    break
+            for next_state in generate_next_states(state):
+                if next_state in parents:
+                    continue
+                parents[next_state] = state
+                depths[next_state] = depth
+                next_frontier.append(next_state)
+                if next_state in other[1]:
+                    # Finish the layer and keep the shortest connection
+                    total = depth + other[1][next_state]
+                    if best is None or total < best:
+                        best, meeting = total, next_state
+        if stopped:
+            break
+        if meeting is not None:
+            path = trace_parents(forward[0], meeting)[::-1] + trace_parents(backward[0], meeting)[1:]
+            solution = Solution.from_states(path, is_nested(initial_state))
+        side[2][:] = next_frontier
+        peak_frontier = max(peak_frontier, len(forward[2]) + len(backward[2]))
+
+    if stats is not None:
+        visited = len(forward[0]) + len(backward[0])
+        stats.update(expanded=expanded, generated=visited - 2, peak_frontier=peak_frontier,
+                     visited=visited)
+    return solution  # None if the frontiers never met: the puzzle is unsolvable
 
 # Input the initial state from the user
 def input_initial_state():
@@ -90,13 +219,21 @@ def main():
         print("This puzzle configuration is unsolvable.")
         return
 
+    mode = input("Search mode, bfs or bidirectional [bfs]: ").strip() or "bfs"
     print("Solving the puzzle using BFS...")
-    solution = bfs(initial_state)
+    stats = {}
+    if mode == "bidirectional":
+        solution = get_cache().solve(initial_state, "bidirectional",
+                                     lambda board: bidirectional_bfs(board, stats))
+    else:
+        solution = get_cache().solve(initial_state, "bfs", lambda board: bfs(board, stats))
 
     if solution:
         print_solution(solution)
     else:
         print("No solution found.")
+    if stats:  # Empty when the solution came from the cache
+        print(f"States reached: {stats['visited']}, peak queue size: {stats['peak_frontier']}")
 
 # Run the main function
 if __name__ == "__main__":
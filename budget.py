@@ -0,0 +1,77 @@
+# Resource limits for a single solve.
+#
+# A Budget stands in for both the `cancel` event and the `progress`
+# callback that every solver already takes, so no search loop changes:
+# the solver asks budget.is_set() and reports progress(depth, nodes) every
+# PROGRESS_INTERVAL expansions, and the budget trips once the wall-clock
+# deadline has passed, the node count reaches max_nodes or the process
+# holds more than max_memory bytes. Solvers report progress before they
+# check is_set(), so a limit tripped by a report stops the search at that
+# same check: limits are enforced to within one progress interval (4096
+# expansions).
+#
+# Example:
+#     budget = Budget(timeout=2.0, max_nodes=10 ** 6)
+#     solution = puzzle.ida_star(board, cancel=budget, progress=budget.progress)
+#     if budget.exhausted:
+#         print("gave up:", budget.exhausted)
+
+import os
+import resource
+import sys
+import time
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# Resident set size of this process in bytes: the current size where /proc
+# reports it, otherwise the peak so far
+def current_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Budget:
+    """Deadline, node and memory limits, checked through cancel/progress.
+
+    `deadline` is a time.monotonic() value and `timeout` a number of
+    seconds from now; give either. `cancel` is an optional outside event
+    that also stops the search, and `progress` a callback to forward the
+    solver's reports to. Once a limit is hit, `exhausted` names it
+    ("deadline", "nodes", "memory" or "cancelled") and is_set() stays true.
+    """
+
+    def __init__(self, deadline=None, max_nodes=None, max_memory=None, timeout=None,
+                 cancel=None, progress=None):
+        if timeout is not None:
+            until = time.monotonic() + timeout
+            deadline = until if deadline is None else min(deadline, until)
+        self.deadline = deadline
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.cancel = cancel
+        self.forward = progress
+        self.nodes = 0  # Expansions at the last progress report
+        self.exhausted = None
+
+    def is_set(self):
+        if self.exhausted is None:
+            if self.cancel is not None and self.cancel.is_set():
+                self.exhausted = "cancelled"
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.exhausted = "deadline"
+        return self.exhausted is not None
+
+    def progress(self, depth, nodes):
+        self.nodes = nodes
+        if self.exhausted is None:
+            if self.max_nodes is not None and nodes >= self.max_nodes:
+                self.exhausted = "nodes"
+            elif self.max_memory is not None and current_rss() > self.max_memory:
+                self.exhausted = "memory"
+        if self.forward is not None:
+            self.forward(depth, nodes)
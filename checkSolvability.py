@@ -1,8 +1,23 @@
-def is_solvable(state):
+from puzzlestate import flatten, is_nested
+from math import isqrt
+
+# Whether a board can reach the standard goal (1, 2, ..., 0). Flat boards are
+# taken to be square unless a width is given; nested rows give their width.
+def is_solvable(state, width=None):
+    if is_nested(state):
+        width = len(state[0])
+    state = flatten(state)
+    width = width or isqrt(len(state))
     inv = 0  # Count inversions
     flat_state = [tile for tile in state if tile != 0]  # Exclude blank tile
     for i in range(len(flat_state)):
         for j in range(i + 1, len(flat_state)):
             if flat_state[i] > flat_state[j]:
                 inv += 1
-    return inv % 2 == 0  # Even inversions mean solvable
+    if width % 2 == 1:
+        return inv % 2 == 0  # Odd width: even inversions mean solvable
+    # Even width: a vertical move changes the inversion parity and the blank's
+    # row, so the parity of inversions plus the blank's row from the bottom
+    # (counting from 1) is invariant, and odd at the goal
+    blank_row_from_bottom = len(state) // width - state.index(0) // width
+    return (inv + blank_row_from_bottom) % 2 == 1
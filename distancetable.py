@@ -0,0 +1,137 @@
+# Exact distance-to-goal for every reachable 8-puzzle state.
+#
+# A one-time retrograde BFS from the goal fills one byte per state. States
+# are indexed by blank position and the Lehmer rank of the eight tiles read
+# in row-major order; since only even permutations of the tiles are
+# reachable, halving the rank is a bijection and the table holds exactly
+# 9 * 8!/2 = 181,440 entries. The table is saved to disk and memory-mapped
+# on load, so any number of processes share one read-only copy.
+
+import mmap
+import os
+from collections import deque
+from puzzlestate import SIZE, BITS, MASK, BLANK_SHIFT, GOAL, SLIDES, pack, is_nested, slide
+from solution import Solution
+from solutioncache import get_cache
+from bfspuzz import is_solvable, input_initial_state, print_solution
+
+TILES = SIZE - 1
+HALF_PERMUTATIONS = 20160  # 8! / 2
+TABLE_SIZE = SIZE * HALF_PERMUTATIONS
+UNREACHED = 255
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "distances.bin")
+
+# FACTORIALS[i] = weight of the i-th Lehmer digit of the tile sequence
+FACTORIALS = [1] * TILES
+for _i in range(TILES - 2, -1, -1):
+    FACTORIALS[_i] = FACTORIALS[_i + 1] * (TILES - 1 - _i)
+
+
+# Return (index, solvable) for a packed state. The sum of the Lehmer digits is
+# the inversion count, so solvability falls out of the ranking for free.
+def rank(state):
+    tiles = [(state >> (BITS * i)) & MASK for i in range(SIZE)]
+    tiles.remove(0)
+    code = 0
+    inversions = 0
+    for i in range(TILES - 1):
+        tile = tiles[i]
+        digit = 0
+        for j in range(i + 1, TILES):
+            if tiles[j] < tile:
+                digit += 1
+        code += digit * FACTORIALS[i]
+        inversions += digit
+    return (state >> BLANK_SHIFT) * HALF_PERMUTATIONS + code // 2, inversions % 2 == 0
+
+
+# Retrograde BFS from the goal over every reachable state
+def build_table(goal=GOAL):
+    table = bytearray([UNREACHED]) * TABLE_SIZE
+    table[rank(goal)[0]] = 0
+    queue = deque([goal])
+    while queue:
+        state = queue.popleft()
+        distance = table[rank(state)[0]] + 1
+        for entry in SLIDES[state >> BLANK_SHIFT]:
+            child = slide(state, entry)
+            index = rank(child)[0]
+            if table[index] == UNREACHED:
+                table[index] = distance
+                queue.append(child)
+    return table
+
+
+# Write a table to disk; the file is swapped in atomically so a process
+# mapping it concurrently never sees a partial table
+def save_table(table, path=DEFAULT_PATH):
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as f:
+        f.write(table)
+    os.replace(partial, path)
+
+
+class DistanceTable:
+    """Memory-mapped distance table with O(1) lookups."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        if not os.path.exists(path):
+            save_table(build_table(), path)
+        with open(path, "rb") as f:
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.table) != TABLE_SIZE:
+            raise ValueError(f"{path} is not an 8-puzzle distance table")
+
+    def distance(self, board):
+        """Optimal number of moves to the goal, or None if unsolvable."""
+        index, solvable = rank(pack(board))
+        return self.table[index] if solvable else None
+
+    def solve(self, board, stats=None):
+        """Optimal solution path by greedy descent through the table.
+
+        If a `stats` dict is given it receives the states stepped through
+        (expanded) and the table lookups made for their neighbours (generated).
+        """
+        state = pack(board)
+        index, solvable = rank(state)
+        if not solvable:
+            if stats is not None:
+                stats.update(expanded=0, generated=0, peak_frontier=0)
+            return None
+        distance = self.table[index]
+        path = [state]
+        generated = 0
+        while distance > 0:
+            for entry in SLIDES[state >> BLANK_SHIFT]:
+                child = slide(state, entry)
+                generated += 1
+                if self.table[rank(child)[0]] == distance - 1:
+                    state = child
+                    distance -= 1
+                    path.append(state)
+                    break
+        if stats is not None:
+            stats.update(expanded=len(path) - 1, generated=generated, peak_frontier=1)
+        return Solution.from_states(path, is_nested(board))
+
+    def close(self):
+        self.table.close()
+
+
+# Main function
+def main():
+    table = DistanceTable()
+    initial_state = input_initial_state()
+
+    if not is_solvable(initial_state):
+        print("This puzzle configuration is unsolvable.")
+        return
+
+    print(f"Optimal distance: {table.distance(initial_state)} moves")
+    print_solution(get_cache().solve(initial_state, "table", table.solve))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# Random solvable boards, uniformly or at an exact optimal distance.
+#
+# Uniform boards are a shuffle of the tiles; when the shuffle lands on the
+# wrong side of the parity rule from checkSolvability.is_solvable, two
+# non-blank tiles are swapped. That swap pairs every unsolvable board with
+# exactly one solvable one, so the result is uniform over solvable boards.
+#
+# Boards at an exact distance d come from one of two methods:
+#   layers  sample from the goal's BFS layer d, which holds every board
+#           exactly d moves away (the default up to 3x3, where all layers
+#           fit in memory)
+#   walk    walk d moves back from the goal without undoing a move, and keep
+#           the board only if an optimal solver confirms it needs d moves
+#
+# Boards are generated in fixed-size chunks, each with its own seed derived
+# from the run seed, so the output for a given seed is the same whatever the
+# number of workers. Output is the line format from puzzleio.
+#
+# Examples:
+#     python generator.py --count 1000000 --output boards.txt
+#     python generator.py --count 100 --depth 20 --seed 7
+#     python generator.py --width 4 --count 50 --depth 30 --method walk
+
+import argparse
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from puzzlestate import DEFAULT, OPPOSITE, geometry, geometry_of, slide
+from checkSolvability import is_solvable
+from puzzleio import format_board, parse_board
+import solvers
+
+DEFAULT_SEED = 0
+DEFAULT_CHUNK = 10000  # Boards per chunk; part of what a seed produces, so changing it changes the output
+LAYERS_MAX_SIZE = 9  # Largest board whose BFS layers are built by default
+METHODS = ("layers", "walk")
+
+
+# BFS from the goal; layers[d] holds every packed state exactly d moves away
+def depth_layers(goal=None, geometry=DEFAULT):
+    goal = geometry.goal if goal is None else goal
+    layers = [[goal]]
+    seen = {goal}
+    while True:
+        layer = []
+        for state in layers[-1]:
+            for entry in geometry.slides[state >> geometry.blank_shift]:
+                child = slide(state, entry)
+                if child not in seen:
+                    seen.add(child)
+                    layer.append(child)
+        if not layer:
+            return layers
+        layers.append(layer)
+
+
+# Layers already built in this process, keyed by (goal, geometry)
+_layers = {}
+
+
+def _cached_layers(goal, geometry):
+    key = (goal, geometry)
+    if key not in _layers:
+        _layers[key] = depth_layers(goal, geometry)
+    return _layers[key]
+
+
+# Uniformly random board on the same side of the parity rule as the goal
+def random_board(rng, geometry=DEFAULT, solvable=True):
+    tiles = list(range(geometry.size))
+    rng.shuffle(tiles)
+    if is_solvable(tiles, geometry.width) != solvable:
+        # Swapping two tiles flips the inversion parity and leaves the blank alone
+        i, j = (2, 1) if tiles[0] == 0 else (0, 2) if tiles[1] == 0 else (0, 1)
+        tiles[i], tiles[j] = tiles[j], tiles[i]
+    return tiles
+
+
+# Board exactly `depth` moves from the goal, drawn from the BFS layer
+def layer_board(rng, depth, goal, geometry):
+    layers = _cached_layers(goal, geometry)
+    if depth >= len(layers):
+        raise ValueError(f"No {geometry.width}x{geometry.height} board needs {depth} moves "
+                         f"(the maximum is {len(layers) - 1})")
+    return geometry.unpack(rng.choice(layers[depth]))
+
+
+# Board exactly `depth` moves from the goal, by rejection: walk back from
+# the goal without undoing a move and keep the end only if it is confirmed
+# to need `depth` moves. Deeper targets are rejected more often.
+def walk_board(rng, depth, goal, geometry):
+    goal_tiles = geometry.unpack(goal)
+    while True:
+        state = goal
+        last = None
+        for _ in range(depth):
+            entries = [entry for entry in geometry.slides[state >> geometry.blank_shift]
+                       if last is None or entry[0] != OPPOSITE[last]]
+            entry = rng.choice(entries)
+            state = slide(state, entry)
+            last = entry[0]
+        board = geometry.unpack(state)
+        solution, _ = solvers.run(board, "ida*", goal_tiles, width=geometry.width)
+        if len(solution) - 1 == depth:
+            return board
+
+
+def _chunk_rng(seed, index):
+    return random.Random(f"{seed}:{index}")
+
+
+# One chunk of boards; `spec` is (index, count, depth, seed, method, goal tiles, width, height)
+def generate_chunk(spec):
+    index, count, depth, seed, method, goal_tiles, width, height = spec
+    board_geometry = geometry(width, height)
+    rng = _chunk_rng(seed, index)
+    if depth is None:
+        solvable = is_solvable(goal_tiles, width)
+        return [random_board(rng, board_geometry, solvable) for _ in range(count)]
+    goal = board_geometry.pack(goal_tiles)
+    draw = layer_board if method == "layers" else walk_board
+    return [draw(rng, depth, goal, board_geometry) for _ in range(count)]
+
+
+def _format_chunk(spec):
+    return "".join(format_board(board) + "\n" for board in generate_chunk(spec))
+
+
+def _chunk_specs(count, depth, seed, method, goal, board_geometry, chunksize):
+    goal_tiles = list(goal) if goal is not None else board_geometry.goal_tiles
+    if method is None:
+        method = "layers" if board_geometry.size <= LAYERS_MAX_SIZE else "walk"
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+    for index, start in enumerate(range(0, count, chunksize)):
+        yield (index, min(chunksize, count - start), depth, seed, method, goal_tiles,
+               board_geometry.width, board_geometry.height)
+
+
+# Yield `count` flat boards in this process. Without a depth they are
+# uniform over boards that can reach the goal (the standard goal unless one
+# is given); with one, every board needs exactly `depth` moves. `method`
+# is "layers" or "walk", by default layers up to 3x3 and walks above.
+def generate(count, depth=None, seed=DEFAULT_SEED, geometry=DEFAULT, goal=None, method=None,
+             chunksize=DEFAULT_CHUNK):
+    for spec in _chunk_specs(count, depth, seed, method, goal, geometry, chunksize):
+        yield from generate_chunk(spec)
+
+
+# Yield the same boards as generate(), as puzzle-format text, one string
+# per chunk, built across `workers` processes. At most `workers * 4` chunks
+# are in flight and chunks come back in order.
+def generate_text(count, depth=None, seed=DEFAULT_SEED, geometry=DEFAULT, goal=None, method=None,
+                  workers=None, chunksize=DEFAULT_CHUNK):
+    specs = _chunk_specs(count, depth, seed, method, goal, geometry, chunksize)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for spec in specs:
+            yield _format_chunk(spec)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < workers * 4:
+                spec = next(specs, None)
+                if spec is None:
+                    break
+                pending.append(pool.submit(_format_chunk, spec))
+            if not pending:
+                break
+            yield pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate random solvable sliding puzzles.")
+    parser.add_argument("--count", type=int, default=1, help="number of boards (default: %(default)s)")
+    parser.add_argument("--depth", type=int, help="exact optimal solution length (default: uniform)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed (default: %(default)s)")
+    parser.add_argument("--width", type=int, default=3, help="tiles per row (default: %(default)s)")
+    parser.add_argument("--height", type=int, help="rows (default: the width)")
+    parser.add_argument("--goal", help="goal board in puzzle format (default: 1, 2, ..., 0)")
+    parser.add_argument("--method", choices=METHODS,
+                        help="how to reach an exact depth (default: layers up to 3x3, walk above)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", help="write the boards to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    board_geometry = geometry(args.width, args.height)
+    goal = parse_board(args.goal) if args.goal else None
+    if goal is not None and geometry_of(goal, args.width) is not board_geometry:
+        parser.error(f"The goal is not a {board_geometry.width}x{board_geometry.height} board")
+    if args.depth is not None and args.depth < 0:
+        parser.error("--depth must not be negative")
+    if args.method == "layers" and board_geometry.size > LAYERS_MAX_SIZE:
+        print(f"Warning: the BFS layers of a {board_geometry.width}x{board_geometry.height} board "
+              "may not fit in memory", file=sys.stderr)
+
+    sink = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for text in generate_text(args.count, args.depth, args.seed, board_geometry, goal, args.method,
+                                  args.workers):
+            sink.write(text)
+    except ValueError as e:  # Such as a depth deeper than any board
+        parser.error(str(e))
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Admissible heuristics for the informed solvers.
+#
+# Every entry in HEURISTICS is a factory: it takes a packed goal state and
+# the board's Geometry (3x3 by default) and returns a function mapping a
+# packed state to a lower bound on the number of moves left. Tables that
+# depend on the goal are built once by the factory, so the returned function
+# only does lookups.
+
+from itertools import product
+from puzzlestate import DEFAULT
+
+# Goal position of every tile
+def _goal_positions(goal, geometry):
+    positions = [0] * geometry.size
+    for index, tile in enumerate(geometry.unpack(goal)):
+        positions[tile] = index
+    return positions
+
+
+# Number of tiles (blank excluded) that are not on their goal square
+def misplaced_tiles(goal, geometry=DEFAULT):
+    goal_tiles = geometry.unpack(goal)
+    bits, mask = geometry.bits, geometry.mask
+    shifts = [(bits * i, goal_tiles[i]) for i in range(geometry.size) if goal_tiles[i] != 0]
+
+    def h(state):
+        return sum(1 for shift, tile in shifts if (state >> shift) & mask != tile)
+    return h
+
+
+# table[index][tile] = Manhattan distance of `tile` at `index` from its goal square
+def manhattan_table(goal, geometry=DEFAULT):
+    positions = _goal_positions(goal, geometry)
+    width = geometry.width
+    table = []
+    for index in range(geometry.size):
+        x, y = divmod(index, width)
+        row = [0] * (geometry.mask + 1)
+        for tile in range(1, geometry.size):
+            gx, gy = divmod(positions[tile], width)
+            row[tile] = abs(x - gx) + abs(y - gy)
+        table.append(row)
+    return table
+
+
+# Sum of the Manhattan distances of every tile from its goal square
+def manhattan(goal, geometry=DEFAULT):
+    table = [(geometry.bits * i, row) for i, row in enumerate(manhattan_table(goal, geometry))]
+    mask = geometry.mask
+
+    def h(state):
+        return sum(row[(state >> shift) & mask] for shift, row in table)
+    return h
+
+
+# Minimum number of tiles to pull out of a line so the rest are in goal order.
+# `line` holds, for each square, the goal offset of its tile within the line
+# or -1 if the tile belongs to another line.
+def _line_removals(line):
+    offsets = [offset for offset in line if offset >= 0]
+    longest = [1] * len(offsets)
+    for i in range(len(offsets)):
+        for j in range(i):
+            if offsets[j] < offsets[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return len(offsets) - max(longest, default=0)
+
+
+# Manhattan distance plus two moves for every tile that has to leave its
+# row or column to let a conflicting tile past
+def linear_conflict(goal, geometry=DEFAULT):
+    base = manhattan(goal, geometry)
+    positions = _goal_positions(goal, geometry)
+    width, height, bits, mask = geometry.width, geometry.height, geometry.bits, geometry.mask
+    removals = {}
+    for length in {width, height}:
+        removals.update((line, _line_removals(line)) for line in product(range(-1, length), repeat=length))
+
+    # For each row and column: the packed shifts of its squares, plus for each
+    # tile its offset within that line if the tile's goal lies on the line
+    lines = []
+    for k in range(height):
+        offsets = [-1] * (mask + 1)
+        for tile in range(1, geometry.size):
+            gx, gy = divmod(positions[tile], width)
+            if gx == k:
+                offsets[tile] = gy
+        lines.append(([bits * (k * width + j) for j in range(width)], offsets))
+    for k in range(width):
+        offsets = [-1] * (mask + 1)
+        for tile in range(1, geometry.size):
+            gx, gy = divmod(positions[tile], width)
+            if gy == k:
+                offsets[tile] = gx
+        lines.append(([bits * (i * width + k) for i in range(height)], offsets))
+
+    def h(state):
+        conflicts = 0
+        for shifts, offsets in lines:
+            conflicts += removals[tuple(offsets[(state >> shift) & mask] for shift in shifts)]
+        return base(state) + 2 * conflicts
+    return h
+
+
+# Additive disjoint pattern database, memory-mapped from the files kept by
+# patterndb (built on first use). Tiles outside every pattern add nothing,
+# so any partition stays admissible.
+def pattern_database(goal, geometry=DEFAULT, patterns=None):
+    from patterndb import PatternDatabase  # Imported lazily: patterndb builds on this module
+    return PatternDatabase(goal, geometry, patterns)
+
+
+HEURISTICS = {
+    "misplaced": misplaced_tiles,
+    "manhattan": manhattan,
+    "linear_conflict": linear_conflict,
+    "pdb": pattern_database,
+}
+
+
+# Heuristics already bound to a goal, keyed by (name, goal, geometry), so
+# tables such as the pattern database are built once per process rather than
+# once per search
+_bound = {}
+
+
+# Look up a heuristic by name (or pass a factory through) and bind it to a goal
+def make_heuristic(heuristic, goal, geometry=DEFAULT):
+    if not isinstance(heuristic, str):
+        return heuristic(goal, geometry)
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic: {heuristic}")
+    key = (heuristic, goal, geometry)
+    if key not in _bound:
+        _bound[key] = HEURISTICS[heuristic](goal, geometry)
+    return _bound[key]
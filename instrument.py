@@ -0,0 +1,70 @@
+# Optional instrumentation for the searches.
+#
+# A Probe is handed to a solver (probe=...) to collect what the plain stats
+# dict does not: expansions per depth, duplicates pruned, cutoffs and the
+# bound of every iterative-deepening pass, plus optional hooks and a sampled
+# trace of expanded states. Solvers pick an instrumented copy of their hot
+# loop only when a probe is given, so an unprobed search runs exactly the
+# code it ran before and pays nothing for this.
+#
+# Example:
+#     probe = Probe(sample_every=1000)
+#     puzzle.ida_star(board, probe=probe)
+#     print(probe.summary())
+
+DEFAULT_TRACE_LIMIT = 10000
+
+
+class Probe:
+    """Counters, hooks and a sampled trace for one search.
+
+    on_expand(state, depth) is called for every expanded node and
+    on_iteration(bound, expanded) at the end of every BFS layer or
+    iterative-deepening pass. With sample_every=N, every Nth expansion is
+    recorded in `trace` as (expansion number, depth, state), up to
+    trace_limit entries. States are packed ints, except from IDA*, which
+    passes its live board list; the trace keeps a copy, and on_expand
+    should copy it too if it keeps it.
+    """
+
+    def __init__(self, on_expand=None, on_iteration=None, sample_every=0, trace_limit=DEFAULT_TRACE_LIMIT):
+        self.on_expand = on_expand
+        self.on_iteration = on_iteration
+        self.sample_every = sample_every
+        self.trace_limit = trace_limit
+        self.expanded = 0
+        self.duplicates = 0  # Children dropped because their state was already reached
+        self.cutoffs = 0  # Children dropped by a cost bound (IDA*, depth-limited search)
+        self.depth_counts = {}  # depth -> nodes expanded at that depth
+        self.iterations = []  # (bound or layer, nodes expanded so far)
+        self.trace = []
+
+    def expand(self, state, depth):
+        self.expanded += 1
+        self.depth_counts[depth] = self.depth_counts.get(depth, 0) + 1
+        if self.on_expand is not None:
+            self.on_expand(state, depth)
+        if self.sample_every and self.expanded % self.sample_every == 0 and len(self.trace) < self.trace_limit:
+            self.trace.append((self.expanded, depth, state if isinstance(state, int) else list(state)))
+
+    def duplicate(self):
+        self.duplicates += 1
+
+    def cutoff(self):
+        self.cutoffs += 1
+
+    def iteration(self, bound):
+        self.iterations.append((bound, self.expanded))
+        if self.on_iteration is not None:
+            self.on_iteration(bound, self.expanded)
+
+    def summary(self):
+        """The counters as a JSON-friendly dict."""
+        return {
+            "expanded": self.expanded,
+            "duplicates": self.duplicates,
+            "cutoffs": self.cutoffs,
+            "depth_counts": dict(sorted(self.depth_counts.items())),
+            "iterations": list(self.iterations),
+            "samples": len(self.trace),
+        }
@@ -0,0 +1,126 @@
+# Load generator for the HTTP solving service in server.py.
+#
+# Opens `concurrency` keep-alive connections and sends /solve requests for
+# seeded boards from generator.py until `requests` have been answered, then
+# prints throughput, latency percentiles and how the service answered.
+# Boards are drawn from a pool of `distinct` boards, so a small pool sends
+# identical boards concurrently and exercises request coalescing.
+#
+# Example:
+#     python server.py --workers 4 &
+#     python loadgen.py --requests 2000 --concurrency 32 --depth 20 --distinct 50
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+from puzzleio import format_board
+import generator
+
+DEFAULT_URL = "http://127.0.0.1:8080"
+
+
+# Send one JSON request on an open connection and return (status, body)
+async def request(reader, writer, host, method, path, body=None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+# One connection sending requests until the shared budget of requests is spent
+async def _client(url, boards, options, remaining, rng, latencies, outcomes):
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            started = time.perf_counter()
+            status, answer = await request(reader, writer, url.netloc, "POST", "/solve",
+                                           dict(options, board=rng.choice(boards)))
+            latencies.append(time.perf_counter() - started)
+            outcome = answer.get("status", f"http {status}") if status == 200 else f"http {status}"
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if answer.get("coalesced"):
+                outcomes["coalesced"] = outcomes.get("coalesced", 0) + 1
+    finally:
+        writer.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def run_load(url=DEFAULT_URL, requests=1000, concurrency=16, depth=None, distinct=1000, seed=0,
+                   options=None):
+    url = urlsplit(url)
+    boards = [format_board(board) for board in generator.generate(distinct, depth, seed)]
+    remaining = [requests]
+    latencies = []
+    outcomes = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(url, boards, options or {}, remaining, random.Random(seed + i),
+                                   latencies, outcomes) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        _, metrics = await request(reader, writer, url.netloc, "GET", "/metrics")
+    finally:
+        writer.close()
+    return {
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "max": max(latencies, default=0.0),
+        "outcomes": outcomes,
+        "server": metrics,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send seeded solve requests to server.py.")
+    parser.add_argument("--url", default=DEFAULT_URL, help="service address (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=1000, help="requests to send (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="connections sending at once (default: %(default)s)")
+    parser.add_argument("--depth", type=int, help="optimal length of every board (default: uniform)")
+    parser.add_argument("--distinct", type=int, default=1000,
+                        help="size of the board pool; smaller pools coalesce more (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="board and request seed (default: %(default)s)")
+    parser.add_argument("--algo", default="ida*", help="algorithm to request (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, help="time budget per solve, in seconds")
+    parser.add_argument("--max-nodes", type=int, help="node budget per solve")
+    args = parser.parse_args(argv)
+
+    options = {"algorithm": args.algo}
+    if args.timeout is not None:
+        options["timeout"] = args.timeout
+    if args.max_nodes is not None:
+        options["max_nodes"] = args.max_nodes
+    report = asyncio.run(run_load(args.url, args.requests, args.concurrency, args.depth, args.distinct,
+                                  args.seed, options))
+    print(f"{report['requests']} requests in {report['elapsed']:.2f} s ({report['throughput']:.0f}/s); "
+          f"p50 {report['p50'] * 1000:.1f} ms, p90 {report['p90'] * 1000:.1f} ms, "
+          f"p99 {report['p99'] * 1000:.1f} ms, max {report['max'] * 1000:.1f} ms")
+    print(json.dumps(report["outcomes"]))
+    print(json.dumps(report["server"]), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
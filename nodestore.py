@@ -0,0 +1,70 @@
+# Search nodes stored as parallel columns instead of one object per node.
+#
+# A node is an integer handle into four typed arrays: its packed state, the
+# handle of its parent, the move that reached it and its depth (g-cost).
+# Appending a node allocates no Python object, so a search loop creates no
+# garbage for the collector to trace, and a node costs 15 bytes of column
+# space (plus the state int for boards whose packed state needs more than
+# 64 bits). Paths are rebuilt by walking parent handles.
+#
+# A depth-first search can also give memory back as it goes: once the node
+# with handle h is popped from a LIFO stack, every node stored after it
+# belongs to a subtree that is finished, so truncate(h + 1) frees them and
+# the store never holds more than the current path and its siblings.
+
+from array import array
+from puzzlestate import DEFAULT
+from solution import Solution
+
+NO_PARENT = -1
+NO_MOVE = -1
+
+
+class NodeStore:
+    """Parallel state / parent / move / depth columns with integer handles."""
+
+    def __init__(self, geometry=DEFAULT):
+        self.geometry = geometry
+        # Packed states fit an unsigned 64-bit column up to 4x4 only when the
+        # blank's index does too; larger boards keep their ints in a list
+        fits = geometry.blank_shift + (geometry.size - 1).bit_length() <= 64
+        self.states = array("Q") if fits else []
+        self.parents = array("l")
+        self.moves = array("b")
+        self.depths = array("H")
+
+    def __len__(self):
+        return len(self.parents)
+
+    def add(self, state, parent=NO_PARENT, move=NO_MOVE, depth=0):
+        """Store a node and return its handle."""
+        self.states.append(state)
+        self.parents.append(parent)
+        self.moves.append(move)
+        self.depths.append(depth)
+        return len(self.parents) - 1
+
+    def truncate(self, size):
+        """Drop every node with a handle of `size` or more."""
+        del self.states[size:]
+        del self.parents[size:]
+        del self.moves[size:]
+        del self.depths[size:]
+
+    def path_moves(self, handle):
+        """Moves from the root to the node, in order."""
+        moves = []
+        while self.parents[handle] != NO_PARENT:
+            moves.append(self.moves[handle])
+            handle = self.parents[handle]
+        moves.reverse()
+        return moves
+
+    def root(self, handle):
+        while self.parents[handle] != NO_PARENT:
+            handle = self.parents[handle]
+        return handle
+
+    def solution(self, handle, nested=False):
+        """The Solution from the root to the node."""
+        return Solution(self.states[self.root(handle)], self.path_moves(handle), nested, self.geometry)
@@ -0,0 +1,317 @@
+# Additive disjoint pattern databases, built offline and memory-mapped.
+#
+# Each table covers one group of tiles and records, for every placement of
+# those tiles and the blank, the fewest moves of the group's tiles needed to
+# bring them home. It is built by a 0-1 BFS backwards from the goal in the
+# abstract space where the other tiles are indistinguishable; keeping the
+# blank in the key keeps the summed heuristic consistent. Groups are
+# disjoint, so the sum over a partition of the tiles is admissible.
+#
+# A pattern cost is always its tiles' Manhattan distance plus an even number
+# of extra moves, so the file stores only half the excess, one nibble per
+# entry (saturating at 15, which keeps it a lower bound). Files are swapped
+# in atomically and memory-mapped read-only, so every worker process shares
+# one copy of the pages.
+#
+# Examples:
+#     python patterndb.py build --width 4 --patterns 1,2,3,4,5 6,7,8,9,10 11,12,13,14,15
+#     python patterndb.py verify --width 3
+#     python patterndb.py bench --width 3 --boards 200
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+from puzzlestate import DEFAULT, geometry
+from heuristics import manhattan_table
+import astar
+import puzzle
+
+MAGIC = b"PDB1"
+NIBBLE_MAX = 15
+UNREACHED = 255
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")
+
+# Default disjoint partitions per board size: 4-4 for the 8-puzzle and 5-5-5
+# for the 15-puzzle (8 MB per table, about half a minute each to build).
+# 6-6-3 is stronger, but each 6-tile table is 134 MB and needs about 540 MB
+# and several minutes to build; pass it with --patterns.
+DEFAULT_PARTITIONS = {
+    (3, 3): [(1, 2, 3, 4), (5, 6, 7, 8)],
+    (4, 4): [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)],
+}
+
+
+# Default partition for a geometry: groups of up to five tiles in order
+def default_partition(geometry):
+    key = (geometry.width, geometry.height)
+    if key in DEFAULT_PARTITIONS:
+        return DEFAULT_PARTITIONS[key]
+    tiles = list(range(1, geometry.size))
+    return [tuple(tiles[i:i + 5]) for i in range(0, len(tiles), 5)]
+
+
+# File holding the table of one pattern; the goal is part of the name unless
+# it is the size's default goal
+def table_path(geometry, goal, pattern, directory=DEFAULT_DIR):
+    name = f"pdb-{geometry.width}x{geometry.height}-{'-'.join(map(str, pattern))}"
+    if goal != geometry.goal:
+        name += f"-goal{goal:x}"
+    return os.path.join(directory, name + ".bin")
+
+
+# Costs for every placement of the pattern tiles and the blank, indexed by
+# sum(position * size**k) over the pattern tiles, then the blank; UNREACHED
+# for keys that are not valid placements
+def build_costs(geometry, goal, pattern):
+    size, slides = geometry.size, geometry.slides
+    count = len(pattern) + 1
+    weights = [size ** k for k in range(count)]
+    goal_tiles = geometry.unpack(goal)
+    start = sum(goal_tiles.index(tile) * w for tile, w in zip(pattern + (0,), weights))
+
+    costs = bytearray([UNREACHED]) * (size ** count)  # Settled cost of each key
+    queued = bytearray([UNREACHED]) * (size ** count)  # Best cost a key has been queued with
+    queued[start] = 0
+    frontier, later = [start], []  # Keys at the current cost, and at cost + 1
+    cost = 0
+    while frontier:
+        while frontier:
+            key = frontier.pop()
+            if costs[key] != UNREACHED:
+                continue
+            costs[key] = cost
+            positions = []
+            rest = key
+            for _ in range(count):
+                rest, position = divmod(rest, size)
+                positions.append(position)
+            blank = positions[-1]
+            for entry in slides[blank]:
+                target = entry[1]
+                if target in positions:
+                    k = positions.index(target)  # A pattern tile slides into the blank: costs a move
+                    child = key + (blank - target) * weights[k] + (target - blank) * weights[-1]
+                    if queued[child] > cost + 1:
+                        queued[child] = cost + 1
+                        later.append(child)
+                else:
+                    child = key + (target - blank) * weights[-1]  # Free move of another tile
+                    if queued[child] > cost:
+                        queued[child] = cost
+                        frontier.append(child)
+        frontier, later = later, []
+        cost += 1
+    return costs
+
+
+# Nibble-packed halved excess over the pattern's Manhattan distance
+def pack_nibbles(geometry, goal, pattern, costs):
+    size = geometry.size
+    count = len(pattern)
+    distance = manhattan_table(goal, geometry)
+    data = bytearray((len(costs) + 1) // 2)
+    for key, cost in enumerate(costs):
+        if cost == UNREACHED:
+            continue
+        rest, md = key, 0
+        for tile in pattern:
+            rest, position = divmod(rest, size)
+            md += distance[position][tile]
+        excess = min((cost - md) // 2, NIBBLE_MAX)
+        if excess:
+            data[key >> 1] |= excess << ((key & 1) << 2)
+    return data
+
+
+# Build one table and write it atomically, header first
+def build_table(geometry, goal, pattern, path):
+    data = pack_nibbles(geometry, goal, pattern, build_costs(geometry, goal, pattern))
+    header = json.dumps({
+        "width": geometry.width, "height": geometry.height,
+        "goal": geometry.unpack(goal), "pattern": list(pattern),
+        "entries": geometry.size ** (len(pattern) + 1), "crc32": zlib.crc32(data),
+    }).encode()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        f.write(data)
+    os.replace(partial, path)
+
+
+class PatternTable:
+    """One memory-mapped pattern table."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:4] != MAGIC:
+            raise ValueError(f"{path} is not a pattern database")
+        length = struct.unpack("<I", self.map[4:8])[0]
+        self.header = json.loads(self.map[8:8 + length])
+        self.pattern = tuple(self.header["pattern"])
+        self.data = memoryview(self.map)[8 + length:]
+        if len(self.data) != (self.header["entries"] + 1) // 2:
+            raise ValueError(f"{path} is truncated")
+
+    def excess(self, key):
+        """Halved moves beyond Manhattan distance for one key."""
+        return (self.data[key >> 1] >> ((key & 1) << 2)) & NIBBLE_MAX
+
+    def verify(self):
+        """Whether the data still matches the checksum it was written with."""
+        return zlib.crc32(self.data) == self.header["crc32"]
+
+    def close(self):
+        self.data.release()
+        self.map.close()
+
+
+class PatternDatabase:
+    """Additive disjoint pattern database over memory-mapped tables.
+
+    Calling it with a packed state returns the heuristic value. Missing
+    tables are built and saved on first use unless build=False.
+    """
+
+    def __init__(self, goal=None, geometry=DEFAULT, patterns=None, directory=DEFAULT_DIR, build=True):
+        self.geometry = geometry
+        self.goal = geometry.goal if goal is None else goal
+        self.patterns = [tuple(pattern) for pattern in (patterns or default_partition(geometry))]
+        tiles = [tile for pattern in self.patterns for tile in pattern]
+        if len(set(tiles)) != len(tiles) or not set(tiles) <= set(range(1, geometry.size)):
+            raise ValueError("Patterns must be disjoint groups of tiles")
+        self.tables = []
+        for pattern in self.patterns:
+            path = table_path(geometry, self.goal, pattern, directory)
+            if not os.path.exists(path):
+                if not build:
+                    raise FileNotFoundError(path)
+                build_table(geometry, self.goal, pattern, path)
+            self.tables.append(PatternTable(path))
+
+        # For each tile: the table it belongs to and its key weight, and the
+        # Manhattan distance of each tile at each position (0 outside patterns)
+        size = geometry.size
+        self.owner = [(-1, 0)] * (geometry.mask + 1)
+        for n, pattern in enumerate(self.patterns):
+            for k, tile in enumerate(pattern):
+                self.owner[tile] = (n, size ** k)
+        self.blank_weights = [size ** len(pattern) for pattern in self.patterns]
+        distance = manhattan_table(self.goal, geometry)
+        self.distance = [[d if self.owner[tile][0] >= 0 else 0 for tile, d in enumerate(row)]
+                         for row in distance]
+
+    def keys(self, state):
+        """Key of `state` in each table, and the Manhattan distance of the pattern tiles."""
+        geometry = self.geometry
+        bits, mask, owner, distance = geometry.bits, geometry.mask, self.owner, self.distance
+        blank = state >> geometry.blank_shift
+        keys = [blank * weight for weight in self.blank_weights]
+        md = 0
+        for index in range(geometry.size):
+            tile = (state >> (bits * index)) & mask
+            n, weight = owner[tile]
+            if n >= 0:
+                keys[n] += index * weight
+                md += distance[index][tile]
+        return keys, md
+
+    def __call__(self, state):
+        keys, md = self.keys(state)
+        return md + 2 * sum(table.excess(key) for table, key in zip(self.tables, keys))
+
+    def verify(self):
+        """Names of the tables whose checksum no longer matches."""
+        return [table.header["pattern"] for table in self.tables if not table.verify()]
+
+    def close(self):
+        for table in self.tables:
+            table.close()
+
+
+# Spot-check admissibility against optimal solutions of random boards
+# reached by random walks from the goal; returns the boards that failed
+def check_admissible(database, boards=50, walk=40, seed=0):
+    geometry = database.geometry
+    rng = random.Random(seed)
+    failures = []
+    for _ in range(boards):
+        state = database.goal
+        for _ in range(walk):
+            state = rng.choice(geometry.neighbours(state))[1]
+        board = geometry.unpack_grid(state)
+        optimal = len(puzzle.ida_star(board, goal_state=geometry.unpack(database.goal))) - 1
+        if database(state) > optimal:
+            failures.append(geometry.unpack(state))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build, verify and benchmark pattern databases.")
+    parser.add_argument("command", choices=["build", "verify", "bench"])
+    parser.add_argument("--width", type=int, default=3, help="board width (default: %(default)s)")
+    parser.add_argument("--height", type=int, help="board height (default: the width)")
+    parser.add_argument("--patterns", nargs="+", metavar="TILES",
+                        help="comma-separated tile groups (default: per board size)")
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="table directory (default: %(default)s)")
+    parser.add_argument("--boards", type=int, default=50, help="boards for verify and bench")
+    parser.add_argument("--walk", type=int, default=40, help="random-walk length of those boards")
+    args = parser.parse_args(argv)
+
+    shape = geometry(args.width, args.height)
+    patterns = [tuple(int(t) for t in group.split(",")) for group in args.patterns] if args.patterns else None
+
+    if args.command == "build":
+        for pattern in patterns or default_partition(shape):
+            path = table_path(shape, shape.goal, pattern, args.dir)
+            start = time.perf_counter()
+            build_table(shape, shape.goal, pattern, path)
+            print(f"{path}: {os.path.getsize(path)} bytes in {time.perf_counter() - start:.1f}s")
+        return
+
+    database = PatternDatabase(geometry=shape, patterns=patterns, directory=args.dir,
+                               build=args.command != "verify")
+    if args.command == "verify":
+        corrupt = database.verify()
+        failures = check_admissible(database, args.boards, args.walk)
+        goal_ok = database(database.goal) == 0
+        print(f"checksums: {'ok' if not corrupt else f'corrupt {corrupt}'}")
+        print(f"goal: {'ok' if goal_ok else 'nonzero'}")
+        print(f"admissible on {args.boards} boards: {'ok' if not failures else f'{len(failures)} failures'}")
+        if corrupt or failures or not goal_ok:
+            sys.exit(1)
+        return
+
+    # bench: lookup speed, and A* nodes expanded against Manhattan distance
+    rng = random.Random(1)
+    states = []
+    for _ in range(args.boards):
+        state = database.goal
+        for _ in range(args.walk):
+            state = rng.choice(shape.neighbours(state))[1]
+        states.append(state)
+    start = time.perf_counter()
+    for state in states * 100:
+        database(state)
+    per_lookup = (time.perf_counter() - start) / (len(states) * 100)
+    print(f"lookup: {per_lookup * 1e6:.2f} us")
+    for heuristic in ("manhattan", "pdb"):
+        stats, expanded = {}, 0
+        start = time.perf_counter()
+        for state in states:
+            astar.astar(shape.unpack_grid(state), shape.unpack(database.goal), heuristic, stats)
+            expanded += stats["expanded"]
+        print(f"astar {heuristic}: {expanded / len(states):.0f} nodes, "
+              f"{(time.perf_counter() - start) / len(states) * 1000:.2f} ms per board")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,226 @@
-from copy import deepcopy
+from puzzlestate import SLIDES, BLANK_SHIFT, WIDTH, OPPOSITE, pack, is_nested, slide, geometry_of
+from solution import Solution
+from solutioncache import get_cache
+from heuristics import manhattan_table
 
 # Goal state for the 8-puzzle
 GOAL_STATE = [[1, 2, 3], 
               [4, 5, 6], 
               [7, 8, 0]]  # 0 represents the empty space
+GOAL = pack(GOAL_STATE)  # Packed form used by the search
 
-# Helper to find the position of the empty tile (0)
+# Helper to find the position of the empty tile (0) in a packed state
 def find_empty_tile(state):
-    for i in range(3):
-        for j in range(3):
-            if state[i][j] == 0:
-                return i, j
+    return divmod(state >> BLANK_SHIFT, WIDTH)
 
-# Check if the current state is the goal state
+# Check if the current (packed) state is the goal state
 def is_goal_state(state):
-    return state == GOAL_STATE
+    return state == GOAL
 
-# Generate the next possible states by moving the empty tile
+# Generate the next possible (packed) states by moving the empty tile
 def generate_next_states(state):
-    next_states = []
-    x, y = find_empty_tile(state)
-    
-    # Define possible moves (up, down, left, right)
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    for dx, dy in moves:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < 3 and 0 <= ny < 3:
-            # Swap empty tile with the neighboring tile
-            new_state = deepcopy(state)
-            new_state[x][y], new_state[nx][ny] = new_state[nx][ny], new_state[x][y]
-            next_states.append(new_state)
-    
-    return next_states
+    return [slide(state, entry) for entry in SLIDES[state >> BLANK_SHIFT]]
 
-# Perform DFS up to the given depth limit
-def dfs(state, depth, limit, path):
-    print(f"Exploring state at depth {depth}: {state}")  # Debugging line
-    if depth > limit:
-        return None  # Exceeded depth limit
-    
+# Longest optimal solution of any 8-puzzle, so no search needs to go deeper
+MAX_DEPTH = 31
+
+# How often (in expanded nodes) ida_star reports progress and checks for cancellation
+PROGRESS_INTERVAL = 4096
+
+class SearchCancelled(Exception):
+    """Raised inside dfs once the cancel event is seen, to unwind the recursion."""
+
+
+# Count one expansion in counts = [expanded, generated]; every
+# PROGRESS_INTERVAL expansions report progress and honour the cancel event
+def _count_expansion(counts, limit, cancel, progress):
+    counts[0] += 1
+    if counts[0] % PROGRESS_INTERVAL == 0:
+        if progress is not None:
+            progress(limit, counts[0])
+        if cancel is not None and cancel.is_set():
+            raise SearchCancelled
+
+# Perform DFS up to the given depth limit. `path` is extended and shrunk in
+# place, and the state we just came from is never revisited.
+def dfs(state, depth, limit, path, counts, cancel=None, progress=None):
     if is_goal_state(state):
-        return path  # Return the path if goal is reached
-    
+        return path[:]  # Return a copy of the path if goal is reached
+
+    if depth == limit:
+        return None  # Reached depth limit
+
+    _count_expansion(counts, limit, cancel, progress)
+    previous = path[-2] if len(path) > 1 else None
     for next_state in generate_next_states(state):
-        result = dfs(next_state, depth + 1, limit, path + [next_state])
+        if next_state == previous:
+            continue  # Moving straight back can never help
+        counts[1] += 1
+        path.append(next_state)
+        result = dfs(next_state, depth + 1, limit, path, counts, cancel, progress)
+        path.pop()
         if result:
             return result  # Solution found
-    
+
     return None  # No solution within the current depth limit
 
-# Iterative Deepening Search (IDS)
-def iterative_deepening_search(initial_state):
-    limit = 0  # Start with depth limit 0
-    while True:
-        print(f"Trying depth limit: {limit}")  # Debugging line
-        result = dfs(initial_state, 0, limit, [initial_state])
+# dfs reporting every expansion and cutoff to an instrument.Probe
+def probed_dfs(state, depth, limit, path, probe, counts, cancel=None, progress=None):
+    if is_goal_state(state):
+        return path[:]
+
+    if depth == limit:
+        probe.cutoff()
+        return None
+
+    _count_expansion(counts, limit, cancel, progress)
+    probe.expand(state, depth)
+    previous = path[-2] if len(path) > 1 else None
+    for next_state in generate_next_states(state):
+        if next_state == previous:
+            continue
+        counts[1] += 1
+        path.append(next_state)
+        result = probed_dfs(next_state, depth + 1, limit, path, probe, counts, cancel, progress)
+        path.pop()
         if result:
-            return result  # Return the solution path
-        limit += 1  # Increase depth limit
+            return result
+
+    return None
+
+# Iterative Deepening Search (IDS). With an instrument.Probe the probed dfs
+# is used and every depth limit tried is recorded as an iteration. `stats`,
+# `cancel` and `progress` work as for ida_star; a cancelled search returns None.
+def iterative_deepening_search(initial_state, max_depth=MAX_DEPTH, probe=None, stats=None,
+                               cancel=None, progress=None):
+    start = pack(initial_state)
+    counts = [0, 0]
+    solution = None
+    limit = 0
+    try:
+        for limit in range(max_depth + 1):
+            if probe is None:
+                result = dfs(start, 0, limit, [start], counts, cancel, progress)
+            else:
+                result = probed_dfs(start, 0, limit, [start], probe, counts, cancel, progress)
+                probe.iteration(limit)
+            if result:
+                solution = Solution.from_states(result, is_nested(initial_state))
+                break
+    except SearchCancelled:
+        pass
+    if stats is not None:
+        stats.update(expanded=counts[0], generated=counts[1], peak_frontier=limit)
+    return solution  # None if cancelled or there is no solution within max_depth
+
+# IDA*: depth-first search bounded by f = g + Manhattan distance, raising the
+# bound to the smallest f that exceeded it after each pass. Works on a single
+# mutable board with in-place make/unmake moves and an incremental heuristic,
+# so memory stays O(depth). If a `stats` dict is given it receives the nodes
+# expanded and generated and the deepest path (peak_frontier). Every
+# PROGRESS_INTERVAL expansions progress(threshold, nodes) is called if given,
+# and the search gives up if the `cancel` event has been set. Given an
+# instrument.Probe, an instrumented copy of the search loop reports every
+# expansion, cutoff and threshold to it; without one the plain loop runs.
+# Any board size works: the geometry comes from the board (nested rows, or a
+# square flat list), and the goal and depth bound default to that size's.
+def ida_star(initial_state, max_depth=None, stats=None, goal_state=None,
+             cancel=None, progress=None, probe=None):
+    geometry = geometry_of(initial_state)
+    goal_state = geometry.goal_tiles if goal_state is None else goal_state
+    max_depth = geometry.max_depth if max_depth is None else max_depth
+    slides = geometry.slides
+    board = geometry.unpack(geometry.pack(initial_state))
+    distance = manhattan_table(geometry.pack(goal_state), geometry)
+    moves = []  # Moves of the current path, pushed and popped in place
+    found = -1  # Returned by search() once the goal is reached
+    cancelled = -2  # Returned by search() once the cancel event is seen
+    counts = [0, 0, 0]  # Nodes expanded, nodes generated, deepest g
+
+    def search(blank, g, h, forbidden):
+        f = g + h
+        if f > threshold:
+            return f
+        if h == 0:
+            return found  # Manhattan distance is zero only at the goal
+        counts[0] += 1
+        if g > counts[2]:
+            counts[2] = g
+        if counts[0] % PROGRESS_INTERVAL == 0:
+            if progress is not None:
+                progress(threshold, counts[0])
+            if cancel is not None and cancel.is_set():
+                return cancelled
+        minimum = max_depth + 1
+        for move, target, _, _, _, _ in slides[blank]:
+            if move == forbidden:
+                continue  # Undoing the previous move
+            tile = board[target]
+            board[blank], board[target] = tile, 0  # Make the move
+            moves.append(move)
+            counts[1] += 1
+            result = search(target, g + 1, h + distance[blank][tile] - distance[target][tile],
+                            OPPOSITE[move])
+            if result < 0:
+                return result  # Found or cancelled: unwind without undoing moves
+            moves.pop()
+            board[blank], board[target] = 0, tile  # Unmake the move
+            minimum = min(minimum, result)
+        return minimum
+
+    # search() plus probe calls; kept separate so the plain loop stays untouched
+    def probed_search(blank, g, h, forbidden):
+        f = g + h
+        if f > threshold:
+            probe.cutoff()
+            return f
+        if h == 0:
+            return found
+        counts[0] += 1
+        probe.expand(board, g)
+        if g > counts[2]:
+            counts[2] = g
+        if counts[0] % PROGRESS_INTERVAL == 0:
+            if progress is not None:
+                progress(threshold, counts[0])
+            if cancel is not None and cancel.is_set():
+                return cancelled
+        minimum = max_depth + 1
+        for move, target, _, _, _, _ in slides[blank]:
+            if move == forbidden:
+                continue
+            tile = board[target]
+            board[blank], board[target] = tile, 0
+            moves.append(move)
+            counts[1] += 1
+            result = probed_search(target, g + 1, h + distance[blank][tile] - distance[target][tile],
+                                   OPPOSITE[move])
+            if result < 0:
+                return result
+            moves.pop()
+            board[blank], board[target] = 0, tile
+            minimum = min(minimum, result)
+        return minimum
+
+    run = search if probe is None else probed_search
+    blank = board.index(0)
+    start_h = sum(distance[i][tile] for i, tile in enumerate(board))
+    threshold = start_h
+    solution = None
+    while threshold <= max_depth:
+        result = run(blank, 0, start_h, -1)
+        if probe is not None:
+            probe.iteration(threshold)
+        if result == found:
+            solution = Solution(geometry.pack(initial_state), moves, is_nested(initial_state), geometry)
+            break
+        if result == cancelled:
+            break
+        threshold = result
+
+    if stats is not None:
+        stats.update(expanded=counts[0], generated=counts[1], peak_frontier=counts[2] + 1)
+    return solution  # None if there is no solution within max_depth
 
 # Check if the puzzle is solvable by counting inversions
 def is_solvable(state):
@@ -94,8 +256,12 @@ def main():
         print("This puzzle configuration is unsolvable.")
         return
 
+    mode = input("Search mode, ida* or ids [ida*]: ").strip() or "ida*"
     print("Solving the puzzle...")
-    solution = iterative_deepening_search(initial_state)
+    if mode == "ids":
+        solution = get_cache().solve(initial_state, "ids", iterative_deepening_search)
+    else:
+        solution = get_cache().solve(initial_state, "ida*", ida_star)
 
     if solution:
         print_solution(solution)
@@ -1,57 +1,87 @@
-from time import time
+from puzzlestate import MOVES, OPPOSITE, DEFAULT, geometry_of, is_nested, slide
+from nodestore import NodeStore
+from heuristics import make_heuristic
+from transposition import TranspositionTable, DEFAULT_CAPACITY
 
-class Node:
-    def __init__(self, state, parent, action, depth, cost):
-        self.state = state
-        self.parent = parent
-        self.action = action
-        self.depth = depth
-        self.cost = cost
+# How often (in expanded nodes) ids reports progress and checks for cancellation
+PROGRESS_INTERVAL = 4096
 
-    def path_from_start(self):
-        path = []
-        node = self
-        while node:
-            path.append(node.state)
-            node = node.parent
-        path.reverse()
-        return path
+def move_blank(state, dx, dy, geometry=DEFAULT):
+    return geometry.apply_move(state, MOVES.index((dx, dy)))
 
-def create_node(state, parent, action, depth, cost):
-    return Node(state, parent, action, depth, cost)
-
-def move_blank(state, dx, dy):
-    new_state = state[:]
-    index = new_state.index(0)
-    x, y = divmod(index, 3)
-    nx, ny = x + dx, y + dy
-    if 0 <= nx < 3 and 0 <= ny < 3:
-        swap_idx = nx * 3 + ny
-        new_state[index], new_state[swap_idx] = new_state[swap_idx], new_state[index]
-        return new_state
-    return None
-
-def expand(node):
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
-    children = [
-        create_node(move_blank(node.state, dx, dy), node, (dx, dy), node.depth + 1, 0)
-        for dx, dy in moves
-    ]
-    return [child for child in children if child.state]
-
-def dls(start, goal, limit):
-    stack = [create_node(start, None, None, 0, 0)]
+# counts = [expanded, generated, peak stack size], accumulated across calls.
+# `h` is an optional bound heuristic: children whose depth plus estimate
+# exceeds the limit are pruned, which turns the search into one IDA* pass.
+# Given a TranspositionTable, children it has already seen at no greater
+# depth are skipped; the same table should be passed to every pass.
+def dls(start, goal, limit, counts=None, cancel=None, progress=None, h=None, table=None):
+    counts = counts if counts is not None else [0, 0, 0]
+    geometry = geometry_of(start)
+    slides, blank_shift = geometry.slides, geometry.blank_shift
+    # Nodes live in a NodeStore; the stack holds their handles
+    nodes = NodeStore(geometry)
+    states, moves, depths = nodes.states, nodes.moves, nodes.depths
+    stack = [nodes.add(geometry.pack(start))]
+    goal = geometry.pack(goal)
+    if table is not None:
+        table.new_pass()
+        table.visit(states[0], 0)
     while stack:
-        node = stack.pop()
-        if node.state == goal:
-            return node.path_from_start()
-        if node.depth < limit:
-            stack.extend(expand(node))
+        handle = stack.pop()
+        nodes.truncate(handle + 1)  # Everything stored after it belongs to finished subtrees
+        state = states[handle]
+        if state == goal:
+            return nodes.solution(handle, is_nested(start))
+        depth = depths[handle]
+        if depth < limit:
+            undo = OPPOSITE[moves[handle]] if handle else None
+            depth += 1
+            generated = 0
+            for entry in slides[state >> blank_shift]:
+                if entry[0] == undo:
+                    continue
+                child = slide(state, entry)
+                if h is not None and depth + h(child) > limit:
+                    continue
+                if table is not None and table.visit(child, depth):
+                    continue
+                stack.append(nodes.add(child, handle, entry[0], depth))
+                generated += 1
+            counts[0] += 1
+            counts[1] += generated
+            if len(stack) > counts[2]:
+                counts[2] = len(stack)
+            if counts[0] % PROGRESS_INTERVAL == 0:
+                if progress is not None:
+                    progress(limit, counts[0])
+                if cancel is not None and cancel.is_set():
+                    return None
     return None
 
-def ids(start, goal, max_depth=50):
-    for depth in range(max_depth):
-        result = dls(start, goal, depth)
-        if result:
-            return result
-    return None
+# Iterative deepening over dls. With a `heuristic` (a name from
+# heuristics.HEURISTICS, such as "pdb", or a factory) the limits start at
+# the estimate for `start` and every pass prunes with it. Boards of any
+# size work; max_depth defaults to one more than the size's depth bound.
+# Passes share a transposition table of `table_size` slots (0 disables it);
+# stats then also receive the number of skipped revisits (transpositions).
+def ids(start, goal, max_depth=None, stats=None, cancel=None, progress=None, heuristic=None,
+        table_size=DEFAULT_CAPACITY):
+    geometry = geometry_of(start)
+    max_depth = geometry.max_depth + 1 if max_depth is None else max_depth
+    counts = [0, 0, 1]
+    table = TranspositionTable(table_size) if table_size else None
+    result = None
+    h = None
+    first = 0
+    if heuristic is not None:
+        h = make_heuristic(heuristic, geometry.pack(goal), geometry)
+        first = h(geometry.pack(start))
+    for depth in range(first, max_depth):
+        result = dls(start, goal, depth, counts, cancel, progress, h, table)
+        if result or (cancel is not None and cancel.is_set()):
+            break
+    if stats is not None:
+        stats.update(expanded=counts[0], generated=counts[1], peak_frontier=counts[2])
+        if table is not None:
+            stats["transpositions"] = table.hits
+    return result
@@ -0,0 +1,108 @@
+# Line-oriented puzzle and solution format.
+#
+# Puzzles: one board per line, nine digits in row-major order with 0 for the
+# blank ("123456780"); whitespace- or comma-separated numbers are also
+# accepted. Boards with tiles above 9 (15- and 24-puzzles) are written
+# comma-separated ("1,2,3,...,15,0"). Blank lines and lines starting with
+# '#' are skipped.
+#
+# Solutions: "<board> <moves> <UDLR...>", where each letter is the direction
+# the blank moves, or "<board> unsolvable" / "<board> unsolved". A solution
+# costs one byte per move instead of a full board per step.
+#
+# Readers are generators and writers emit one line at a time, so files of
+# any size are processed without ever being held whole.
+
+from puzzlestate import MOVE_NAMES, DEFAULT, geometry_of
+
+UNSOLVABLE = "unsolvable"
+UNSOLVED = "unsolved"
+
+
+# Parse one puzzle line into a flat board, or None for blank/comment lines
+def parse_board(line):
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    try:
+        tiles = [int(c) for c in line] if line.isdigit() else [int(t) for t in line.replace(",", " ").split()]
+    except ValueError:
+        tiles = []
+    if len(tiles) < 4 or sorted(tiles) != list(range(len(tiles))):
+        raise ValueError(f"Not a sliding-puzzle board: {line!r}")
+    return tiles
+
+
+def format_board(board):
+    return ("".join if len(board) <= 10 else ",".join)(map(str, board))
+
+
+# Yield flat boards from an iterable of lines (such as an open file)
+def read_puzzles(lines):
+    for line in lines:
+        board = parse_board(line)
+        if board is not None:
+            yield board
+
+
+# Write one board in puzzle format
+def write_puzzle(out, board):
+    out.write(format_board(board) + "\n")
+
+
+# Convert a Solution, or a list of boards (flat, nested or packed), into a
+# UDLR move string. Packed boards are taken to be 3x3.
+def moves_from_path(path):
+    if hasattr(path, "move_string"):
+        return path.move_string()
+    path = list(path)
+    geometry = DEFAULT if not path or isinstance(path[0], int) else geometry_of(path[0])
+    states = [state if isinstance(state, int) else geometry.pack(state) for state in path]
+    moves = []
+    for state, next_state in zip(states, states[1:]):
+        move = geometry.move_between(state, next_state)
+        if move is None:
+            raise ValueError("Consecutive boards are not one move apart")
+        moves.append(MOVE_NAMES[move])
+    return "".join(moves)
+
+
+# Format one solution line; `moves` is a UDLR string, or None when the
+# board is unsolvable (or `solved` is False when the solver gave up)
+def format_solution(board, moves, solved=True):
+    if moves is None:
+        return f"{format_board(board)} {UNSOLVABLE if solved else UNSOLVED}"
+    return f"{format_board(board)} {len(moves)} {moves}".rstrip()
+
+
+def write_solution(out, board, moves, solved=True):
+    out.write(format_solution(board, moves, solved) + "\n")
+
+
+# Yield (board, moves) pairs from solution lines; moves is None for boards
+# that were unsolvable or unsolved
+def read_solutions(lines):
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        if len(fields) < 2:
+            raise ValueError(f"Not a solution line: {line.strip()!r}")
+        board = parse_board(fields[0])
+        if fields[1] in (UNSOLVABLE, UNSOLVED):
+            yield board, None
+        else:
+            yield board, fields[2] if len(fields) > 2 else ""
+
+
+# Yield the boards along a move string, starting with `board` itself;
+# flat boards that are not square need their width
+def replay(board, moves, width=None):
+    geometry = geometry_of(board, width)
+    state = geometry.pack(board)
+    yield geometry.unpack(state)
+    for name in moves:
+        state = geometry.apply_move(state, MOVE_NAMES.index(name))
+        if state is None:
+            raise ValueError(f"Illegal move {name!r}")
+        yield geometry.unpack(state)
@@ -0,0 +1,200 @@
+# Compact integer encoding of sliding-puzzle boards shared by every solver.
+#
+# A board is packed into a single int: the tile at position i (row-major)
+# lives in bits BITS*i .. BITS*i+BITS-1, and the position of the blank (0) is
+# stored in the bits above the tiles so a move never has to search for it.
+# Packed states hash in O(1), compare with ==, and a move is a handful of
+# integer operations driven by the precomputed SLIDES table.
+#
+# Every board size has its own Geometry holding the per-size tables. Boards
+# up to 4x4 use four bits per tile; larger boards use five. A packed state
+# is the tile bits plus the blank index above them, so an 8-puzzle state
+# takes 40 bits, but a 15-puzzle state takes 68: its tiles alone fill 64
+# bits, and the whole state is a Python bigint rather than a machine word
+# (solutioncache stores such states as blobs). The module-level constants
+# and helpers describe the default 3x3 board, except pack() and
+# geometry_of(), which work out the size from the board they are given.
+
+from math import isqrt
+
+# Possible moves of the blank: up, down, left, right
+MOVES = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+MOVE_NAMES = "UDLR"
+
+# The move that undoes each move (up <-> down, left <-> right)
+OPPOSITE = [1, 0, 3, 2]
+
+# Longest optimal solution for the sizes where it is known
+GODS_NUMBERS = {(2, 2): 6, (2, 3): 21, (3, 3): 31, (4, 4): 80}
+
+
+class Geometry:
+    """Dimensions of a board and the move tables derived from them."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.blank_shift = self.bits * self.size
+        self.slides = self._build_slides()
+        # move_table[blank][move] is the new blank position, or -1 if the move is illegal
+        self.move_table = tuple(
+            tuple(next((e[1] for e in entries if e[0] == move), -1) for move in range(len(MOVES)))
+            for entries in self.slides
+        )
+        # Bound on any optimal solution, for searches that need a depth limit
+        self.max_depth = GODS_NUMBERS.get((min(width, height), max(width, height)), self.size ** 2)
+        self.goal_tiles = list(range(1, self.size)) + [0]
+        self.goal = self.pack(self.goal_tiles)
+
+    # Build, for every blank position, the legal moves as
+    # (move, target position, tile shift, blank shift, blank delta, tile mask) tuples
+    def _build_slides(self):
+        slides = []
+        for blank in range(self.size):
+            x, y = divmod(blank, self.width)
+            entries = []
+            for move, (dx, dy) in enumerate(MOVES):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.height and 0 <= ny < self.width:
+                    target = nx * self.width + ny
+                    entries.append((move, target, self.bits * target, self.bits * blank,
+                                    (target - blank) << self.blank_shift, self.mask))
+            slides.append(tuple(entries))
+        return tuple(slides)
+
+    def pack(self, board):
+        board = flatten(board)
+        if len(board) != self.size:
+            raise ValueError(f"Expected {self.size} tiles, got {len(board)}")
+        state = 0
+        for i, tile in enumerate(board):
+            state |= tile << (self.bits * i)
+        return state | (board.index(0) << self.blank_shift)
+
+    def unpack(self, state):
+        """Flat list of tiles."""
+        bits, mask = self.bits, self.mask
+        return [(state >> (bits * i)) & mask for i in range(self.size)]
+
+    def unpack_grid(self, state):
+        """Nested rows of tiles."""
+        flat = self.unpack(state)
+        return [flat[i:i + self.width] for i in range(0, self.size, self.width)]
+
+    def unpack_like(self, state, board):
+        """Unpack into the same shape (flat or nested) as `board`."""
+        if is_nested(board):
+            return self.unpack_grid(state)
+        return self.unpack(state)
+
+    def blank_index(self, state):
+        return state >> self.blank_shift
+
+    def tile_at(self, state, index):
+        return (state >> (self.bits * index)) & self.mask
+
+    def apply_move(self, state, move):
+        """The state after a move (index into MOVES), or None if illegal."""
+        for entry in self.slides[state >> self.blank_shift]:
+            if entry[0] == move:
+                return slide(state, entry)
+        return None
+
+    def neighbours(self, state):
+        """All (move, next_state) pairs reachable in one move."""
+        return [(entry[0], slide(state, entry)) for entry in self.slides[state >> self.blank_shift]]
+
+    def move_between(self, state, next_state):
+        """The move that turns `state` into `next_state`, or None."""
+        target = next_state >> self.blank_shift
+        for entry in self.slides[state >> self.blank_shift]:
+            if entry[1] == target:
+                return entry[0]
+        return None
+
+    def __repr__(self):
+        return f"Geometry({self.width}, {self.height})"
+
+
+_geometries = {}
+
+
+# The shared Geometry for a board size; height defaults to width
+def geometry(width, height=None):
+    key = (width, height or width)
+    if key not in _geometries:
+        _geometries[key] = Geometry(*key)
+    return _geometries[key]
+
+
+# Geometry of a board: nested rows give their own shape, flat boards are
+# taken to be square unless a width is given
+def geometry_of(board, width=None):
+    if is_nested(board):
+        return geometry(len(board[0]), len(board))
+    if width is None:
+        width = isqrt(len(board))
+        if width * width != len(board):
+            raise ValueError(f"A flat board of {len(board)} tiles needs a width")
+    if len(board) % width:
+        raise ValueError(f"{len(board)} tiles do not fill rows of {width}")
+    return geometry(width, len(board) // width)
+
+
+# Whether a board is given as nested rows rather than a flat list
+def is_nested(board):
+    return bool(board) and isinstance(board[0], (list, tuple))
+
+
+# Flat list of tiles for a flat or nested board
+def flatten(board):
+    if is_nested(board):
+        return [tile for row in board for tile in row]
+    return list(board)
+
+
+# Nested rows of a flat board, `width` tiles per row
+def to_rows(board, width):
+    return [list(board[i:i + width]) for i in range(0, len(board), width)]
+
+
+# Pack a flat or nested board of any size into an int
+def pack(board):
+    return geometry_of(board).pack(board)
+
+
+# Slide the tile at `target` into the blank described by one SLIDES entry;
+# the entry carries its shifts and mask, so this works for any board size
+def slide(state, entry):
+    _, _, tile_shift, blank_shift, blank_delta, mask = entry
+    tile = (state >> tile_shift) & mask
+    return state - (tile << tile_shift) + (tile << blank_shift) + blank_delta
+
+
+DEFAULT = geometry(3)
+
+# The default 3x3 board
+WIDTH = DEFAULT.width
+SIZE = DEFAULT.size
+BITS = DEFAULT.bits
+MASK = DEFAULT.mask
+BLANK_SHIFT = DEFAULT.blank_shift
+SLIDES = DEFAULT.slides
+MOVE_TABLE = DEFAULT.move_table
+
+# Canonical goal used by the command-line solvers
+GOAL_TILES = DEFAULT.goal_tiles
+GOAL = DEFAULT.goal
+
+# Helpers for packed 3x3 states; use a Geometry's methods for other sizes
+unpack = DEFAULT.unpack
+unpack_grid = DEFAULT.unpack_grid
+unpack_like = DEFAULT.unpack_like
+blank_index = DEFAULT.blank_index
+tile_at = DEFAULT.tile_at
+apply_move = DEFAULT.apply_move
+neighbours = DEFAULT.neighbours
+move_between = DEFAULT.move_between
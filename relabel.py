@@ -0,0 +1,132 @@
+# Any goal board reduced to a canonical one, so every table and cache built
+# for the canonical goal serves all goals.
+#
+# A move only ever swaps the blank with a neighbour, so renaming the tiles
+# turns a search towards one goal into a search towards another: if the
+# board and goal are both relabeled by the same permutation of the tiles,
+# the moves that solve one solve the other. The blank cannot be renamed,
+# though, so the goal's blank first has to reach the canonical square. A
+# mirror image of the board (rows reversed, columns reversed or both) moves
+# a corner to the bottom-right, and turns the moves of the blank into their
+# mirror images (U and D swap when rows are reversed, L and R when columns
+# are). The canonical goal for a blank in a corner is therefore the standard
+# goal 1, 2, ..., 0; a goal with its blank elsewhere maps to the tiles 1, 2,
+# ... in order around the blank's mirrored square.
+#
+# Goal-relative solvability needs no search either: the board can reach the
+# goal exactly when both sit on the same side of the parity rule.
+#
+# Example:
+#     relabeling = get_relabeling([0, 1, 2, 3, 4, 5, 6, 7, 8])
+#     solution = astar(relabeling.board(board), relabeling.canonical)
+#     solution = relabeling.restore(solution, nested=False)
+
+from puzzlestate import DEFAULT, OPPOSITE, flatten, is_nested, to_rows, geometry_of
+from checkSolvability import is_solvable
+from solution import Solution
+
+# Move each move becomes in a mirror image with (reversed rows, reversed columns)
+_MIRRORED_MOVES = {
+    (False, False): [0, 1, 2, 3],
+    (False, True): [0, 1, OPPOSITE[2], OPPOSITE[3]],
+    (True, False): [OPPOSITE[0], OPPOSITE[1], 2, 3],
+    (True, True): OPPOSITE,
+}
+
+
+# Canonical goal with the blank on square `blank`: the tiles in order around it
+def canonical_goal(geometry=DEFAULT, blank=None):
+    blank = geometry.size - 1 if blank is None else blank
+    tiles = list(range(1, geometry.size))
+    return tiles[:blank] + [0] + tiles[blank:]
+
+
+class Relabeling:
+    """Mirror image and tile permutation taking one goal to its canonical goal.
+
+    board() and state() map a board towards the canonical goal, restore()
+    maps a solution found there back to the original goal, and canonize()
+    does the reverse. `identity` is true when the goal is already canonical.
+    """
+
+    def __init__(self, goal, geometry=DEFAULT):
+        self.geometry = geometry
+        self.goal = flatten(goal)
+        width, height = geometry.width, geometry.height
+        row, column = divmod(self.goal.index(0), width)
+        # Of the mirror images, keep the one putting the blank furthest on,
+        # so a blank in any corner lands in the bottom-right
+        best = None
+        for flip_rows in (False, True):
+            for flip_columns in (False, True):
+                blank = ((height - 1 - row if flip_rows else row) * width
+                         + (width - 1 - column if flip_columns else column))
+                if best is None or blank > best[0]:
+                    best = (blank, flip_rows, flip_columns)
+        blank, flip_rows, flip_columns = best
+        # squares[i] is where square i lands in the mirror image
+        self.squares = [(height - 1 - i // width if flip_rows else i // width) * width
+                        + (width - 1 - i % width if flip_columns else i % width) for i in range(geometry.size)]
+        self.moves = _MIRRORED_MOVES[flip_rows, flip_columns]
+        self.canonical = canonical_goal(geometry, blank)
+        # labels[tile] is the tile's name on the canonical board, and names its inverse
+        self.labels = [0] * geometry.size
+        for square, tile in enumerate(self.goal):
+            self.labels[tile] = self.canonical[self.squares[square]]
+        self.names = [0] * geometry.size
+        for tile, label in enumerate(self.labels):
+            self.names[label] = tile
+        self.identity = self.goal == self.canonical
+
+    def board(self, board):
+        """The board relabeled for the canonical goal, flat or nested like `board`."""
+        tiles = flatten(board)
+        relabeled = [0] * len(tiles)
+        for square, tile in enumerate(tiles):
+            relabeled[self.squares[square]] = self.labels[tile]
+        return to_rows(relabeled, self.geometry.width) if is_nested(board) else relabeled
+
+    def unlabel(self, board):
+        """The flat board on the original goal's side, the inverse of board()."""
+        tiles = flatten(board)
+        return [self.names[tiles[self.squares[square]]] for square in range(len(tiles))]
+
+    def state(self, state):
+        """board() for a packed state."""
+        if self.identity:
+            return state
+        return self.geometry.pack(self.board(self.geometry.unpack(state)))
+
+    def solvable(self, board):
+        """Whether `board` can reach the goal, by comparing parities."""
+        return is_solvable(board, self.geometry.width) == is_solvable(self.goal, self.geometry.width)
+
+    def restore(self, solution, nested=False):
+        """A solution towards the canonical goal, as one towards the original goal."""
+        if solution is None or self.identity:
+            return solution if solution is None else solution.reshaped(nested)
+        start = self.unlabel(self.geometry.unpack(solution.start))
+        return Solution(start, (self.moves[move] for move in solution.moves()), nested, self.geometry)
+
+    def canonize(self, solution):
+        """A solution towards the original goal, as one towards the canonical goal."""
+        if self.identity:
+            return solution
+        start = self.board(self.geometry.unpack(solution.start))
+        return Solution(start, (self.moves[move] for move in solution.moves()), solution.nested, self.geometry)
+
+
+# Relabelings already built, keyed by (goal, geometry)
+_relabelings = {}
+
+
+# Relabeling for a goal given as a board (flat or nested) or a packed state
+def get_relabeling(goal=None, geometry=None):
+    if geometry is None:
+        geometry = DEFAULT if goal is None or isinstance(goal, int) else geometry_of(goal)
+    goal = geometry.goal if goal is None else goal
+    goal = goal if isinstance(goal, int) else geometry.pack(goal)
+    key = (goal, geometry)
+    if key not in _relabelings:
+        _relabelings[key] = Relabeling(geometry.unpack(goal), geometry)
+    return _relabelings[key]
@@ -0,0 +1,315 @@
+# Local HTTP/JSON solving service.
+#
+# An asyncio front end parses requests and a process pool runs the solves,
+# so slow searches never block the event loop and every core is used.
+# Identical boards in flight at the same time (same algorithm, goal and
+# budgets) are coalesced: the first request starts the solve and the others
+# wait for its result. Only the standard library is needed.
+#
+# Endpoints:
+#     POST /solve    {"board": "867254301", "algorithm": "ida*", "timeout": 5, "max_nodes": 1000000,
+#                     "max_memory": 536870912}
+#     POST /batch    {"boards": ["867254301", ...], ...same options...}
+#     GET  /metrics  request counts and latency histograms
+#     GET  /algorithms
+#
+# Boards are puzzle-format strings or lists of tiles; "goal" and "width"
+# work as in solvers.run. "timeout" (seconds from the request's arrival, so
+# including any wait for a worker), "max_nodes" and "max_memory" (bytes of
+# worker RSS) bound each solve, as in solvers.solve; a solve that
+# runs out is answered with status "budget_exhausted", and with the best
+# moves so far from the anytime algorithm. Every solve answers with
+#     {"board": ..., "status": "solved" | "unsolvable" | "budget_exhausted" | "unsupported_goal",
+#      "reason": ..., "optimal": bool, "moves": "UDLR...", "length": n,
+#      "coalesced": bool, "metrics": {...}}
+#
+# Example:
+#     python server.py --port 8080 --workers 4
+#     python loadgen.py --url http://127.0.0.1:8080 --requests 2000 --concurrency 32
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from puzzlestate import DEFAULT, flatten, geometry_of
+from relabel import get_relabeling
+from puzzleio import parse_board, format_board
+import solvers
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_TIMEOUT = 30.0  # Seconds per solve when a request sets no time budget
+MAX_BODY = 1 << 20
+MAX_BATCH = 1000
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """A request the service rejects, with the HTTP status to answer."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Solve one board inside a worker process within its budget; returns
+# solvers.Result.to_dict(). `deadline` is a time.time() value, since the
+# monotonic clock is not shared between processes, so time spent queued
+# for a worker counts against the request's timeout.
+def solve_in_worker(board, algorithm, goal, width, deadline, max_nodes, max_memory):
+    return solvers.solve(board, algorithm, goal, timeout=max(deadline - time.time(), 0.0),
+                         max_nodes=max_nodes, max_memory=max_memory, width=width).to_dict()
+
+
+class Histogram:
+    """Counts of observations per LATENCY_BUCKETS bucket, with their sum."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def summary(self):
+        """Cumulative counts per upper bound, as in a Prometheus histogram."""
+        buckets = {}
+        running = 0
+        for bound, count in zip(list(self.bounds) + ["+Inf"], self.counts):
+            running += count
+            buckets[str(bound)] = running
+        return {"count": running, "sum": self.total, "buckets": buckets}
+
+
+class SolveService:
+    """Request handling, coalescing and metrics around a process pool."""
+
+    def __init__(self, workers=None, default_timeout=DEFAULT_TIMEOUT):
+        self.pool = ProcessPoolExecutor(workers or os.cpu_count() or 1)
+        self.default_timeout = default_timeout
+        self.in_flight = {}  # Solve key -> future of solve_in_worker's result
+        self.started = time.time()
+        self.counters = {"requests": 0, "errors": 0, "solves": 0, "coalesced": 0, solvers.SOLVED: 0,
+                         solvers.EXHAUSTED: 0, solvers.UNSOLVABLE: 0, solvers.UNSUPPORTED: 0, "expanded": 0}
+        self.latency = {}  # Endpoint -> Histogram of request latency
+        self.solve_time = Histogram()  # Wall time of the solves themselves, in the workers
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    # Validate one board and its options into the arguments of solve_in_worker
+    def _solve_args(self, board, options):
+        algorithm = options.get("algorithm", "ida*")
+        if not board or not isinstance(board, (str, list)):
+            raise RequestError(400, "A board is a puzzle-format string or a list of tiles")
+        try:
+            solver = solvers.get_algorithm(algorithm)
+            if isinstance(board, str):
+                board = parse_board(board)
+            width = options.get("width")
+            # bool is an int subclass, so true would otherwise pass as 1
+            if width is not None and (isinstance(width, bool) or not isinstance(width, int) or width <= 0
+                                      or (not isinstance(board[0], list) and len(board) % width)):
+                raise ValueError(f"width must be a positive integer dividing the {len(board)} tiles")
+            geometry = geometry_of(board, width)
+            goal = options.get("goal")
+            if isinstance(goal, str):
+                goal = parse_board(goal)
+            board = flatten(board)
+            goal = flatten(goal) if goal is not None else geometry.goal_tiles
+            tiles = list(range(geometry.size))
+            if sorted(board) != tiles or sorted(goal) != tiles:
+                raise ValueError(f"The board and goal must each hold the tiles 0 to {geometry.size - 1}")
+        except (ValueError, TypeError, IndexError) as e:
+            raise RequestError(400, str(e))
+        if geometry is not DEFAULT and not solver.any_size:
+            raise RequestError(400, f"{algorithm} only solves 3x3 boards")
+        error = solver.goal_error(goal, geometry)
+        if error is not None:
+            raise RequestError(400, error)
+        timeout = options.get("timeout", self.default_timeout)
+        max_nodes = options.get("max_nodes")
+        max_memory = options.get("max_memory")
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise RequestError(400, "timeout must be a positive number of seconds")
+        for name, limit in (("max_nodes", max_nodes), ("max_memory", max_memory)):
+            if limit is None:
+                continue
+            if isinstance(limit, bool) or not isinstance(limit, int) or limit <= 0:
+                raise RequestError(400, f"{name} must be a positive integer")
+            if not solver.reports_progress:
+                raise RequestError(400, f"{algorithm} cannot enforce {name}")
+        return board, algorithm, goal, geometry.width, timeout, max_nodes, max_memory
+
+    # Solve one board, joining an identical solve already in flight. The
+    # timeout runs from `arrived` (a time.time() value, by default now).
+    async def solve(self, board, options, arrived=None):
+        args = self._solve_args(board, options)
+        board, algorithm, goal, width, timeout, max_nodes, max_memory = args
+        deadline = (time.time() if arrived is None else arrived) + timeout
+        answer = {"board": format_board(board)}
+        if not get_relabeling(goal, geometry_of(board, width)).solvable(board):
+            self.counters[solvers.UNSOLVABLE] += 1
+            answer.update(solvers.Result(solvers.UNSOLVABLE).to_dict(), coalesced=False)
+            return answer
+
+        key = (tuple(board), algorithm, tuple(goal)) + args[3:]  # The timeout, not this request's deadline
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["solves"] += 1
+            future = asyncio.get_running_loop().run_in_executor(self.pool, solve_in_worker, board, algorithm,
+                                                                goal, width, deadline, max_nodes, max_memory)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            future.add_done_callback(self._record_solve)
+        try:
+            result = await asyncio.shield(future)
+        except ValueError as e:  # A board or option the solver itself rejects
+            raise RequestError(400, str(e))
+        self.counters[result["status"]] += 1
+        answer.update(result, coalesced=coalesced)
+        return answer
+
+    def _record_solve(self, future):
+        if not future.cancelled() and future.exception() is None and future.result()["metrics"]:
+            metrics = future.result()["metrics"]
+            self.counters["expanded"] += metrics["expanded"]
+            self.solve_time.observe(metrics["wall_time"])
+
+    async def solve_batch(self, boards, options, arrived=None):
+        if not isinstance(boards, list) or not boards:
+            raise RequestError(400, "boards must be a non-empty list")
+        if len(boards) > MAX_BATCH:
+            raise RequestError(400, f"At most {MAX_BATCH} boards per batch")
+        for board in boards:
+            self._solve_args(board, options)  # Reject the whole batch before starting any solve
+        return {"results": await asyncio.gather(*(self.solve(board, options, arrived) for board in boards))}
+
+    def metrics(self):
+        return {
+            "uptime": time.time() - self.started,
+            "in_flight": len(self.in_flight),
+            **self.counters,
+            "latency": {endpoint: histogram.summary() for endpoint, histogram in sorted(self.latency.items())},
+            "solve_time": self.solve_time.summary(),
+        }
+
+    # Dispatch one request to its endpoint; returns (status, JSON-able body)
+    async def route(self, method, path, body):
+        arrived = time.time()
+        if path == "/metrics" or path == "/algorithms":
+            if method != "GET":
+                raise RequestError(405, f"{path} only accepts GET")
+            if path == "/metrics":
+                return 200, self.metrics()
+            return 200, {name: {"optimal": a.optimal, "any_size": a.any_size, "description": a.description}
+                         for name, a in solvers.ALGORITHMS.items()}
+        if path not in ("/solve", "/batch"):
+            raise RequestError(404, f"No endpoint {path}")
+        if method != "POST":
+            raise RequestError(405, f"{path} only accepts POST")
+        try:
+            options = json.loads(body or b"{}")
+        except ValueError as e:
+            raise RequestError(400, f"Invalid JSON: {e}")
+        if not isinstance(options, dict):
+            raise RequestError(400, "The request body must be a JSON object")
+        if path == "/solve":
+            if "board" not in options:
+                raise RequestError(400, "Missing board")
+            return 200, await self.solve(options["board"], options, arrived)
+        return 200, await self.solve_batch(options.get("boards"), options, arrived)
+
+    # Serve one connection; HTTP/1.1 keep-alive is honoured
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                started = time.perf_counter()
+                method, path = "", ""
+                try:
+                    try:
+                        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                        length = int(headers.get("content-length", 0))
+                        if length < 0:
+                            raise ValueError(length)
+                    except ValueError:  # Only the request line and framing; see _solve_args for bodies
+                        keep_alive = False
+                        raise RequestError(400, "Malformed request")
+                    if length > MAX_BODY:
+                        keep_alive = False
+                        raise RequestError(413, f"Bodies are limited to {MAX_BODY} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    self.counters["requests"] += 1
+                    status, answer = await self.route(method, path.split("?", 1)[0], body)
+                except RequestError as e:
+                    status, answer = e.status, {"error": str(e)}
+                except Exception as e:  # A failing solve must not take the connection down silently
+                    status, answer = 500, {"error": f"{type(e).__name__}: {e}"}
+                if status != 200:
+                    self.counters["errors"] += 1
+                payload = json.dumps(answer).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                endpoint = path.split("?", 1)[0] if status != 404 else "other"
+                self.latency.setdefault(endpoint, Histogram()).observe(time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, default_timeout=DEFAULT_TIMEOUT):
+    service = SolveService(workers, default_timeout)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the solvers over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: all cores)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="time budget per solve when a request sets none (default: %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
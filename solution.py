@@ -0,0 +1,122 @@
+# Compact solution type shared by every solver.
+#
+# A Solution stores the packed start state and the moves of the blank packed
+# four to a byte (two bits per move, indices into puzzlestate.MOVES), so a
+# stored solution costs about length/4 bytes. Intermediate boards are only
+# rebuilt when a consumer iterates over them.
+#
+# A Solution behaves like the list of boards the solvers used to return:
+# len() counts boards (moves + 1), iteration and indexing yield boards, flat
+# or as nested rows depending on how the solver was called, so existing code
+# such as print_solution and the GUI animations keeps working unchanged.
+# Solutions carry the Geometry of their board, 3x3 unless the start board
+# says otherwise.
+
+from puzzlestate import MOVE_NAMES, DEFAULT, geometry_of
+
+
+class Solution:
+    """Start state plus a 2-bit packed move sequence."""
+
+    __slots__ = ("start", "length", "packed_moves", "nested", "geometry")
+
+    def __init__(self, start, moves=(), nested=False, geometry=None):
+        if geometry is None:
+            geometry = DEFAULT if isinstance(start, int) else geometry_of(start)
+        self.geometry = geometry
+        self.start = start if isinstance(start, int) else geometry.pack(start)
+        data = bytearray()
+        length = 0
+        for length, move in enumerate(moves, 1):
+            if length & 3 == 1:
+                data.append(0)
+            data[-1] |= move << (((length - 1) & 3) * 2)
+        self.packed_moves = bytes(data)
+        self.length = length
+        self.nested = nested
+
+    @classmethod
+    def from_packed(cls, start, packed_moves, length, nested=False, geometry=DEFAULT):
+        """Rebuild a Solution from its stored fields without repacking."""
+        solution = object.__new__(cls)
+        solution.start, solution.packed_moves, solution.length = start, packed_moves, length
+        solution.nested = nested
+        solution.geometry = geometry
+        return solution
+
+    @classmethod
+    def from_states(cls, states, nested=False, geometry=DEFAULT):
+        """Build a Solution from a sequence of consecutive packed states."""
+        states = iter(states)
+        start = next(states)
+
+        def moves():
+            state = start
+            for next_state in states:
+                yield geometry.move_between(state, next_state)
+                state = next_state
+        return cls(start, moves(), nested, geometry)
+
+    @classmethod
+    def from_move_string(cls, start, moves, nested=False, geometry=None):
+        """Build a Solution from a UDLR move string."""
+        return cls(start, (MOVE_NAMES.index(name) for name in moves), nested, geometry)
+
+    def reshaped(self, nested):
+        """The same solution yielding flat or nested boards, without repacking."""
+        return Solution.from_packed(self.start, self.packed_moves, self.length, nested, self.geometry)
+
+    def suffix(self, offset, nested=None):
+        """The solution from the board `offset` moves in to the goal."""
+        moves = list(self.moves())
+        start = self.start
+        for move in moves[:offset]:
+            start = self.geometry.apply_move(start, move)
+        return Solution(start, moves[offset:], self.nested if nested is None else nested, self.geometry)
+
+    def moves(self):
+        """Yield the move indices in order."""
+        for i in range(self.length):
+            yield (self.packed_moves[i >> 2] >> ((i & 3) * 2)) & 3
+
+    def move_string(self):
+        return "".join(MOVE_NAMES[move] for move in self.moves())
+
+    def states(self):
+        """Yield the packed states from start to goal."""
+        apply_move = self.geometry.apply_move
+        state = self.start
+        yield state
+        for move in self.moves():
+            state = apply_move(state, move)
+            yield state
+
+    def __iter__(self):
+        board = self.geometry.unpack_grid if self.nested else self.geometry.unpack
+        for state in self.states():
+            yield board(state)
+
+    def __len__(self):
+        return self.length + 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("solution index out of range")
+        for i, board in enumerate(self):
+            if i == index:
+                return board
+
+    def __eq__(self, other):
+        if not isinstance(other, Solution):
+            return NotImplemented
+        return (self.start, self.length, self.packed_moves) == (other.start, other.length, other.packed_moves)
+
+    def __hash__(self):
+        return hash((self.start, self.length, self.packed_moves))
+
+    def __repr__(self):
+        return f"Solution({self.geometry.unpack(self.start)}, {self.move_string()!r})"
@@ -0,0 +1,173 @@
+# Memoization layer in front of the solvers.
+#
+# Solutions are keyed by (packed start state, algorithm, packed goal, board
+# shape) and kept in a bounded LRU. Goals default to the standard goal for
+# the board's size, and solutions are stored relabeled for their canonical
+# goal (see relabel.py), so one found for one goal convention answers every
+# other.
+# Every state along a cached solution is indexed too, so a board that
+# appears partway through an optimal solution is answered with that
+# solution's suffix instead of a new search. An optional sqlite
+# file backs the LRU so results survive restarts and are shared between
+# processes.
+#
+# Set the PUZZLE_CACHE environment variable to a file path to give the
+# process-wide cache returned by get_cache() an on-disk store.
+#
+# Boards of any size share one cache. Packed states alone do not tell sizes
+# apart (a 3x4 and a 4x3 board pack the same tiles the same way), so the
+# (width, height) of the board is part of every key. Packed 15-puzzle states
+# do not fit sqlite's signed 64-bit integers, so states that large are
+# stored as big-endian blobs.
+
+import os
+import sqlite3
+from collections import OrderedDict
+from puzzlestate import DEFAULT, geometry_of, is_nested
+from solution import Solution
+from relabel import get_relabeling
+
+DEFAULT_CAPACITY = 10000
+
+
+# Packed state as stored in sqlite, and back
+def _to_db(state):
+    return state if state < 1 << 63 else state.to_bytes((state.bit_length() + 7) // 8, "big")
+
+
+def _from_db(value):
+    return value if isinstance(value, int) else int.from_bytes(value, "big")
+
+
+class SolutionCache:
+    """Bounded LRU of solutions with suffix reuse and optional sqlite backing."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None, reuse_suffixes=True):
+        self.capacity = capacity
+        self.reuse_suffixes = reuse_suffixes
+        self.entries = OrderedDict()  # (start, algorithm, goal, shape) -> Solution
+        self.suffixes = {}  # (state, algorithm, goal, shape) -> ((start, algorithm, goal, shape), offset)
+        self.hits = self.suffix_hits = self.disk_hits = self.misses = self.evictions = 0
+        self.db = None
+        if path is not None:
+            # GUIs call the cache from their solver thread, not the thread that made it
+            self.db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            columns = [row[1] for row in self.db.execute("PRAGMA table_info(solutions)")]
+            if columns and "width" not in columns:
+                self.db.execute("DROP TABLE solutions")  # Written before keys held the board shape
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (state INTEGER, algorithm TEXT, goal INTEGER,"
+                " width INTEGER, height INTEGER, start INTEGER, moves BLOB, length INTEGER, offset INTEGER,"
+                " PRIMARY KEY (state, algorithm, goal, width, height))")
+            self.db.commit()
+
+    def stats(self):
+        """Counters for sizing the cache."""
+        return {
+            "hits": self.hits,
+            "suffix_hits": self.suffix_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "capacity": self.capacity,
+        }
+
+    def get(self, board, algorithm, goal=None):
+        """Cached Solution for `board`, or None. Packed boards are taken to be 3x3."""
+        geometry = DEFAULT if isinstance(board, int) else geometry_of(board)
+        relabeling = get_relabeling(goal, geometry)
+        state = board if isinstance(board, int) else geometry.pack(board)
+        nested = False if isinstance(board, int) else is_nested(board)
+        shape = (geometry.width, geometry.height)
+        key = (relabeling.state(state), algorithm, geometry.pack(relabeling.canonical), shape)
+
+        solution = self.entries.get(key)
+        if solution is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return relabeling.restore(solution, nested)
+
+        if self.reuse_suffixes and key in self.suffixes:
+            owner, offset = self.suffixes[key]
+            self.entries.move_to_end(owner)
+            self.suffix_hits += 1
+            return relabeling.restore(self.entries[owner].suffix(offset), nested)
+
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT start, moves, length, offset FROM solutions"
+                " WHERE state = ? AND algorithm = ? AND goal = ? AND width = ? AND height = ?",
+                (_to_db(key[0]), algorithm, _to_db(key[2])) + shape).fetchone()
+            if row is not None:
+                solution = Solution.from_packed(_from_db(row[0]), row[1], row[2], geometry=geometry)
+                self._remember(solution, algorithm, key[2])
+                self.disk_hits += 1
+                return relabeling.restore(solution.suffix(row[3]) if row[3] else solution, nested)
+
+        self.misses += 1
+        return None
+
+    def put(self, solution, algorithm, goal=None):
+        """Store a solution in memory and, if configured, on disk."""
+        relabeling = get_relabeling(goal, solution.geometry)
+        solution = relabeling.canonize(solution)
+        goal = solution.geometry.pack(relabeling.canonical)
+        self._remember(solution, algorithm, goal)
+        if self.db is not None:
+            shape = (solution.geometry.width, solution.geometry.height)
+            rows = [(_to_db(state), algorithm, _to_db(goal)) + shape
+                    + (_to_db(solution.start), solution.packed_moves, solution.length, offset)
+                    for offset, state in enumerate(solution.states())
+                    if offset == 0 or self.reuse_suffixes]
+            self.db.executemany("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.db.commit()
+
+    def solve(self, board, algorithm, solver, goal=None):
+        """Return the cached solution for `board`, or call solver(board) and cache it."""
+        solution = self.get(board, algorithm, goal)
+        if solution is None:
+            solution = solver(board)
+            if solution is not None:
+                self.put(solution, algorithm, goal)
+        return solution
+
+    def _remember(self, solution, algorithm, goal):
+        shape = (solution.geometry.width, solution.geometry.height)
+        key = (solution.start, algorithm, goal, shape)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return
+        self.entries[key] = solution
+        if self.reuse_suffixes:
+            for offset, state in enumerate(solution.states()):
+                if offset:
+                    self.suffixes.setdefault((state, algorithm, goal, shape), (key, offset))
+        while len(self.entries) > self.capacity:
+            self._evict()
+
+    def _evict(self):
+        key, solution = self.entries.popitem(last=False)
+        self.evictions += 1
+        if self.reuse_suffixes:
+            algorithm, goal, shape = key[1:]
+            for state in solution.states():
+                suffix_key = (state, algorithm, goal, shape)
+                if self.suffixes.get(suffix_key, (None,))[0] == key:
+                    del self.suffixes[suffix_key]
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+
+_cache = None
+
+
+# Process-wide cache shared by the GUIs and command-line entry points
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = SolutionCache(path=os.environ.get("PUZZLE_CACHE"))
+    return _cache
@@ -0,0 +1,355 @@
+# Registry of every solver in the project behind one interface, and the
+# single command-line entry point.
+#
+# Convention: boards are flat lists of tiles in row-major order (nested rows
+# are accepted too), 0 is the blank, and the goal defaults to 1, 2, ..., 0
+# for the board's size (GOAL_TILES for the 8-puzzle). Any other goal is
+# relabeled to a canonical one before a solver sees it (see relabel.py).
+# Flat boards are taken to be square unless run() is given a width. Solvers
+# registered with any_size handle every size; the rest only the 3x3 board.
+# Each registered solver is called as
+#
+#     solve(board, goal, stats, cancel, progress, probe) -> Solution or None
+#
+# and fills `stats` with nodes expanded, nodes generated and the peak
+# frontier size. Solvers registered as instrumented also accept an
+# instrument.Probe. run() wraps a solve with wall time and memory metrics;
+# solve() adds a deadline, node budget and memory cap (see budget.py) and
+# returns a Result: solved, budget_exhausted, unsolvable or unsupported_goal.
+#
+# Examples:
+#     python solvers.py --algo astar --board 867254301
+#     python solvers.py --algo ida* --input puzzles.txt --workers 8 > solutions.txt
+#     python solvers.py --algo ida* --board 2,1,3,4,5,6,7,8,9,10,11,12,13,14,0,15
+#     python solvers.py --algo anytime --timeout 0.5 --board 13,2,10,3,1,12,8,4,5,0,9,6,15,14,11,7
+
+import argparse
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from puzzlestate import DEFAULT, flatten, is_nested, to_rows, geometry_of
+from puzzleio import parse_board, format_board, format_solution
+import astar
+import bfspuzz
+import puzzle
+import puzzleids
+import distancetable
+from instrument import Probe
+from budget import Budget
+from relabel import get_relabeling
+
+
+class Algorithm:
+    """A registered solver and what it guarantees.
+
+    Solvers without any_goal only reach the standard goal, so they accept
+    the goals that relabel to it: those with the blank in a corner. Only
+    solvers that report progress can be held to a node or memory budget.
+    """
+
+    def __init__(self, name, solve, optimal, description, instrumented, any_size, any_goal,
+                 reports_progress):
+        self.name = name
+        self.solve = solve
+        self.optimal = optimal
+        self.description = description
+        self.instrumented = instrumented
+        self.any_size = any_size
+        self.any_goal = any_goal
+        self.reports_progress = reports_progress
+
+    def goal_error(self, goal, geometry):
+        """Why this solver cannot reach `goal`, or None if it can."""
+        if self.any_goal or get_relabeling(goal, geometry).canonical == geometry.goal_tiles:
+            return None
+        return f"{self.name} only supports goals with the blank in a corner"
+
+
+ALGORITHMS = {}
+
+
+# Decorator adding a solver function to ALGORITHMS
+def register(name, optimal=True, description="", instrumented=False, any_size=False, any_goal=True,
+             reports_progress=True):
+    def decorator(solve):
+        ALGORITHMS[name] = Algorithm(name, solve, optimal, description, instrumented, any_size, any_goal,
+                                     reports_progress)
+        return solve
+    return decorator
+
+
+@register("bfs", description="breadth-first search with a parent-pointer map", instrumented=True)
+def _bfs(board, goal, stats, cancel=None, progress=None, probe=None):
+    return bfspuzz.bfs(board, stats, cancel, progress, goal_state=goal, probe=probe)
+
+
+@register("bidirectional", description="breadth-first search from both ends")
+def _bidirectional(board, goal, stats, cancel=None, progress=None, probe=None):
+    return bfspuzz.bidirectional_bfs(board, stats, goal, cancel, progress)
+
+
+@register("ids", description="iterative deepening depth-first search", any_size=True)
+def _ids(board, goal, stats, cancel=None, progress=None, probe=None):
+    return puzzleids.ids(board, goal, stats=stats, cancel=cancel, progress=progress)
+
+
+@register("ids-pdb", description="iterative deepening pruned by the pattern database", any_size=True)
+def _ids_pdb(board, goal, stats, cancel=None, progress=None, probe=None):
+    return puzzleids.ids(board, goal, stats=stats, cancel=cancel, progress=progress, heuristic="pdb")
+
+
+@register("ida*", description="iterative deepening A* with Manhattan distance", instrumented=True,
+          any_size=True)
+def _ida_star(board, goal, stats, cancel=None, progress=None, probe=None):
+    return puzzle.ida_star(board, stats=stats, goal_state=goal, cancel=cancel, progress=progress,
+                           probe=probe)
+
+
+@register("astar", description="A* with linear conflict", instrumented=True, any_size=True)
+def _astar(board, goal, stats, cancel=None, progress=None, probe=None):
+    return astar.astar(board, goal, "linear_conflict", stats, cancel, progress, probe)
+
+
+@register("astar-pdb", description="A* with the pattern database", instrumented=True, any_size=True)
+def _astar_pdb(board, goal, stats, cancel=None, progress=None, probe=None):
+    return astar.astar(board, goal, "pdb", stats, cancel, progress, probe)
+
+
+@register("anytime", optimal=False,
+          description="anytime weighted A* with linear conflict, best path so far on a budget", any_size=True)
+def _anytime(board, goal, stats, cancel=None, progress=None, probe=None):
+    return astar.anytime_astar(board, goal, "linear_conflict", stats, cancel, progress)
+
+
+_table = []  # The DistanceTable, opened on first use
+
+
+@register("table", description="lookup in the precomputed distance table", any_goal=False,
+          reports_progress=False)
+def _distance_table(board, goal, stats, cancel=None, progress=None, probe=None):
+    if not _table:
+        _table.append(distancetable.DistanceTable())
+    return _table[0].solve(board, stats)
+
+
+def get_algorithm(name):
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name} (choose from {', '.join(ALGORITHMS)})")
+    return ALGORITHMS[name]
+
+
+# Solve one board with a registered algorithm and return (solution, metrics).
+# The solver always sees the canonical goal (see relabel.py), so its tables
+# and heuristics are shared by every goal; the solution is mapped back.
+# Metrics hold the search counters plus wall time, peak RSS of the process
+# and, if trace_memory is set, the peak Python allocation during the solve.
+# A `probe` (instrument.Probe) is only accepted by instrumented solvers, and
+# `width` is needed for flat boards that are not square.
+def run(board, algorithm="ida*", goal=None, cancel=None, progress=None, trace_memory=False,
+        probe=None, width=None):
+    solver = get_algorithm(algorithm)
+    if probe is not None and not solver.instrumented:
+        raise ValueError(f"{algorithm} does not support instrumentation")
+    if width is not None and not is_nested(board):
+        board = to_rows(board, width)
+    geometry = geometry_of(board)
+    if geometry is not DEFAULT and not solver.any_size:
+        raise ValueError(f"{algorithm} only solves 3x3 boards")
+    error = solver.goal_error(goal, geometry)
+    if error is not None:
+        raise ValueError(error)
+    relabeling = get_relabeling(goal, geometry)
+    stats = {"expanded": 0, "generated": 0, "peak_frontier": 0}
+    if trace_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    try:
+        solution = solver.solve(relabeling.board(board), relabeling.canonical, stats, cancel, progress, probe)
+    finally:
+        wall_time = time.perf_counter() - start_time
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+    solution = relabeling.restore(solution, is_nested(board))
+    metrics = {
+        "algorithm": algorithm,
+        "board": format_board(flatten(board)),
+        "length": None if solution is None else len(solution) - 1,
+        "expanded": stats["expanded"],
+        "generated": stats["generated"],
+        "peak_frontier": stats["peak_frontier"],
+        "peak_memory": peak_memory,
+        "peak_rss": peak_rss(),
+        "wall_time": wall_time,
+    }
+    for key, value in stats.items():
+        metrics.setdefault(key, value)  # Solver-specific counters, such as BFS's visited
+    return solution, metrics
+
+
+# Statuses of a budgeted solve
+SOLVED = "solved"
+EXHAUSTED = "budget_exhausted"
+UNSOLVABLE = "unsolvable"
+UNSUPPORTED = "unsupported_goal"
+
+
+class Result:
+    """Outcome of solve(): a status, the solution if any, and the run metrics.
+
+    A budget_exhausted result names the limit hit in `reason` and carries
+    the best solution found so far, if the algorithm keeps one (anytime)
+    and None otherwise. An unsupported_goal result says in `reason` why
+    the algorithm cannot reach the goal. `optimal` is true only for a
+    solved result from an algorithm that guarantees it, or from one that
+    reports proving it (anytime, when it finishes its last pass).
+    """
+
+    def __init__(self, status, solution=None, metrics=None, reason=None, optimal=False):
+        self.status = status
+        self.solution = solution
+        self.metrics = metrics
+        self.reason = reason
+        self.optimal = optimal
+
+    def to_dict(self):
+        moves = None if self.solution is None else self.solution.move_string()
+        return {
+            "status": self.status,
+            "reason": self.reason,
+            "optimal": self.optimal,
+            "moves": moves,
+            "length": None if moves is None else len(moves),
+            "metrics": self.metrics,
+        }
+
+
+# Solve one board within a budget and return a Result. `timeout` (seconds
+# from now) or `deadline` (a time.monotonic() value) bound the wall-clock
+# time, max_nodes the expansions and max_memory the process RSS in bytes;
+# solvers check them every progress interval, so algorithms that never
+# report progress reject max_nodes and max_memory. Unsolvable boards, and
+# goals the algorithm cannot reach, are answered without searching. Other
+# arguments are as for run().
+def solve(board, algorithm="ida*", goal=None, timeout=None, deadline=None, max_nodes=None,
+          max_memory=None, width=None, cancel=None, progress=None, trace_memory=False, probe=None):
+    solver = get_algorithm(algorithm)
+    if not solver.reports_progress and (max_nodes is not None or max_memory is not None):
+        raise ValueError(f"{algorithm} cannot enforce a node or memory budget")
+    geometry = geometry_of(to_rows(board, width) if width is not None and not is_nested(board) else board)
+    error = solver.goal_error(goal, geometry)
+    if error is not None:
+        return Result(UNSUPPORTED, reason=error)
+    if not get_relabeling(goal, geometry).solvable(board):
+        return Result(UNSOLVABLE)
+    budget = Budget(deadline, max_nodes, max_memory, timeout, cancel, progress)
+    solution, metrics = run(board, algorithm, goal, budget, budget.progress, trace_memory, probe, width)
+    # A solver that returns a solution finished its search, unless it is an
+    # anytime solver handing back its best so far
+    if solution is None or (budget.exhausted and not metrics.get("optimal", True)):
+        if budget.exhausted:
+            return Result(EXHAUSTED, solution, metrics, budget.exhausted)
+        return Result(UNSOLVABLE, None, metrics)
+    return Result(SOLVED, solution, metrics, optimal=metrics.get("optimal", solver.optimal))
+
+
+# Peak resident set size of this process in bytes
+def peak_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux reports KiB
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve sliding puzzles with any registered algorithm.")
+    parser.add_argument("--algo", default="ida*", choices=list(ALGORITHMS),
+                        help="search algorithm (default: ida*)")
+    parser.add_argument("--goal", help="goal board in puzzle format (default: 1, 2, ..., 0)")
+    parser.add_argument("--board", help="board to solve, as nine digits or comma-separated tiles")
+    parser.add_argument("--width", type=int, help="tiles per row, for boards that are not square")
+    parser.add_argument("--input", help="file of boards, one per line ('-' for stdin)")
+    parser.add_argument("--output", help="solution file for --input (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --input (default: all cores)")
+    parser.add_argument("--cache", help="sqlite file caching solutions across runs")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="measure peak Python allocation per solve (slower)")
+    parser.add_argument("--probe", action="store_true",
+                        help="instrument a --board solve and print the probe counters")
+    parser.add_argument("--sample", type=int, default=0, metavar="N",
+                        help="with --probe, record every Nth expanded state")
+    parser.add_argument("--timeout", type=float, help="give up on a board after this many seconds")
+    parser.add_argument("--max-nodes", type=int, help="give up on a board after this many expansions")
+    parser.add_argument("--max-memory", type=float, metavar="MB",
+                        help="give up on a board once the process uses this much memory")
+    parser.add_argument("--list", action="store_true", help="list the algorithms and exit")
+    args = parser.parse_args(argv)
+    budget = {"timeout": args.timeout, "max_nodes": args.max_nodes,
+              "max_memory": None if args.max_memory is None else int(args.max_memory * 2 ** 20)}
+
+    if args.list:
+        for algorithm in ALGORITHMS.values():
+            notes = "optimal" if algorithm.optimal else "not optimal"
+            notes += ", any size" if algorithm.any_size else ", 3x3 only"
+            if not algorithm.any_goal:
+                notes += ", corner-blank goals only"
+            if algorithm.instrumented:
+                notes += ", instrumented"
+            print(f"{algorithm.name:14} {algorithm.description} ({notes})")
+        return
+
+    if args.probe and not ALGORITHMS[args.algo].instrumented:
+        parser.error(f"--probe is not supported by {args.algo}")
+    if not ALGORITHMS[args.algo].reports_progress and (args.max_nodes or args.max_memory):
+        parser.error(f"--max-nodes and --max-memory are not supported by {args.algo}")
+    goal = parse_board(args.goal) if args.goal else None
+    if args.input:
+        import batch  # Imported lazily: batch itself imports this module
+        totals = {}
+        source = sys.stdin if args.input == "-" else open(args.input)
+        sink = open(args.output, "w") if args.output else sys.stdout
+        try:
+            for line in batch.solve_stream(source, args.algo, args.workers, cache_path=args.cache,
+                                           goal=goal, totals=totals, width=args.width, budget=budget):
+                sink.write(line + "\n")
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+        print(json.dumps(totals), file=sys.stderr)
+        return
+
+    if args.board:
+        board = parse_board(args.board)
+    else:
+        print("Enter the initial state row by row (use 0 for the empty space):")
+        board = [int(tile) for _ in range(3) for tile in input().split()]
+
+    geometry = geometry_of(board, args.width)
+    if geometry is not DEFAULT and not ALGORITHMS[args.algo].any_size:
+        parser.error(f"{args.algo} only solves 3x3 boards")
+    probe = Probe(sample_every=args.sample) if args.probe else None
+    result = solve(board, args.algo, goal, width=args.width, trace_memory=args.trace_memory, probe=probe,
+                   **budget)
+    if result.status == UNSUPPORTED:
+        parser.error(result.reason)
+    if result.status == UNSOLVABLE:
+        print(format_solution(board, None))
+    elif result.solution is None:
+        print(format_solution(board, None, solved=False))
+    else:
+        print(format_solution(board, result.solution.move_string()))
+    if result.metrics is not None:
+        print(json.dumps(dict(result.metrics, status=result.status, reason=result.reason,
+                              optimal=result.optimal)), file=sys.stderr)
+    if probe is not None:
+        print(json.dumps(probe.summary()), file=sys.stderr)
+        for expansion, depth, state in probe.trace:
+            tiles = state if isinstance(state, list) else geometry.unpack(state)
+            print(f"sample {expansion} depth {depth} {format_board(tiles)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
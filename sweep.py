@@ -0,0 +1,163 @@
+# Level-synchronous BFS over a whole state space, or the first layers of one.
+#
+# Each layer is held as one (N, size) uint8 board array and expanded with a
+# single vectorized.children() call. Moves that undo the move into a board
+# are dropped, every child is keyed by its permutation rank, and the layer
+# is deduplicated with np.unique and filtered against the visited set, so
+# no Python code runs per state. Up to BITMAP_MAX_SIZE squares the visited
+# set is a bitmap with one bit per permutation (45 KB for the 8-puzzle);
+# larger boards keep a sorted array of the ranks seen, which suits partial
+# sweeps bounded by max_depth or max_states.
+#
+# Boards are rows rather than packed ints because a packed 4x4 state needs
+# more than 64 bits with its blank index; the rank is the compact key.
+#
+# Examples:
+#     python sweep.py --width 3
+#     python sweep.py --width 4 --max-depth 20
+#     python generator.py --count 100000 --depth 20 | python sweep.py --check -
+
+import argparse
+import math
+import sys
+import time
+import numpy as np
+from puzzlestate import DEFAULT, OPPOSITE, geometry, geometry_of
+from puzzleio import parse_board, read_puzzles
+from vectorized import to_array, ranks, children
+
+BITMAP_MAX_SIZE = 12  # 12! bits is 60 MB; 13! would be 780 MB
+UNREACHED = 255
+NO_MOVE = 255
+
+
+class Bitmap:
+    """Visited set with one bit per permutation rank."""
+
+    def __init__(self, size):
+        self.bits = np.zeros((math.factorial(size) + 7) // 8, dtype=np.uint8)
+
+    def contains(self, keys):
+        return (self.bits[keys >> 3] >> (keys & 7).astype(np.uint8)) & 1 == 1
+
+    def add(self, keys):
+        np.bitwise_or.at(self.bits, keys >> 3, (1 << (keys & 7)).astype(np.uint8))
+
+
+class SortedKeys:
+    """Visited set as a sorted int64 array of ranks, for boards too big for a Bitmap."""
+
+    def __init__(self):
+        self.keys = np.zeros(0, dtype=np.int64)
+
+    def contains(self, keys):
+        index = np.searchsorted(self.keys, keys)
+        found = np.zeros(len(keys), dtype=bool)
+        inside = index < len(self.keys)
+        found[inside] = self.keys[index[inside]] == keys[inside]
+        return found
+
+    # `keys` must be sorted, unique and new
+    def add(self, keys):
+        self.keys = np.insert(self.keys, np.searchsorted(self.keys, keys), keys)
+
+
+def visited_set(geometry):
+    return Bitmap(geometry.size) if geometry.size <= BITMAP_MAX_SIZE else SortedKeys()
+
+
+# BFS from `starts` (boards, packed states or an array; by default the
+# goal), yielding (depth, boards) for every layer: the distinct boards
+# first reached at that depth. Stops after max_depth, or after the first
+# layer that brings the states visited to max_states.
+def layers(starts=None, geometry=DEFAULT, max_depth=None, max_states=None):
+    starts = [geometry.goal] if starts is None else starts
+    frontier = to_array(starts, geometry)
+    keys, first = np.unique(ranks(frontier), return_index=True)
+    frontier = frontier[first]
+    came_by = np.full(len(frontier), NO_MOVE, dtype=np.uint8)  # Move into each board
+    undo = np.full(NO_MOVE + 1, NO_MOVE, dtype=np.uint8)  # Move that undoes each move
+    undo[:len(OPPOSITE)] = OPPOSITE
+    visited = visited_set(geometry)
+    visited.add(keys)
+    total = len(frontier)
+    depth = 0
+    while len(frontier):
+        yield depth, frontier
+        if depth == max_depth or (max_states is not None and total >= max_states):
+            return
+        boards, parents, moves = children(frontier, geometry)
+        keep = moves != undo[came_by[parents]]
+        boards, moves = boards[keep], moves[keep]
+        keys, first = np.unique(ranks(boards), return_index=True)
+        new = ~visited.contains(keys)
+        keys, first = keys[new], first[new]
+        visited.add(keys)
+        frontier, came_by = boards[first], moves[first]
+        total += len(frontier)
+        depth += 1
+
+
+# Number of states at each depth from `starts`, as a list indexed by depth
+def depth_histogram(starts=None, geometry=DEFAULT, max_depth=None, max_states=None):
+    return [len(layer) for _, layer in layers(starts, geometry, max_depth, max_states)]
+
+
+# Distance from the goal of every permutation, as a uint8 array indexed by
+# rank (UNREACHED for the other parity). Needs a Bitmap-sized board.
+def distance_table(goal=None, geometry=DEFAULT):
+    if geometry.size > BITMAP_MAX_SIZE:
+        raise ValueError(f"A full {geometry.width}x{geometry.height} table does not fit in memory")
+    table = np.full(math.factorial(geometry.size), UNREACHED, dtype=np.uint8)
+    for depth, layer in layers(None if goal is None else [goal], geometry):
+        table[ranks(layer)] = depth
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep a sliding-puzzle state space breadth-first.")
+    parser.add_argument("--width", type=int, default=3, help="tiles per row (default: %(default)s)")
+    parser.add_argument("--height", type=int, help="rows (default: the width)")
+    parser.add_argument("--goal", help="board to sweep from, in puzzle format (default: 1, 2, ..., 0)")
+    parser.add_argument("--max-depth", type=int, help="stop after this many layers")
+    parser.add_argument("--max-states", type=int, help="stop once this many states are visited")
+    parser.add_argument("--check", metavar="FILE",
+                        help="report the optimal lengths of the boards in FILE ('-' for stdin) instead")
+    args = parser.parse_args(argv)
+
+    board_geometry = geometry(args.width, args.height)
+    goal = parse_board(args.goal) if args.goal else None
+    if goal is not None and geometry_of(goal, args.width) is not board_geometry:
+        parser.error(f"The goal is not a {board_geometry.width}x{board_geometry.height} board")
+
+    started = time.perf_counter()
+    if args.check:
+        source = sys.stdin if args.check == "-" else open(args.check)
+        try:
+            boards = to_array(list(read_puzzles(source)), board_geometry)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        try:
+            depths = distance_table(goal, board_geometry)[ranks(boards)]
+        except ValueError as e:
+            parser.error(str(e))
+        values, counts = np.unique(depths, return_counts=True)
+        histogram = {int(v): int(c) for v, c in zip(values, counts)}
+        unreachable = histogram.pop(UNREACHED, 0)
+    else:
+        histogram = dict(enumerate(depth_histogram(None if goal is None else [goal], board_geometry,
+                                                   args.max_depth, args.max_states)))
+        unreachable = 0
+    elapsed = time.perf_counter() - started
+
+    for depth, count in histogram.items():
+        print(f"{depth:3d} {count:12d}")
+    if unreachable:
+        print(f"unreachable {unreachable}")
+    print(f"{sum(histogram.values())} states, max depth {max(histogram, default=0)}, {elapsed:.2f} s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import pytest
+from puzzlestate import GOAL, neighbours, pack
+from heuristics import HEURISTICS, make_heuristic
+from astar import astar
+
+# Boards with their optimal solution lengths
+CASES = [
+    ([1, 8, 3, 4, 2, 6, 7, 5, 0], 14),
+    ([7, 2, 4, 5, 0, 6, 8, 3, 1], 20),
+    ([5, 2, 8, 4, 1, 7, 0, 3, 6], 22),
+]
+HARDEST = [8, 6, 7, 2, 5, 4, 3, 0, 1]  # 31 moves, the most any 8-puzzle needs
+
+
+def assert_path(path, start):
+    assert path[0] == start
+    assert pack(path[-1]) == GOAL
+    for before, after in zip(path, path[1:]):
+        assert pack(after) in [state for _, state in neighbours(pack(before))]
+
+
+@pytest.mark.parametrize("heuristic", sorted(HEURISTICS))
+@pytest.mark.parametrize("board, length", CASES)
+def test_astar_is_optimal(board, length, heuristic):
+    path = astar(board, heuristic=heuristic)
+    assert_path(path, board)
+    assert len(path) - 1 == length
+
+
+def test_astar_keeps_the_board_shape():
+    rows = [[7, 2, 4], [5, 0, 6], [8, 3, 1]]
+    path = astar(rows, heuristic="linear_conflict")
+    assert path[0] == rows and path[-1] == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+
+
+def test_astar_hardest_board():
+    assert len(astar(HARDEST, heuristic="pdb")) - 1 == 31
+
+
+def test_astar_unsolvable():
+    assert astar([1, 2, 3, 4, 5, 6, 8, 7, 0], heuristic="pdb") is None
+
+
+@pytest.mark.parametrize("heuristic", sorted(HEURISTICS))
+def test_heuristics_are_admissible(heuristic):
+    h = make_heuristic(heuristic, GOAL)
+    assert h(GOAL) == 0
+    for board, length in CASES + [(HARDEST, 31)]:
+        assert 0 < h(pack(board)) <= length
+
+
+def test_linear_conflict_dominates_manhattan():
+    manhattan = make_heuristic("manhattan", GOAL)
+    conflict = make_heuristic("linear_conflict", GOAL)
+    for board, _ in CASES + [(HARDEST, 31)]:
+        assert conflict(pack(board)) >= manhattan(pack(board))
+    swapped = pack([2, 1, 3, 4, 5, 6, 7, 8, 0])
+    assert conflict(swapped) == manhattan(swapped) + 2
+
+
+def test_unknown_heuristic():
+    with pytest.raises(ValueError):
+        make_heuristic("euclid", GOAL)
@@ -0,0 +1,55 @@
+import pytest
+from puzzleio import replay
+from batch import solve_stream
+
+LINES = [
+    "# one board per line\n",
+    "123456780\n",
+    "\n",
+    "1 8 3 4 2 6 7 5 0\n",
+    "123456870\n",
+    "724506831\n",
+]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_stream_keeps_input_order(workers):
+    lines = list(solve_stream(LINES, "astar", workers=workers, chunksize=1))
+    assert lines[0] == "123456780 0"
+    board, length, moves = lines[1].split()
+    assert (board, length, len(moves)) == ("183426750", "14", 14)
+    assert list(replay([1, 8, 3, 4, 2, 6, 7, 5, 0], moves))[-1] == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert lines[2] == "123456870 unsolvable"
+    assert lines[3].split()[:2] == ["724506831", "20"]
+
+
+def test_algorithms_agree_on_lengths():
+    lengths = {algorithm: [line.split()[1] for line in solve_stream(LINES, algorithm, workers=1)]
+               for algorithm in ("bidirectional", "ida*", "astar")}
+    assert lengths["bidirectional"] == lengths["ida*"] == lengths["astar"] == ["0", "14", "unsolvable", "20"]
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        list(solve_stream(LINES, "dijkstra"))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bad_lines_are_answered_in_order(workers):
+    totals = {}
+    lines = list(solve_stream(["123456708\n", "12345678x\n", "1 2 3\n", "1,2,3,4,5,0\n", "123456780\n"],
+                              "ida*", workers=workers, chunksize=2, totals=totals))
+    assert lines[0] == "123456708 1 R"
+    assert lines[1].startswith("# error line 2: Not a sliding-puzzle board")
+    assert lines[2].startswith("# error line 3: ")
+    assert lines[3] == "# error 123450: A flat board of 6 tiles needs a width"
+    assert lines[4] == "123456780 0"
+    assert totals["errors"] == 3 and totals["boards"] == 2
+
+
+def test_unsupported_goal_is_an_error_line():
+    totals = {}
+    lines = list(solve_stream(["123456708\n"], "table", workers=1, goal=[1, 2, 3, 4, 0, 5, 6, 7, 8],
+                              totals=totals))
+    assert lines == ["# error 123456708: table only supports goals with the blank in a corner"]
+    assert totals["errors"] == 1
@@ -0,0 +1,43 @@
+import pytest
+from benchmark import depth_layers, find_regressions, format_summary, make_instances, run_benchmark
+from puzzle import ida_star
+
+
+def test_depth_layers_cover_the_state_space():
+    layers = depth_layers()
+    assert len(layers) == 32
+    assert sum(map(len, layers)) == 181440
+    assert [len(layer) for layer in layers[:4]] == [1, 2, 4, 8]
+    assert len(layers[31]) == 2
+
+
+def test_instances_are_reproducible_and_exact():
+    instances = make_instances((5, 12), per_band=3, seed=4)
+    assert instances == make_instances((5, 12), per_band=3, seed=4)
+    assert instances != make_instances((5, 12), per_band=3, seed=5)
+    for band, boards in instances.items():
+        assert len(boards) == 3
+        assert all(len(ida_star(board)) - 1 == band for board in boards)
+    with pytest.raises(ValueError):
+        make_instances((32,))
+
+
+def test_run_benchmark():
+    report = run_benchmark(["astar"], bands=(5,), per_band=2, repeat=1)
+    row = report["results"]["astar"]["5"]
+    assert row["instances"] == row["solved"] == 2 and row["timeouts"] == 0
+    assert "astar" in format_summary(report)
+
+
+def row(mean_time, timeouts=0):
+    return {"mean_time": mean_time, "timeouts": timeouts}
+
+
+def test_find_regressions():
+    baseline = {"results": {"ida*": {"20": row(0.100), "25": row(0.100), "31": row(0.100, timeouts=1)}}}
+    report = {"results": {"ida*": {"20": row(0.105), "25": row(0.200), "31": row(0.500)},
+                          "astar": {"20": row(1.0)}}}
+    assert find_regressions(report, baseline) == [("ida*", "25", 0.100, 0.200)]
+    assert find_regressions(report, baseline, threshold=0.01) == [("ida*", "20", 0.100, 0.105),
+                                                                  ("ida*", "25", 0.100, 0.200)]
+    assert find_regressions(report, baseline, threshold=0.01, min_delta=0.01) == [("ida*", "25", 0.100, 0.200)]
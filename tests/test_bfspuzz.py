@@ -0,0 +1,46 @@
+import pytest
+from puzzlestate import GOAL, neighbours, pack
+from bfspuzz import bfs, bidirectional_bfs
+
+CASES = [
+    ([[4, 1, 3], [2, 0, 6], [7, 5, 8]], 6),
+    ([[1, 8, 3], [4, 2, 6], [7, 5, 0]], 14),
+    ([[7, 2, 4], [5, 0, 6], [8, 3, 1]], 20),
+    ([[8, 6, 7], [2, 5, 4], [3, 0, 1]], 31),
+]
+SOLVED = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+UNSOLVABLE = [[1, 2, 3], [4, 5, 6], [8, 7, 0]]
+
+
+def assert_path(path, start):
+    assert path[0] == start
+    assert pack(path[-1]) == GOAL
+    for before, after in zip(path, path[1:]):
+        assert pack(after) in [state for _, state in neighbours(pack(before))]
+
+
+@pytest.mark.parametrize("board, length", CASES)
+def test_bfs_is_optimal(board, length):
+    path = bfs(board)
+    assert_path(path, board)
+    assert len(path) - 1 == length
+
+
+def test_bfs_stats():
+    stats = {}
+    assert bfs(UNSOLVABLE, stats) is None
+    assert stats["visited"] == 181440  # Half of the 9! boards
+    assert stats["peak_frontier"] > 1
+    assert stats["expanded"] == 181440 and stats["generated"] == 181439
+
+
+@pytest.mark.parametrize("board, length", CASES)
+def test_bidirectional_bfs_is_optimal(board, length):
+    path = bidirectional_bfs(board)
+    assert_path(path, board)
+    assert len(path) - 1 == length
+
+
+def test_bidirectional_bfs_solved_and_unsolvable():
+    assert list(bidirectional_bfs(SOLVED)) == [SOLVED]
+    assert bidirectional_bfs(UNSOLVABLE) is None
@@ -0,0 +1,67 @@
+import threading
+from budget import Budget
+import solvers
+
+HARD = [8, 6, 7, 2, 5, 4, 3, 0, 1]  # 31 moves, the farthest an 8-puzzle board can be
+FIFTEEN = [13, 2, 10, 3, 1, 12, 8, 4, 5, 0, 9, 6, 15, 14, 11, 7]
+
+
+def test_solved_within_budget():
+    result = solvers.solve(HARD, "ida*", timeout=30, max_nodes=10 ** 7)
+    assert result.status == solvers.SOLVED and result.optimal
+    assert result.reason is None and len(result.solution) - 1 == 31
+
+
+def test_node_budget():
+    result = solvers.solve(HARD, "bfs", max_nodes=5000)
+    assert result.status == solvers.EXHAUSTED and result.reason == "nodes"
+    # The budget trips at a progress report and the search stops at that same check
+    assert result.solution is None and result.metrics["expanded"] <= 5000 + 4096
+
+
+def test_deadline():
+    result = solvers.solve(HARD, "bfs", timeout=1e-9)
+    assert result.status == solvers.EXHAUSTED and result.reason == "deadline"
+
+
+def test_outside_cancel():
+    cancel = threading.Event()
+    cancel.set()
+    result = solvers.solve(HARD, "bfs", cancel=cancel)
+    assert result.status == solvers.EXHAUSTED and result.reason == "cancelled"
+
+
+def test_anytime_keeps_its_best_solution():
+    result = solvers.solve(FIFTEEN, "anytime", max_nodes=20000)
+    assert result.status == solvers.EXHAUSTED and result.reason == "nodes"
+    assert result.solution is not None and not result.optimal
+    assert list(result.solution)[-1] == list(range(1, 16)) + [0]
+
+
+def test_unsolvable_board_is_not_searched():
+    result = solvers.solve([2, 1, 3, 4, 5, 6, 7, 8, 0], "ida*")
+    assert result.status == solvers.UNSOLVABLE and result.metrics is None
+
+
+def test_budget_trips_once_and_stays_tripped():
+    budget = Budget(max_nodes=100)
+    budget.progress(0, 50)
+    assert not budget.is_set()
+    budget.progress(0, 100)
+    assert budget.is_set() and budget.exhausted == "nodes"
+    budget.progress(0, 0)
+    assert budget.exhausted == "nodes"
+
+
+def test_memory_and_forwarded_progress():
+    reports = []
+    budget = Budget(max_memory=1, progress=lambda depth, nodes: reports.append((depth, nodes)))
+    budget.progress(3, 4096)
+    assert budget.is_set() and budget.exhausted == "memory"
+    assert reports == [(3, 4096)] and budget.nodes == 4096
+
+
+def test_anytime_is_optimal_only_when_it_finishes():
+    assert not solvers.ALGORITHMS["anytime"].optimal
+    result = solvers.solve(HARD, "anytime")
+    assert result.status == solvers.SOLVED and result.optimal and len(result.solution) - 1 == 31
@@ -0,0 +1,55 @@
+import pytest
+from puzzlestate import GOAL, neighbours, pack
+from distancetable import TABLE_SIZE, UNREACHED, DistanceTable, rank
+
+CASES = [
+    ([1, 8, 3, 4, 2, 6, 7, 5, 0], 14),
+    ([7, 2, 4, 5, 0, 6, 8, 3, 1], 20),
+    ([8, 6, 7, 2, 5, 4, 3, 0, 1], 31),
+]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    table = DistanceTable(str(tmp_path_factory.mktemp("table") / "distances.bin"))
+    yield table
+    table.close()
+
+
+def test_every_solvable_state_is_reached(table):
+    assert len(table.table) == TABLE_SIZE
+    assert UNREACHED not in table.table[:]
+    assert max(table.table[:]) == 31
+
+
+def test_rank_separates_states_and_reports_parity():
+    index, solvable = rank(GOAL)
+    assert solvable and 0 <= index < TABLE_SIZE
+    seen = {index}
+    for _, state in neighbours(GOAL):
+        seen.add(rank(state)[0])
+    assert len(seen) == 3
+    assert not rank(pack([2, 1, 3, 4, 5, 6, 7, 8, 0]))[1]
+
+
+@pytest.mark.parametrize("board, length", CASES)
+def test_distance_and_solve(table, board, length):
+    assert table.distance(board) == length
+    path = table.solve(board)
+    assert path[0] == board and pack(path[-1]) == GOAL
+    assert len(path) - 1 == length
+    for before, after in zip(path, path[1:]):
+        assert pack(after) in [state for _, state in neighbours(pack(before))]
+
+
+def test_unsolvable(table):
+    board = [1, 2, 3, 4, 5, 6, 8, 7, 0]
+    assert table.distance(board) is None
+    assert table.solve(board) is None
+
+
+def test_rejects_a_file_of_the_wrong_size(tmp_path):
+    path = tmp_path / "short.bin"
+    path.write_bytes(b"\0" * 10)
+    with pytest.raises(ValueError):
+        DistanceTable(str(path))
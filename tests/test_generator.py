@@ -0,0 +1,60 @@
+import random
+import pytest
+from puzzlestate import DEFAULT, geometry
+from checkSolvability import is_solvable
+from puzzleio import parse_board
+import generator
+import puzzle
+
+
+def test_uniform_boards_are_solvable_and_seeded():
+    boards = list(generator.generate(300, seed=5, chunksize=64))
+    assert len(boards) == 300
+    assert all(sorted(board) == list(range(9)) and is_solvable(board) for board in boards)
+    assert boards == list(generator.generate(300, seed=5, chunksize=64))
+    assert boards != list(generator.generate(300, seed=6, chunksize=64))
+    assert len(set(map(tuple, boards))) > 290
+
+
+def test_random_board_covers_both_parities():
+    rng = random.Random(1)
+    for shape in (DEFAULT, geometry(4), geometry(4, 3)):
+        for solvable in (True, False):
+            for _ in range(20):
+                board = generator.random_board(rng, shape, solvable)
+                assert is_solvable(board, shape.width) == solvable
+
+
+def test_boards_reach_a_given_goal():
+    goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+    for board in generator.generate(50, goal=goal, seed=2):
+        assert is_solvable(board) == is_solvable(goal)
+    for board in generator.generate(3, depth=9, goal=goal, seed=2):
+        assert len(puzzle.ida_star(board, goal_state=goal)) - 1 == 9
+
+
+@pytest.mark.parametrize("method", generator.METHODS)
+def test_exact_depth(method):
+    for board in generator.generate(4, depth=14, seed=3, method=method):
+        assert len(puzzle.ida_star(board)) - 1 == 14
+    with pytest.raises(ValueError):
+        list(generator.generate(1, depth=32))
+
+
+def test_walk_on_the_15_puzzle():
+    for board in generator.generate(2, depth=20, seed=1, geometry=geometry(4)):
+        assert len(board) == 16
+        assert len(puzzle.ida_star(geometry(4).unpack_grid(geometry(4).pack(board)))) - 1 == 20
+
+
+def test_output_does_not_depend_on_workers():
+    single = "".join(generator.generate_text(50, seed=9, workers=1, chunksize=16))
+    pooled = "".join(generator.generate_text(50, seed=9, workers=2, chunksize=16))
+    assert single == pooled
+    boards = [parse_board(line) for line in single.splitlines()]
+    assert boards == list(generator.generate(50, seed=9, chunksize=16))
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        list(generator.generate(1, depth=3, method="guess"))
@@ -0,0 +1,80 @@
+import random
+import pytest
+from puzzlestate import DEFAULT, flatten, geometry, geometry_of, pack, to_rows
+from checkSolvability import is_solvable
+import solvers
+
+
+# Board reached by `steps` random moves of the blank from the goal
+def walk(geometry, steps, seed):
+    rng = random.Random(seed)
+    state = geometry.goal
+    for _ in range(steps):
+        state = rng.choice(geometry.neighbours(state))[1]
+    return geometry.unpack(state)
+
+
+def test_geometries_are_shared_and_sized():
+    assert geometry(3) is DEFAULT is geometry(3, 3)
+    assert geometry_of([[1, 2, 3, 4], [5, 6, 7, 0]]) is geometry(4, 2)
+    assert geometry_of(list(range(16))) is geometry(4)
+    assert geometry_of(list(range(12)), 4) is geometry(4, 3)
+    with pytest.raises(ValueError):
+        geometry_of(list(range(12)))
+    assert geometry(4).bits == 4 and geometry(5).bits == 5
+    assert geometry(4).max_depth == 80
+
+
+@pytest.mark.parametrize("width, height", [(2, 2), (3, 3), (4, 3), (4, 4), (5, 5)])
+def test_pack_round_trip(width, height):
+    shape = geometry(width, height)
+    board = walk(shape, 30, width * height)
+    state = shape.pack(board)
+    assert shape.unpack(state) == board
+    assert shape.unpack_grid(state) == to_rows(board, width)
+    assert shape.blank_index(state) == board.index(0)
+    assert flatten(to_rows(board, width)) == board
+
+
+def test_packed_15_puzzle_needs_68_bits():
+    shape = geometry(4)
+    assert shape.blank_shift == 64
+    assert shape.goal.bit_length() == 68  # Blank index 15 above 64 bits of tiles
+    assert pack(to_rows(shape.goal_tiles, 4)) == shape.goal
+
+
+def test_moves_stay_on_the_board():
+    shape = geometry(4, 3)
+    assert [len(entries) for entries in shape.slides] == [2, 3, 3, 2, 3, 4, 4, 3, 2, 3, 3, 2]
+    corner = shape.goal
+    assert shape.apply_move(corner, 1) is None and shape.apply_move(corner, 3) is None
+    up = shape.apply_move(corner, 0)
+    assert shape.move_between(corner, up) == 0
+    assert shape.unpack(up)[7] == 0
+
+
+@pytest.mark.parametrize("width, height", [(3, 3), (4, 4), (4, 3), (3, 4)])
+def test_solvability_follows_the_parity_rule(width, height):
+    shape = geometry(width, height)
+    board = walk(shape, 41, 7)
+    assert is_solvable(board, width) and is_solvable(to_rows(board, width))
+    swapped = list(board)
+    first, second = [i for i, tile in enumerate(swapped) if tile][:2]
+    swapped[first], swapped[second] = swapped[second], swapped[first]
+    assert not is_solvable(swapped, width)
+
+
+@pytest.mark.parametrize("algorithm", ["ida*", "astar"])
+def test_any_size_solvers(algorithm):
+    board = to_rows(walk(geometry(4), 30, 3), 4)
+    solution, metrics = solvers.run(board, algorithm)
+    assert list(solution)[0] == board and list(solution)[-1] == to_rows(geometry(4).goal_tiles, 4)
+    assert metrics["length"] == solvers.run(board, "ida*")[1]["length"]
+    flat = walk(geometry(4, 3), 20, 5)
+    assert list(solvers.run(flat, algorithm, width=4)[0])[-1] == to_rows(geometry(4, 3).goal_tiles, 4)
+
+
+@pytest.mark.parametrize("algorithm", ["bfs", "bidirectional", "table"])
+def test_3x3_only_solvers_reject_other_sizes(algorithm):
+    with pytest.raises(ValueError):
+        solvers.run(to_rows(geometry(4).goal_tiles, 4), algorithm)
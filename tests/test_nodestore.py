@@ -0,0 +1,50 @@
+from puzzlestate import DEFAULT, geometry
+from nodestore import NO_MOVE, NO_PARENT, NodeStore
+from puzzleids import dls
+
+
+def test_paths_are_rebuilt_from_parent_handles():
+    nodes = NodeStore()
+    root = nodes.add(DEFAULT.pack([1, 2, 3, 4, 0, 6, 7, 5, 8]))
+    down = nodes.add(DEFAULT.apply_move(nodes.states[root], 1), root, 1, 1)
+    nodes.add(DEFAULT.apply_move(nodes.states[root], 0), root, 0, 1)  # A sibling
+    right = nodes.add(DEFAULT.apply_move(nodes.states[down], 3), down, 3, 2)
+    assert len(nodes) == 4
+    assert (nodes.parents[root], nodes.moves[root]) == (NO_PARENT, NO_MOVE)
+    assert nodes.path_moves(right) == [1, 3] and nodes.root(right) == root
+    solution = nodes.solution(right)
+    assert solution.move_string() == "DR" and list(solution)[-1] == DEFAULT.goal_tiles
+    assert nodes.solution(right, nested=True)[-1] == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+
+
+def test_truncate_drops_finished_subtrees():
+    nodes = NodeStore()
+    for depth in range(5):
+        nodes.add(DEFAULT.goal, depth - 1 if depth else NO_PARENT, 0 if depth else NO_MOVE, depth)
+    nodes.truncate(2)
+    assert len(nodes) == len(nodes.states) == len(nodes.moves) == len(nodes.depths) == 2
+    assert nodes.add(DEFAULT.goal, 1, 2, 2) == 2
+
+
+def test_states_above_64_bits_use_a_list():
+    assert NodeStore(DEFAULT).states.typecode == "Q"
+    big = NodeStore(geometry(4))
+    assert isinstance(big.states, list)
+    big.add(geometry(4).goal)
+    assert big.states[0].bit_length() == 68
+
+
+def test_dls_returns_the_stored_path():
+    board = [1, 2, 3, 4, 0, 6, 7, 5, 8]
+    counts = [0, 0, 0]
+    assert dls(board, DEFAULT.goal_tiles, 1, counts) is None
+    solution = dls(board, DEFAULT.goal_tiles, 2, counts)
+    assert solution.move_string() == "DR"
+    assert counts[0] > 0 and counts[2] > 0
+
+
+def test_dls_keeps_the_start_shape():
+    board = [[1, 2, 3], [4, 0, 6], [7, 5, 8]]
+    solution = dls(board, DEFAULT.goal_tiles, 2)
+    assert list(solution)[0] == board and list(solution)[-1] == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    assert list(dls([1, 2, 3, 4, 0, 6, 7, 5, 8], DEFAULT.goal_tiles, 2))[0] == [1, 2, 3, 4, 0, 6, 7, 5, 8]
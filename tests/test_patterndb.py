@@ -0,0 +1,60 @@
+import pytest
+from puzzlestate import DEFAULT, geometry
+from heuristics import manhattan_table
+from patterndb import PatternDatabase, PatternTable, check_admissible, table_path
+
+
+@pytest.fixture(scope="module")
+def directory(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("pdb"))
+
+
+def test_zero_at_the_goal_and_at_least_manhattan(directory):
+    database = PatternDatabase(directory=directory)
+    assert database(DEFAULT.goal) == 0
+    distance = manhattan_table(DEFAULT.goal)
+    state = DEFAULT.pack([8, 6, 7, 2, 5, 4, 3, 0, 1])
+    manhattan = sum(distance[i][tile] for i, tile in enumerate(DEFAULT.unpack(state)))
+    assert manhattan <= database(state) <= 31
+    assert database.verify() == []
+    database.close()
+
+
+@pytest.mark.parametrize("width, height, patterns", [(3, 3, None), (4, 3, [(1, 2, 3, 4), (5, 6, 7, 8), (9, 10, 11)])])
+def test_admissible(directory, width, height, patterns):
+    database = PatternDatabase(geometry=geometry(width, height), patterns=patterns, directory=directory)
+    assert check_admissible(database, boards=10, walk=30) == []
+    database.close()
+
+
+def test_other_goals_get_their_own_tables(directory):
+    goal = DEFAULT.pack([0, 1, 2, 3, 4, 5, 6, 7, 8])
+    database = PatternDatabase(goal, directory=directory)
+    assert database(goal) == 0 and database(DEFAULT.goal) > 0
+    assert table_path(DEFAULT, goal, (1, 2, 3, 4), directory) != table_path(DEFAULT, DEFAULT.goal, (1, 2, 3, 4),
+                                                                                 directory)
+    database.close()
+
+
+def test_corrupt_and_truncated_tables(tmp_path):
+    PatternDatabase(directory=str(tmp_path)).close()
+    path = table_path(DEFAULT, DEFAULT.goal, (1, 2, 3, 4), str(tmp_path))
+    with open(path, "r+b") as f:
+        f.seek(-1, 2)
+        last = f.read(1)[0]
+        f.seek(-1, 2)
+        f.write(bytes([last ^ 0xFF]))
+    database = PatternDatabase(directory=str(tmp_path))
+    assert database.verify() == [[1, 2, 3, 4]]
+    database.close()
+    with open(path, "r+b") as f:
+        f.truncate(100)
+    with pytest.raises(ValueError):
+        PatternTable(path)
+
+
+def test_bad_patterns_and_missing_tables(tmp_path):
+    with pytest.raises(ValueError):
+        PatternDatabase(patterns=[(1, 2, 3), (3, 4)], directory=str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        PatternDatabase(directory=str(tmp_path), build=False)
@@ -0,0 +1,47 @@
+import pytest
+from puzzlestate import GOAL, neighbours, pack
+from puzzle import ida_star, is_solvable, iterative_deepening_search
+
+# Boards with their optimal solution lengths
+CASES = [
+    ([[1, 8, 3], [4, 2, 6], [7, 5, 0]], 14),
+    ([[7, 2, 4], [5, 0, 6], [8, 3, 1]], 20),
+    ([[8, 6, 7], [2, 5, 4], [3, 0, 1]], 31),
+]
+
+
+def assert_path(path, start):
+    assert path[0] == start
+    assert pack(path[-1]) == GOAL
+    for before, after in zip(path, path[1:]):
+        assert pack(after) in [state for _, state in neighbours(pack(before))]
+
+
+@pytest.mark.parametrize("board, length", CASES)
+def test_ida_star_is_optimal(board, length):
+    path = ida_star(board)
+    assert_path(path, board)
+    assert len(path) - 1 == length
+
+
+def test_ida_star_solved_board():
+    assert list(ida_star([[1, 2, 3], [4, 5, 6], [7, 8, 0]])) == [[[1, 2, 3], [4, 5, 6], [7, 8, 0]]]
+
+
+def test_iterative_deepening_is_optimal():
+    board, length = CASES[0]
+    path = iterative_deepening_search(board)
+    assert_path(path, board)
+    assert len(path) - 1 == length
+
+
+def test_iterative_deepening_gives_up_at_max_depth():
+    board, length = CASES[1]
+    assert iterative_deepening_search(board, max_depth=length - 8) is None
+
+
+def test_is_solvable():
+    assert is_solvable([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    assert not is_solvable([[1, 2, 3], [4, 5, 6], [8, 7, 0]])
+    for board, _ in CASES:
+        assert is_solvable(board)
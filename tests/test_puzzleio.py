@@ -0,0 +1,51 @@
+import io
+import pytest
+from puzzleio import (format_solution, moves_from_path, parse_board, read_puzzles, read_solutions, replay,
+                      write_puzzle, write_solution)
+
+BOARD = [1, 2, 3, 4, 0, 6, 7, 5, 8]
+
+
+def test_parse_board():
+    assert parse_board("123456780") == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert parse_board(" 1 2 3 4 5 6 7 8 0 ") == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert parse_board("# comment") is None
+    assert parse_board("   ") is None
+    with pytest.raises(ValueError):
+        parse_board("123456789")
+
+
+def test_puzzles_round_trip():
+    out = io.StringIO()
+    write_puzzle(out, BOARD)
+    write_puzzle(out, [1, 2, 3, 4, 5, 6, 7, 8, 0])
+    assert out.getvalue() == "123406758\n123456780\n"
+    assert list(read_puzzles(io.StringIO("# header\n\n" + out.getvalue()))) == [BOARD, [1, 2, 3, 4, 5, 6, 7, 8, 0]]
+
+
+def test_moves_from_path_and_replay():
+    path = [BOARD, [1, 2, 3, 4, 5, 6, 7, 0, 8], [1, 2, 3, 4, 5, 6, 7, 8, 0]]
+    assert moves_from_path(path) == "DR"
+    assert list(replay(BOARD, "DR")) == path
+    with pytest.raises(ValueError):
+        moves_from_path([BOARD, [1, 2, 3, 4, 5, 6, 7, 8, 0]])
+    with pytest.raises(ValueError):
+        list(replay([0, 1, 2, 3, 4, 5, 6, 7, 8], "U"))
+
+
+def test_solutions_round_trip():
+    out = io.StringIO()
+    write_solution(out, BOARD, "DR")
+    write_solution(out, [1, 2, 3, 4, 5, 6, 7, 8, 0], "")
+    write_solution(out, [1, 2, 3, 4, 5, 6, 8, 7, 0], None)
+    write_solution(out, BOARD, None, solved=False)
+    assert out.getvalue().splitlines() == ["123406758 2 DR", "123456780 0", "123456870 unsolvable",
+                                           "123406758 unsolved"]
+    assert format_solution(BOARD, "DR") == "123406758 2 DR"
+    assert list(read_solutions(io.StringIO(out.getvalue()))) == [
+        (BOARD, "DR"), ([1, 2, 3, 4, 5, 6, 7, 8, 0], ""), ([1, 2, 3, 4, 5, 6, 8, 7, 0], None), (BOARD, None)]
+
+
+def test_solution_line_without_moves():
+    with pytest.raises(ValueError, match="Not a solution line"):
+        list(read_solutions(io.StringIO("123406758 2 DR\n123406758\n")))
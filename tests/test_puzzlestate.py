@@ -0,0 +1,37 @@
+from puzzlestate import (BLANK_SHIFT, MOVE_TABLE, OPPOSITE, SLIDES, apply_move, blank_index, neighbours,
+                         pack, tile_at, unpack, unpack_grid)
+
+BOARD = [[1, 2, 3],
+         [4, 0, 6],
+         [7, 5, 8]]
+FLAT = [1, 2, 3, 4, 0, 6, 7, 5, 8]
+
+
+def test_pack_round_trip():
+    state = pack(BOARD)
+    assert state == pack(FLAT)
+    assert unpack(state) == FLAT
+    assert unpack_grid(state) == BOARD
+    assert blank_index(state) == 4
+    assert state >> BLANK_SHIFT == 4
+    assert [tile_at(state, i) for i in range(9)] == FLAT
+
+
+def test_moves_match_the_board():
+    state = pack(BOARD)
+    up = apply_move(state, 0)
+    assert unpack(up) == [1, 0, 3, 4, 2, 6, 7, 5, 8]
+    assert blank_index(up) == 1
+    assert apply_move(up, OPPOSITE[0]) == state
+    assert apply_move(up, 0) is None  # The blank is already on the top row
+
+
+def test_slides_cover_every_legal_move():
+    assert [len(entries) for entries in SLIDES] == [2, 3, 2, 3, 4, 3, 2, 3, 2]
+    for blank, entries in enumerate(SLIDES):
+        for entry in entries:
+            assert MOVE_TABLE[blank][entry[0]] == entry[1]
+    corner = pack([0, 1, 2, 3, 4, 5, 6, 7, 8])
+    assert sorted(move for move, _ in neighbours(corner)) == [1, 3]
+    assert apply_move(corner, 0) is None
+    assert apply_move(corner, 2) is None
@@ -0,0 +1,61 @@
+import random
+import pytest
+from puzzlestate import geometry, flatten, to_rows
+from puzzleio import replay
+from checkSolvability import is_solvable
+from relabel import get_relabeling
+import astar
+import generator
+import solvers
+
+GEOMETRIES = [geometry(3), geometry(2, 3), geometry(3, 2), geometry(4, 2)]
+
+
+@pytest.mark.parametrize("board_geometry", GEOMETRIES, ids=repr)
+def test_relabeled_solutions_reach_the_original_goal(board_geometry):
+    rng = random.Random(1)
+    for _ in range(20):
+        goal = generator.random_board(rng, board_geometry, solvable=rng.random() < 0.5)
+        relabeling = get_relabeling(goal, board_geometry)
+        board = generator.random_board(rng, board_geometry, solvable=is_solvable(goal, board_geometry.width))
+        assert relabeling.solvable(board)
+        assert relabeling.board(goal) == relabeling.canonical
+        assert relabeling.unlabel(relabeling.board(board)) == board
+
+        width = board_geometry.width
+        found = astar.astar(to_rows(relabeling.board(board), width), relabeling.canonical)
+        direct = astar.astar(to_rows(board, width), goal)
+        restored = relabeling.restore(found)
+        boards = list(replay(board, restored.move_string(), width))
+        assert boards[0] == board and boards[-1] == goal
+        assert len(restored) == len(direct)
+        assert relabeling.canonize(restored).move_string() == found.move_string()
+
+
+@pytest.mark.parametrize("goal", [[0, 1, 2, 3, 4, 5, 6, 7, 8], [8, 7, 6, 5, 4, 3, 2, 1, 0],
+                                  [2, 1, 0, 3, 4, 5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 0, 7, 8]])
+def test_corner_goals_share_the_standard_goal(goal):
+    assert get_relabeling(goal).canonical == geometry(3).goal_tiles
+
+
+def test_centre_goal_keeps_its_blank_square():
+    relabeling = get_relabeling([1, 2, 3, 4, 0, 5, 6, 7, 8])
+    assert relabeling.canonical == [1, 2, 3, 4, 0, 5, 6, 7, 8]
+    assert relabeling.identity
+
+
+def test_solvability_is_relative_to_the_goal():
+    relabeling = get_relabeling([2, 1, 3, 4, 5, 6, 7, 8, 0])
+    assert not relabeling.solvable([1, 2, 3, 4, 5, 6, 7, 8, 0])
+    assert relabeling.solvable([2, 1, 3, 4, 5, 6, 7, 8, 0])
+    assert flatten(relabeling.goal) == [2, 1, 3, 4, 5, 6, 7, 8, 0]
+
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ids", "ida*", "astar", "table"])
+def test_solvers_reach_any_corner_goal(algorithm):
+    goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+    board = [1, 2, 0, 3, 4, 5, 6, 7, 8]
+    result = solvers.solve(board, algorithm, goal)
+    assert result.status == solvers.SOLVED
+    assert result.solution.move_string() == "LL"
+    assert list(result.solution)[-1] == goal
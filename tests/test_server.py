@@ -0,0 +1,145 @@
+import asyncio
+import json
+import pytest
+import time
+from server import Histogram, RequestError, SolveService, solve_in_worker
+
+HARD = "867254301"  # 31 moves
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = SolveService(workers=2)
+    yield service
+    service.close()
+
+
+@pytest.mark.parametrize("board, options", [
+    ("", {}),
+    (12, {}),
+    ("123456789", {}),
+    ("12345678", {}),
+    ("123456780", {"algorithm": "dijkstra"}),
+    ("123456780", {"goal": "123"}),
+    ("123456780", {"timeout": 0}),
+    ("123456780", {"timeout": "5"}),
+    ("123456780", {"max_nodes": -1}),
+    ("123456780", {"max_nodes": 1.5}),
+    ("123456780", {"max_memory": 0}),
+    ("123456780", {"timeout": True}),
+    ("123456780", {"max_nodes": True}),
+    ("123456780", {"width": 0}),
+    ("123456780", {"width": 2}),
+    ("123456780", {"width": True}),
+    ("123456780", {"width": "3"}),
+    ("123456780", {"algorithm": "table", "max_nodes": 1000}),
+    ("123456780", {"algorithm": "table", "goal": "123405678"}),
+    ([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0], {"algorithm": "bfs"}),
+])
+def test_invalid_requests_are_rejected(service, board, options):
+    with pytest.raises(RequestError) as error:
+        service._solve_args(board, options)
+    assert error.value.status == 400
+
+
+def test_valid_requests(service):
+    assert service._solve_args("123456780", {}) == ([1, 2, 3, 4, 5, 6, 7, 8, 0], "ida*", [1, 2, 3, 4, 5, 6, 7, 8, 0],
+                                                    3, service.default_timeout, None, None)
+    board, algorithm, goal, width, timeout, max_nodes, max_memory = service._solve_args(
+        "1,2,3,4,5,6,7,8,9,10,0,11", {"width": 4, "algorithm": "astar", "timeout": 2, "max_nodes": 100,
+                                      "max_memory": 1 << 30})
+    assert (width, algorithm, timeout, max_nodes, max_memory) == (4, "astar", 2, 100, 1 << 30)
+    assert goal == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 0]
+
+
+def test_solve_in_worker_budgets():
+    goal = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    answer = solve_in_worker([1, 2, 3, 4, 5, 6, 7, 0, 8], "ida*", goal, 3, time.time() + 5, None, None)
+    assert answer["status"] == "solved" and answer["moves"] == "R" and answer["optimal"]
+    answer = solve_in_worker([8, 6, 7, 2, 5, 4, 3, 0, 1], "bfs", goal, 3, time.time() + 30, 5000, None)
+    assert (answer["status"], answer["reason"], answer["moves"]) == ("budget_exhausted", "nodes", None)
+    assert answer["metrics"]["expanded"] < 181440
+
+
+def test_route(service):
+    async def scenario():
+        status, answer = await service.route("POST", "/solve", json.dumps({"board": "123456708"}).encode())
+        assert status == 200 and answer["status"] == "solved" and answer["moves"] == "R"
+        _, answer = await service.route("POST", "/solve", b'{"board": "123456870"}')
+        assert answer["status"] == "unsolvable"
+        _, answer = await service.route("POST", "/batch", b'{"boards": ["123456780", "123456708"]}')
+        assert [result["length"] for result in answer["results"]] == [0, 1]
+        _, answer = await service.route("GET", "/algorithms", b"")
+        assert answer["ida*"]["optimal"]
+        for method, path, body, status in [("GET", "/solve", b"", 405), ("POST", "/nothing", b"", 404),
+                                           ("POST", "/solve", b"{", 400), ("POST", "/solve", b"[]", 400),
+                                           ("POST", "/solve", b"{}", 400), ("POST", "/batch", b"{}", 400)]:
+            with pytest.raises(RequestError) as error:
+                await service.route(method, path, body)
+            assert error.value.status == status
+    asyncio.run(scenario())
+
+
+def test_timeout_runs_from_arrival(service):
+    answer = asyncio.run(service.solve(HARD, {"algorithm": "bfs", "timeout": 5}, time.time() - 10))
+    assert (answer["status"], answer["reason"]) == ("budget_exhausted", "deadline")
+
+
+def test_identical_solves_are_coalesced(service):
+    async def scenario():
+        body = json.dumps({"board": HARD, "algorithm": "astar"}).encode()
+        return await asyncio.gather(*(service.route("POST", "/solve", body) for _ in range(3)))
+    answers = [answer for _, answer in asyncio.run(scenario())]
+    assert [answer["length"] for answer in answers] == [31, 31, 31]
+    assert sorted(answer["coalesced"] for answer in answers) == [False, True, True]
+
+
+def test_http_round_trip(service):
+    async def scenario():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = b'{"board": "123456708"}'
+        writer.write(b"POST /solve HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        writer.write(b"GET /metrics HTTP/1.1\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+    first, second = asyncio.run(scenario()).split(b"HTTP/1.1 ")[1:]
+    assert first.startswith(b"200 OK") and b'"moves": "R"' in first
+    assert second.startswith(b"200 OK")
+    metrics = json.loads(second.split(b"\r\n\r\n", 1)[1])
+    assert metrics["requests"] >= 2 and "/solve" in metrics["latency"]
+
+
+def test_malformed_requests_close_the_connection(service):
+    async def scenario(request):
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        writer.write(request)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+    for request in (b"POST /solve HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+                    b"NONSENSE\r\n\r\n",
+                    b"POST /solve HTTP/1.1\r\nContent-Length: ten\r\n\r\n"):
+        response = asyncio.run(scenario(request))
+        assert response.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in response
+        assert b"Malformed request" in response
+    body = b'{"board": "123456780", "algorithm": "table", "max_nodes": 10}'
+    response = asyncio.run(scenario(b"POST /solve HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s"
+                                    % (len(body), body)))
+    assert response.startswith(b"HTTP/1.1 400 ") and b"table cannot enforce max_nodes" in response
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+    assert histogram.summary() == {"count": 4, "sum": 6.05, "buckets": {"0.1": 1, "1.0": 3, "+Inf": 4}}
@@ -0,0 +1,35 @@
+import pytest
+from puzzlestate import BLANK_SHIFT, pack
+from solution import Solution
+
+BOARD = [1, 2, 3, 4, 0, 6, 7, 5, 8]
+PATH = [BOARD, [1, 2, 3, 4, 5, 6, 7, 0, 8], [1, 2, 3, 4, 5, 6, 7, 8, 0]]
+
+
+def test_behaves_like_a_list_of_boards():
+    solution = Solution.from_states(pack(board) for board in PATH)
+    assert len(solution) == 3
+    assert list(solution) == PATH
+    assert solution[0] == BOARD and solution[-1] == PATH[-1]
+    assert solution[1:] == PATH[1:]
+    with pytest.raises(IndexError):
+        solution[3]
+
+
+def test_moves_pack_four_to_a_byte():
+    moves = "DRUL" * 5 + "D"
+    solution = Solution.from_move_string(pack([1, 2, 3, 4, 0, 6, 7, 5, 8]), moves)
+    assert solution.length == 21
+    assert len(solution.packed_moves) == 6
+    assert solution.move_string() == moves
+    assert len(list(solution.states())) == 22
+    assert list(solution.states())[-1] >> BLANK_SHIFT == 7
+
+
+def test_nested_boards_and_equality():
+    flat = Solution(BOARD, [1, 3])
+    nested = Solution([[1, 2, 3], [4, 0, 6], [7, 5, 8]], [1, 3], nested=True)
+    assert flat == nested and hash(flat) == hash(nested)
+    assert nested[-1] == [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    assert flat != Solution(BOARD, [1])
+    assert repr(flat) == "Solution([1, 2, 3, 4, 0, 6, 7, 5, 8], 'DR')"
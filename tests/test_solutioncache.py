@@ -0,0 +1,83 @@
+import sqlite3
+from puzzlestate import geometry, to_rows
+from puzzle import ida_star
+from relabel import get_relabeling
+from solutioncache import SolutionCache
+import solvers
+
+BOARD = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+
+
+def test_hit_and_suffix_reuse():
+    cache = SolutionCache()
+    solution = ida_star(BOARD)
+    cache.put(solution, "ida*")
+    assert cache.get(BOARD, "ida*").move_string() == solution.move_string()
+    midway = list(solution)[5]
+    assert cache.get(midway, "ida*").move_string() == solution.move_string()[5:]
+    assert cache.stats()["hits"] == 1 and cache.stats()["suffix_hits"] == 1
+    assert cache.get(BOARD, "astar") is None
+
+
+def test_solve_calls_the_solver_once():
+    cache = SolutionCache()
+    calls = []
+
+    def solver(board):
+        calls.append(board)
+        return ida_star(board)
+    first = cache.solve(BOARD, "ida*", solver)
+    again = cache.solve([BOARD[i:i + 3] for i in (0, 3, 6)], "ida*", solver)
+    assert len(calls) == 1
+    assert again == first and again.nested
+
+
+def test_eviction_drops_suffixes():
+    cache = SolutionCache(capacity=1)
+    first = ida_star(BOARD)
+    cache.put(first, "ida*")
+    cache.put(ida_star([1, 2, 3, 4, 5, 6, 7, 0, 8]), "ida*")
+    assert cache.get(list(first)[5], "ida*") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_boards_of_different_shapes_do_not_collide():
+    # A 4-wide and a 3-wide board with the same tiles pack to the same int
+    tiles = [1, 0, 3, 4, 5, 2, 6, 8, 9, 10, 7, 11]
+    cache = SolutionCache()
+    cache.put(solvers.solve(tiles, width=4).solution, "ida*")
+    assert cache.get(to_rows(tiles, 4), "ida*").move_string() == "DRDR"
+    assert cache.get(to_rows(tiles, 3), "ida*") is None
+
+
+def test_solutions_are_shared_across_goal_conventions():
+    cache = SolutionCache()
+    solution = ida_star(BOARD)
+    cache.put(solution, "ida*")
+    goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+    board = get_relabeling(goal).unlabel(BOARD)  # The same puzzle, told the other way round
+    found = cache.get(board, "ida*", geometry(3).pack(goal))
+    assert found is not None and len(found) == len(solution)
+    assert list(found)[0] == board and list(found)[-1] == goal
+
+
+def test_sqlite_backing_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "cache.db")
+    solution = ida_star(BOARD)
+    SolutionCache(path=path).put(solution, "ida*")
+    reopened = SolutionCache(path=path)
+    assert reopened.get(BOARD, "ida*").move_string() == solution.move_string()
+    assert reopened.get(list(solution)[3], "ida*").move_string() == solution.move_string()[3:]
+    assert reopened.stats()["disk_hits"] == 1 and reopened.stats()["suffix_hits"] == 1
+
+
+def test_old_cache_files_are_recreated(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE solutions (state INTEGER, algorithm TEXT, goal INTEGER, start INTEGER,"
+               " moves BLOB, length INTEGER, offset INTEGER, PRIMARY KEY (state, algorithm, goal))")
+    db.commit()
+    db.close()
+    cache = SolutionCache(path=path)
+    cache.put(ida_star(BOARD), "ida*")
+    assert SolutionCache(path=path).get(BOARD, "ida*") is not None
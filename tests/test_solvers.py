@@ -0,0 +1,51 @@
+import threading
+import pytest
+import solvers
+
+BOARD = [1, 8, 3, 4, 2, 6, 7, 5, 0]  # 14 moves
+
+
+@pytest.mark.parametrize("algorithm", sorted(solvers.ALGORITHMS))
+def test_every_algorithm_solves_with_metrics(algorithm):
+    solution, metrics = solvers.run(BOARD, algorithm)
+    assert list(solution)[0] == BOARD and list(solution)[-1] == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert metrics["algorithm"] == algorithm
+    assert metrics["board"] == "183426750"
+    assert metrics["length"] == 14
+    assert metrics["wall_time"] >= 0 and metrics["peak_rss"] > 0
+
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ida*", "astar"])
+def test_search_counters(algorithm):
+    _, metrics = solvers.run(BOARD, algorithm, trace_memory=True)
+    assert metrics["expanded"] > 0 and metrics["generated"] >= metrics["expanded"]
+    assert metrics["peak_frontier"] > 0
+    assert metrics["peak_memory"] > 0
+
+
+def test_cancelled_search_returns_nothing():
+    cancel = threading.Event()
+    cancel.set()
+    solution, metrics = solvers.run([8, 6, 7, 2, 5, 4, 3, 0, 1], "bfs", cancel=cancel)
+    assert solution is None and metrics["length"] is None
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        solvers.get_algorithm("dijkstra")
+
+
+def test_unsupported_goal():
+    hard = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+    result = solvers.solve(hard, "table", goal=[1, 2, 3, 4, 0, 5, 6, 7, 8])
+    assert result.status == solvers.UNSUPPORTED and "corner" in result.reason
+    assert result.metrics is None
+    assert solvers.solve(hard, "table", goal=[0, 1, 2, 3, 4, 5, 6, 7, 8]).status == solvers.SOLVED
+    with pytest.raises(ValueError, match="corner"):
+        solvers.run(hard, "table", goal=[1, 2, 3, 4, 0, 5, 6, 7, 8])
+
+
+def test_budget_an_algorithm_cannot_enforce():
+    with pytest.raises(ValueError):
+        solvers.solve([8, 6, 7, 2, 5, 4, 3, 0, 1], "table", max_nodes=1000)
+    assert solvers.solve([8, 6, 7, 2, 5, 4, 3, 0, 1], "table", timeout=5).status == solvers.SOLVED
@@ -0,0 +1,57 @@
+import itertools
+import pytest
+from puzzlestate import DEFAULT, geometry
+import generator
+
+np = pytest.importorskip("numpy")
+import sweep  # noqa: E402
+from vectorized import ranks, to_array  # noqa: E402
+
+
+def test_ranks_number_every_permutation_once():
+    boards = to_array(list(itertools.permutations(range(6))), geometry(3, 2))
+    assert sorted(ranks(boards).tolist()) == list(range(720))
+    assert ranks(to_array([list(range(9))])).tolist() == [0]
+
+
+@pytest.mark.parametrize("width, height", [(3, 3), (3, 2), (2, 2)])
+def test_full_sweep_matches_the_bfs_layers(width, height):
+    shape = geometry(width, height)
+    assert sweep.depth_histogram(geometry=shape) == [len(layer) for layer in generator.depth_layers(geometry=shape)]
+
+
+def test_partial_sweep_with_sorted_keys():
+    # 4x4 boards are too big for a bitmap, so the visited set is a sorted array
+    assert isinstance(sweep.visited_set(geometry(4)), sweep.SortedKeys)
+    assert sweep.depth_histogram(geometry=geometry(4), max_depth=8) == [1, 2, 4, 10, 24, 54, 107, 212, 446]
+    assert sum(sweep.depth_histogram(geometry=geometry(4), max_states=100)) >= 100
+
+
+def test_visited_sets_agree():
+    keys = np.array([3, 17, 40, 41, 700], dtype=np.int64)
+    probe = np.array([0, 3, 40, 42, 700, 719], dtype=np.int64)
+    bitmap, sorted_keys = sweep.Bitmap(6), sweep.SortedKeys()
+    bitmap.add(keys)
+    sorted_keys.add(keys)
+    assert bitmap.contains(probe).tolist() == sorted_keys.contains(probe).tolist() == [
+        False, True, True, False, True, False]
+
+
+def test_distance_table_gives_optimal_lengths():
+    table = sweep.distance_table()
+    boards = [[1, 8, 3, 4, 2, 6, 7, 5, 0], [7, 2, 4, 5, 0, 6, 8, 3, 1], [8, 6, 7, 2, 5, 4, 3, 0, 1],
+              [1, 2, 3, 4, 5, 6, 8, 7, 0]]
+    assert table[ranks(to_array(boards))].tolist() == [14, 20, 31, sweep.UNREACHED]
+    goal = [0, 1, 2, 3, 4, 5, 6, 7, 8]
+    assert table[ranks(to_array([goal]))].tolist() == [22]
+    assert sweep.distance_table(goal)[ranks(to_array([goal, DEFAULT.goal_tiles]))].tolist() == [0, 22]
+    with pytest.raises(ValueError):
+        sweep.distance_table(geometry=geometry(4))
+
+
+def test_check_cli(tmp_path, capsys):
+    path = tmp_path / "boards.txt"
+    path.write_text("183426750\n724506831\n123456870\n123456780\n")
+    sweep.main(["--check", str(path)])
+    out = capsys.readouterr().out.split("\n")
+    assert [line.split() for line in out if line] == [["0", "1"], ["14", "1"], ["20", "1"], ["unreachable", "1"]]
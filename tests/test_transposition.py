@@ -0,0 +1,52 @@
+import random
+import pytest
+from puzzlestate import GOAL_TILES, geometry, to_rows
+from transposition import TranspositionTable
+import benchmark
+import puzzleids
+
+
+def test_visit_skips_only_states_seen_no_deeper():
+    table = TranspositionTable(capacity=7)
+    table.new_pass()
+    assert not table.visit(42, 3)
+    assert table.visit(42, 3)
+    assert table.visit(42, 5)
+    assert not table.visit(42, 2)
+    assert table.hits == 2
+    table.new_pass()
+    assert not table.visit(42, 2)  # Reached at the same depth, but in an earlier pass
+
+
+def test_collisions_keep_the_shallower_entry_of_this_pass():
+    table = TranspositionTable(capacity=7)
+    table.new_pass()
+    assert not table.visit(42, 1)
+    assert not table.visit(49, 4)  # Same slot, deeper: not recorded
+    assert table.visit(42, 1)
+    table.new_pass()
+    assert not table.visit(49, 4)  # An entry from an earlier pass is replaced
+    assert not table.visit(42, 1)
+
+
+@pytest.mark.parametrize("heuristic", [None, "manhattan"])
+def test_table_keeps_ids_optimal(heuristic):
+    boards = benchmark.make_instances(bands=(12, 16), per_band=3, seed=3)
+    for band, instances in boards.items():
+        for board in instances:
+            solution = puzzleids.ids(board, GOAL_TILES, heuristic=heuristic)
+            plain = puzzleids.ids(board, GOAL_TILES, heuristic=heuristic, table_size=0)
+            assert len(solution) - 1 == len(plain) - 1 == band
+
+
+def test_table_keeps_ids_optimal_on_15_puzzle():
+    board_geometry = geometry(4)
+    rng = random.Random(4)
+    for _ in range(3):
+        state = board_geometry.goal
+        for _ in range(18):
+            state = rng.choice(board_geometry.neighbours(state))[1]
+        board = board_geometry.unpack_grid(state)
+        with_table = puzzleids.ids(board, board_geometry.goal_tiles, heuristic="manhattan")
+        without = puzzleids.ids(board, board_geometry.goal_tiles, heuristic="manhattan", table_size=0)
+        assert len(with_table) == len(without) <= 19
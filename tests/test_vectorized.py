@@ -0,0 +1,63 @@
+import random
+import pytest
+from puzzlestate import DEFAULT, geometry, to_rows
+from checkSolvability import is_solvable
+from heuristics import make_heuristic
+
+np = pytest.importorskip("numpy")
+import vectorized  # noqa: E402
+
+
+# Random permutations of a board size, solvable or not
+def shuffled(geometry, count, seed=0):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        tiles = list(range(geometry.size))
+        rng.shuffle(tiles)
+        boards.append(tiles)
+    return boards
+
+
+@pytest.mark.parametrize("width, height", [(3, 3), (4, 4), (4, 3), (3, 4)])
+def test_solvable_matches_check_solvability(width, height):
+    boards = shuffled(geometry(width, height), 200, width * height)
+    expected = [is_solvable(board, width) for board in boards]
+    assert vectorized.solvable(vectorized.to_array(boards), width).tolist() == expected
+    assert vectorized.solvable([to_rows(board, width) for board in boards]).tolist() == expected
+
+
+@pytest.mark.parametrize("width, height", [(3, 3), (4, 3)])
+def test_solvable_takes_packed_states(width, height):
+    shape = geometry(width, height)
+    boards = shuffled(shape, 200, width * height)
+    expected = [is_solvable(board, width) for board in boards]
+    assert vectorized.solvable([shape.pack(board) for board in boards], geometry=shape).tolist() == expected
+
+
+@pytest.mark.parametrize("name", sorted(vectorized.BATCH_HEURISTICS))
+@pytest.mark.parametrize("width", [3, 4])
+def test_heuristics_match_the_scalar_ones(name, width):
+    shape = geometry(width)
+    boards = shuffled(shape, 100, width)
+    batch = vectorized.make_batch_heuristic(name, shape.goal, shape)(vectorized.to_array(boards))
+    scalar = make_heuristic(name, shape.goal, shape)
+    assert batch.tolist() == [scalar(shape.pack(board)) for board in boards]
+
+
+def test_packed_states_round_trip():
+    boards = shuffled(geometry(4), 50)
+    states = [geometry(4).pack(board) for board in boards]
+    array = vectorized.to_array(states, geometry(4))
+    assert array.tolist() == boards
+    assert vectorized.pack_states(array, geometry(4)) == states
+    with pytest.raises(ValueError):
+        vectorized.to_array([geometry(5).goal], geometry(5))
+
+
+def test_children_match_neighbours():
+    boards = shuffled(DEFAULT, 20)
+    result, parents, moves = vectorized.children(vectorized.to_array(boards))
+    expected = [(i, move, DEFAULT.unpack(state)) for i, board in enumerate(boards)
+                for move, state in DEFAULT.neighbours(DEFAULT.pack(board))]
+    assert list(zip(parents.tolist(), moves.tolist(), result.tolist())) == sorted(expected)
@@ -0,0 +1,35 @@
+# Tile images decoded (and resized) once per process and shared by every GUI.
+#
+# Images are cached by (path, size), so reopening a window, redrawing a tile
+# or animating a long solution never touches the disk or PIL again. A Tk
+# root window must exist before the first image is loaded.
+
+import tkinter as tk
+
+_images = {}
+
+
+# Load one image, resized to `size` (width, height) if given
+def load_image(path, size=None):
+    key = (path, size)
+    if key not in _images:
+        if size is None:
+            _images[key] = tk.PhotoImage(file=path)
+        else:
+            from PIL import Image, ImageTk  # Only needed for resizing
+            with Image.open(path) as img:
+                _images[key] = ImageTk.PhotoImage(img.resize(size))
+    return _images[key]
+
+
+# Images for tiles 0 (blank) to 8, indexed by tile number. `pattern` is
+# formatted with the tile number for tiles 1-8.
+def tile_images(pattern, blank, size=None):
+    return [load_image(blank, size)] + [load_image(pattern.format(tile), size) for tile in range(1, 9)]
+
+
+# Indices whose tile differs between two flat boards; a single move changes two
+def changed_cells(old, new):
+    if old is None:
+        return range(len(new))
+    return [index for index, (a, b) in enumerate(zip(old, new)) if a != b]
@@ -1,8 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox
-from time import sleep
-from copy import deepcopy
-from collections import deque
+from bfspuzz import bfs
+from solutioncache import get_cache
+from backgroundsolve import BackgroundSolve
+from tileimages import load_image, changed_cells
 
 # Images for the puzzle tiles (Ensure these files are in the same directory)
 IMAGES = {
@@ -11,9 +12,6 @@ IMAGES = {
     7: "7dog.png", 8: "8dog.png", 0: "blank.png"  # 0 is the blank tile
 }
 
-# Goal state for the 8-puzzle
-GOAL_STATE = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
-
 class PuzzleGUI:
     def __init__(self, root, initial_state):
         self.root = root
@@ -22,81 +20,85 @@ class PuzzleGUI:
 
         self.create_grid()  # Initialize the grid with the current state
 
-        # Add a Start button to begin solving the puzzle
+        # Add a Start button to begin solving the puzzle, and a Cancel button to stop it
         self.start_button = tk.Button(self.root, text="Start", command=self.start_solution)
-        self.start_button.grid(row=3, column=0, columnspan=3)
+        self.start_button.grid(row=3, column=0)
+        self.cancel_button = tk.Button(self.root, text="Cancel", command=self.cancel_solution, state=tk.DISABLED)
+        self.cancel_button.grid(row=3, column=2)
+
+        # Label showing search progress
+        self.progress_label = tk.Label(self.root, text="")
+        self.progress_label.grid(row=4, column=0, columnspan=3)
+        self.search = None  # The running BackgroundSolve, if any
 
-    # Display the images corresponding to the current state
+    # Create the tile labels once, showing the current state
     def create_grid(self):
         for i in range(3):
             for j in range(3):
                 tile_value = self.state[i][j]
-                image = tk.PhotoImage(file=IMAGES[tile_value])
+                image = load_image(IMAGES[tile_value])  # Shared, so never garbage collected
                 self.tiles[i][j] = tk.Label(self.root, image=image, borderwidth=2, relief="solid")
-                self.tiles[i][j].image = image  # Keep a reference to prevent garbage collection
                 self.tiles[i][j].grid(row=i, column=j)
 
-    # Update the GUI with a new state
+    # Update the GUI with a new state, reconfiguring only the tiles that moved
     def update_grid(self, new_state):
+        old = [tile for row in self.state for tile in row]
+        new = [tile for row in new_state for tile in row]
+        for index in changed_cells(old, new):
+            i, j = divmod(index, 3)
+            self.tiles[i][j].config(image=load_image(IMAGES[new[index]]))
         self.state = new_state
-        self.create_grid()  # Refresh the grid with the new state
-        self.root.update()
 
-    # Display the solution step-by-step with a delay
+    # Display the solution step-by-step, scheduled with after() instead of sleeping
     def show_solution(self, solution):
-        for state in solution:
-            self.update_grid(state)
-            sleep(0.5)  # 0.5-second delay between each step
+        boards = iter(solution)
+
+        def step():
+            state = next(boards, None)
+            if state is not None:
+                self.update_grid(state)
+                self.root.after(500, step)  # 0.5-second delay between each step
+
+        step()
 
-    # Triggered when the Start button is clicked
+    # Triggered when the Start button is clicked: solve on a worker thread
     def start_solution(self):
-        solution = bfs(self.state)
-        if solution:
+        def solver(board, cancel, progress):
+            return get_cache().solve(board, "bfs",
+                                     lambda b: bfs(b, cancel=cancel, progress=progress))
+
+        self.start_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_label.config(text="Solving...")
+        self.search = BackgroundSolve(self.root, solver, [row[:] for row in self.state],
+                                      self.solution_ready, self.show_progress, self.solution_failed)
+
+    # Triggered when the Cancel button is clicked
+    def cancel_solution(self):
+        if self.search is not None:
+            self.search.cancel()
+
+    def show_progress(self, depth, nodes):
+        self.progress_label.config(text=f"Depth {depth}, {nodes} nodes expanded")
+
+    def solution_ready(self, solution, cancelled):
+        self.search = None
+        self.start_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if cancelled:
+            self.progress_label.config(text="Cancelled.")
+        elif solution:
+            self.progress_label.config(text=f"Solved in {len(solution) - 1} moves.")
             self.show_solution(solution)
         else:
+            self.progress_label.config(text="")
             messagebox.showinfo("No Solution", "No solution found for the given puzzle.")
 
-# Find the position of the blank tile (0)
-def find_empty_tile(state):
-    for i in range(3):
-        for j in range(3):
-            if state[i][j] == 0:
-                return i, j
-
-# Generate all possible next states by moving the blank tile
-def generate_next_states(state):
-    next_states = []
-    x, y = find_empty_tile(state)
-
-    # Possible moves: up, down, left, right
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-    for dx, dy in moves:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < 3 and 0 <= ny < 3:
-            new_state = [row[:] for row in state]
-            new_state[x][y], new_state[nx][ny] = new_state[nx][ny], new_state[x][y]
-            next_states.append(new_state)
-
-    return next_states
-
-# Breadth-First Search (BFS) to solve the puzzle
-def bfs(initial_state):
-    queue = deque([(initial_state, [])])  # Store (state, path to reach it)
-    visited = set()
-
-    while queue:
-        current_state, path = queue.popleft()
-        visited.add(tuple(map(tuple, current_state)))  # Mark state as visited
-
-        if current_state == GOAL_STATE:
-            return path + [current_state]  # Return the solution path
-
-        for next_state in generate_next_states(current_state):
-            if tuple(map(tuple, next_state)) not in visited:
-                queue.append((next_state, path + [current_state]))
-
-    return None  # No solution found
+    def solution_failed(self, error):
+        self.search = None
+        self.start_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text=f"Search failed: {error}")
 
 # Check if the puzzle is solvable by counting inversions
 def is_solvable(state):
@@ -0,0 +1,55 @@
+# Bounded transposition table for the iterative-deepening searches.
+#
+# A depth-first search with no explored set re-expands a state once for
+# every path that reaches it, in every deepening pass. The table remembers
+# the shallowest depth each packed state has been reached at, across passes,
+# and lets the search skip a state when it arrives no shallower than that:
+# the shallower visit explores everything the deeper one could, with at
+# least as many moves to spare, so solutions stay optimal.
+#
+# Memory is capped by the number of slots. States map to one slot each
+# (state modulo the capacity); when two collide, an entry written in the
+# current pass keeps its slot against a deeper newcomer, and anything else
+# is replaced. A lost entry only costs a re-expansion, never a solution.
+
+# A prime just under 2**20; a prime modulus mixes every tile of the packed
+# state into the slot
+DEFAULT_CAPACITY = 1048573
+
+
+class TranspositionTable:
+    """Shallowest depth seen per state, in at most `capacity` slots.
+
+    Slots are filled on demand, so a short search only pays for the states
+    it reaches.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.slots = {}  # slot -> (state, depth, pass that wrote it)
+        self.current = 0
+        self.hits = 0  # Visits skipped
+
+    # Start a deepening pass: equal-depth entries from earlier passes no
+    # longer count as explored, since the new pass has a larger limit
+    def new_pass(self):
+        self.current += 1
+
+    def visit(self, state, depth):
+        """True if `state` needs no expansion at `depth`; otherwise record it.
+
+        A state is skipped if it was reached at a smaller depth in any pass,
+        or at the same depth earlier in this pass.
+        """
+        slot = state % self.capacity
+        entry = self.slots.get(slot)
+        if entry is not None:
+            held, known, written = entry
+            if held == state:
+                if known < depth or (known == depth and written == self.current):
+                    self.hits += 1
+                    return True
+            elif written == self.current and known < depth:
+                return False  # Keep the shallower entry from this pass
+        self.slots[slot] = (state, depth, self.current)
+        return False
@@ -0,0 +1,202 @@
+# Batch versions of the solvability check and the heuristics, for NumPy.
+#
+# Boards are rows of an (N, size) uint8 array in row-major order, with 0 as
+# the blank, and every function returns one value per row. The work is done
+# with array operations over the whole batch, so filtering or ranking
+# millions of generated boards never enters a Python loop per board; the
+# only loops run over the squares or lines of one board size. ranks() gives
+# every board's permutation rank, a dense integer key for deduplication.
+#
+# The heuristics mirror heuristics.py and give the same values: each entry
+# in BATCH_HEURISTICS is a factory taking a packed goal and a Geometry and
+# returning a function from a board array to an int array. children()
+# expands a whole batch at once, so an informed search can score every
+# child of a frontier slice with one call.
+#
+# Example:
+#     boards = to_array(puzzles)
+#     boards = boards[solvable(boards)]
+#     h = make_batch_heuristic("linear_conflict", GOAL)
+#     ranked = boards[np.argsort(h(boards), kind="stable")]
+
+import numpy as np
+from puzzlestate import DEFAULT, is_nested
+from heuristics import manhattan_table, _goal_positions, _line_removals
+
+
+# (N, size) uint8 array from boards given as flat or nested lists, packed
+# states (of `geometry`) or an existing array
+def to_array(boards, geometry=DEFAULT):
+    if isinstance(boards, np.ndarray):
+        return np.ascontiguousarray(boards, dtype=np.uint8).reshape(len(boards), -1)
+    boards = list(boards)
+    if not boards:
+        return np.zeros((0, geometry.size), dtype=np.uint8)
+    if isinstance(boards[0], int):
+        return unpack_states(boards, geometry)
+    return np.array(boards, dtype=np.uint8).reshape(len(boards), -1)
+
+
+# Array of boards from packed states, with the shifts applied to the whole
+# batch. Needs the tiles to fit in 64 bits, as they do up to 4x4.
+def unpack_states(states, geometry=DEFAULT):
+    if geometry.blank_shift > 64:
+        raise ValueError(f"Packed {geometry.width}x{geometry.height} boards do not fit in 64 bits")
+    tiles_mask = (1 << geometry.blank_shift) - 1
+    packed = np.fromiter((state & tiles_mask for state in states), dtype=np.uint64)
+    shifts = np.arange(geometry.size, dtype=np.uint64) * np.uint64(geometry.bits)
+    return ((packed[:, None] >> shifts) & np.uint64(geometry.mask)).astype(np.uint8)
+
+
+# Packed states from an array of boards, the inverse of unpack_states
+def pack_states(boards, geometry=DEFAULT):
+    if geometry.blank_shift > 64:
+        raise ValueError(f"Packed {geometry.width}x{geometry.height} boards do not fit in 64 bits")
+    shifts = np.arange(geometry.size, dtype=np.uint64) * np.uint64(geometry.bits)
+    tiles = np.bitwise_or.reduce(boards.astype(np.uint64) << shifts, axis=1)
+    blanks = np.argmin(boards, axis=1)
+    return [int(t) | (int(b) << geometry.blank_shift) for t, b in zip(tiles, blanks)]
+
+
+# Number of inversions among the tiles of every board, the blank excluded
+def inversions(boards):
+    first, second = np.triu_indices(boards.shape[1], k=1)
+    before, after = boards[:, first], boards[:, second]
+    return np.count_nonzero((before > after) & (after != 0), axis=1)
+
+
+# Whether every board can reach the standard goal, by the same parity rule
+# as checkSolvability.is_solvable. Nested boards give their width, packed
+# states are of `geometry` and take its width, and flat ones are taken to be
+# square unless a width is given.
+def solvable(boards, width=None, geometry=DEFAULT):
+    if not isinstance(boards, np.ndarray):
+        boards = list(boards)
+        if boards and isinstance(boards[0], int):
+            width = geometry.width
+        elif boards and is_nested(boards[0]):
+            width = len(boards[0][0])
+    boards = to_array(boards, geometry)
+    size = boards.shape[1]
+    width = width or int(round(size ** 0.5))
+    parity = inversions(boards) % 2
+    if width % 2 == 1:
+        return parity == 0
+    blank_row_from_bottom = size // width - np.argmin(boards, axis=1) // width
+    return (parity + blank_row_from_bottom) % 2 == 1
+
+
+# Number of tiles (blank excluded) that are not on their goal square
+def misplaced_tiles(goal, geometry=DEFAULT):
+    goal_tiles = np.array(geometry.unpack(goal), dtype=np.uint8)
+    counted = goal_tiles != 0
+
+    def h(boards):
+        return np.count_nonzero((boards != goal_tiles) & counted, axis=1)
+    return h
+
+
+# Sum of the Manhattan distances of every tile from its goal square
+def manhattan(goal, geometry=DEFAULT):
+    table = np.array(manhattan_table(goal, geometry), dtype=np.int32)[:, :geometry.size]
+    squares = np.arange(geometry.size)
+
+    def h(boards):
+        return table[squares, boards].sum(axis=1)
+    return h
+
+
+# Manhattan distance plus two moves for every tile that has to leave its
+# row or column to let a conflicting tile past. Each line's tiles are coded
+# as one base-(length + 1) number, which indexes a table of removals built
+# from the same rule as heuristics.linear_conflict.
+def linear_conflict(goal, geometry=DEFAULT):
+    base = manhattan(goal, geometry)
+    positions = _goal_positions(goal, geometry)
+    width, height, size = geometry.width, geometry.height, geometry.size
+    removals = {}
+    for length in {width, height}:
+        codes = np.indices((length + 1,) * length).reshape(length, -1).T
+        removals[length] = np.array([_line_removals([c - 1 for c in code]) for code in codes], dtype=np.int32)
+
+    # For each row and column: its squares, and for each tile its offset
+    # within that line plus one if the tile's goal lies on the line, else 0
+    lines = []
+    for k in range(height):
+        digits = np.zeros(size, dtype=np.int32)
+        for tile in range(1, size):
+            gx, gy = divmod(positions[tile], width)
+            if gx == k:
+                digits[tile] = gy + 1
+        lines.append((np.arange(k * width, (k + 1) * width), digits))
+    for k in range(width):
+        digits = np.zeros(size, dtype=np.int32)
+        for tile in range(1, size):
+            gx, gy = divmod(positions[tile], width)
+            if gy == k:
+                digits[tile] = gx + 1
+        lines.append((np.arange(k, size, width), digits))
+    lines = [(squares, digits, (len(squares) + 1) ** np.arange(len(squares))[::-1], removals[len(squares)])
+             for squares, digits in lines]
+
+    def h(boards):
+        conflicts = np.zeros(len(boards), dtype=np.int32)
+        for squares, digits, weights, table in lines:
+            conflicts += table[digits[boards[:, squares]] @ weights]
+        return base(boards) + 2 * conflicts
+    return h
+
+
+BATCH_HEURISTICS = {
+    "misplaced": misplaced_tiles,
+    "manhattan": manhattan,
+    "linear_conflict": linear_conflict,
+}
+
+
+# Batch heuristics already bound to a goal, keyed like heuristics._bound
+_bound = {}
+
+
+# Look up a batch heuristic by name (or pass a factory through) and bind it to a goal
+def make_batch_heuristic(heuristic, goal, geometry=DEFAULT):
+    if not isinstance(heuristic, str):
+        return heuristic(goal, geometry)
+    if heuristic not in BATCH_HEURISTICS:
+        raise ValueError(f"Unknown batch heuristic: {heuristic}")
+    key = (heuristic, goal, geometry)
+    if key not in _bound:
+        _bound[key] = BATCH_HEURISTICS[heuristic](goal, geometry)
+    return _bound[key]
+
+
+# Lehmer rank of every board as a permutation of 0..size-1, from 0 to
+# size! - 1, so it indexes a bitmap or table over all permutations. Ranks
+# fit an int64 up to 20 squares.
+def ranks(boards):
+    size = boards.shape[1]
+    if size > 20:
+        raise ValueError(f"Ranks of {size}-square boards do not fit in 64 bits")
+    result = np.zeros(len(boards), dtype=np.int64)
+    weight = 1
+    for i in range(size - 2, -1, -1):
+        weight *= size - 1 - i
+        smaller = np.count_nonzero(boards[:, i + 1:] < boards[:, i:i + 1], axis=1)
+        result += smaller * weight
+    return result
+
+
+# Every child of every board: returns (children, parents, moves), where
+# children[i] is boards[parents[i]] after moves[i] (an index into MOVES).
+# Children come grouped by parent, in MOVES order.
+def children(boards, geometry=DEFAULT):
+    blanks = np.argmin(boards, axis=1)
+    targets = np.array(geometry.move_table, dtype=np.intp)[blanks]  # (N, 4), -1 where illegal
+    parents, moves = np.nonzero(targets >= 0)
+    sources = targets[parents, moves]
+    result = boards[parents]
+    rows = np.arange(len(parents))
+    result[rows, blanks[parents]] = result[rows, sources]
+    result[rows, sources] = 0
+    return result, parents, moves.astype(np.uint8)
+